@@ -0,0 +1,64 @@
+"""
+Import-time benchmark of the packages in source_code.
+
+Every package is imported in a fresh Python interpreter, so that the measured time is the cold-start time a script or
+worker process pays. The benchmark fails (exit status 1) if a package takes longer to import than the time budget, or
+if importing it loads one of the heavy third-party packages that should only be loaded on first use.
+
+Usage: python benchmarks/bench_import_time.py [budget in seconds]
+
+"""
+import os
+import subprocess
+import sys
+
+SOURCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'source_code')
+
+PACKAGES = ['quantities', 'pypeflow.core', 'pypeflow.analysis', 'pypeflow.design', 'pypeflow.utils']
+
+LAZY_PACKAGES = ['CoolProp', 'pandas', 'matplotlib']
+
+BUDGET = 1.0  # seconds
+
+SNIPPET = (
+    "import sys, time\n"
+    "t = time.perf_counter()\n"
+    "import {package}\n"
+    "t = time.perf_counter() - t\n"
+    "print(t)\n"
+    "print(','.join(m for m in {lazy!r} if m in sys.modules))\n"
+)
+
+
+def time_import(package: str, repeat: int = 3):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [SOURCE_DIR, env.get('PYTHONPATH')]))
+    times = []
+    loaded = ''
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, '-c', SNIPPET.format(package=package, lazy=LAZY_PACKAGES)],
+            env=env, capture_output=True, text=True, check=True
+        ).stdout.splitlines()
+        times.append(float(out[0]))
+        loaded = out[1] if len(out) > 1 else ''
+    return min(times), loaded
+
+
+def main(budget: float = BUDGET) -> int:
+    failed = False
+    for package in PACKAGES:
+        t, loaded = time_import(package)
+        status = 'ok'
+        if t > budget:
+            status = 'OVER BUDGET'
+            failed = True
+        if loaded:
+            status = f'loads {loaded}'
+            failed = True
+        print(f'{package:<20} {t:8.3f} s   {status}')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(float(sys.argv[1]) if len(sys.argv) > 1 else BUDGET))
@@ -0,0 +1,59 @@
+"""
+Benchmark of the dense linear system solvers of nummath.linear_system against numpy.linalg.solve.
+
+For each size n a random, diagonally dominant system (Gauss elimination and Doolittle's decomposition, both with row
+pivoting) and a random, symmetric and positive definite system (Choleski's decomposition) are solved. The table shows
+the solve time of each solver and of numpy.linalg.solve, and the largest residual |a.x - b| of each solver relative to
+the largest element of b.
+
+Usage: python benchmarks/bench_linear_system.py [largest n]
+
+"""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'source_code'))
+
+from nummath.linear_system import GaussElimin, LUDecomp  # noqa: E402
+
+SIZES = [10, 20, 50, 100, 200, 500, 1000, 2000]
+
+
+def time_solve(solve, repeat: int):
+    times = []
+    x = None
+    for _ in range(repeat):
+        t = time.perf_counter()
+        x = solve()
+        times.append(time.perf_counter() - t)
+    return min(times), x
+
+
+def main(n_max: int = SIZES[-1]) -> int:
+    rng = np.random.default_rng(1)
+    print(f'{"n":>6} {"gauss [s]":>11} {"doolittle [s]":>14} {"choleski [s]":>13} {"numpy [s]":>11} {"residual":>10}')
+    for n in SIZES:
+        if n > n_max:
+            break
+        repeat = 5 if n <= 200 else 1
+        a = rng.standard_normal((n, n))
+        a += np.diag(np.sum(np.abs(a), axis=1))
+        a_spd = a @ a.T / n + np.identity(n)
+        b = rng.standard_normal(n)
+        t_gauss, x_gauss = time_solve(lambda: GaussElimin(a, b.copy(), pivot_on=True).solve(), repeat)
+        t_lu, x_lu = time_solve(lambda: LUDecomp(a, b.copy(), pivot_on=True).solve(), repeat)
+        t_chol, x_chol = time_solve(lambda: LUDecomp(a_spd, b.copy(), method='choleski').solve(), repeat)
+        t_np, _ = time_solve(lambda: np.linalg.solve(a, b), repeat)
+        residual = max(
+            np.max(np.abs(a @ x_gauss - b)),
+            np.max(np.abs(a @ x_lu - b)),
+            np.max(np.abs(a_spd @ x_chol - b))
+        ) / np.max(np.abs(b))
+        print(f'{n:>6} {t_gauss:>11.4f} {t_lu:>14.4f} {t_chol:>13.4f} {t_np:>11.4f} {residual:>10.1e}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else SIZES[-1]))
@@ -1,6 +1,5 @@
 """Interpolation and curve fitting."""
 
-import nummath.graphing as graphing
 import nummath.linear_system as lin_sys
 import numpy as np
 
@@ -15,6 +14,16 @@ class _InterPol:
         self._y_data = np.array(y_data, dtype=np.float64)
 
     def solve(self, x):
+        """
+        Get the interpolated y-coordinate at x. If x is a list or Numpy array of x-coordinates, a Numpy array of the
+        same shape with the interpolated y-coordinates is returned.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = self._solve(x.ravel()).reshape(x.shape)
+        return y[()] if y.ndim == 0 else y
+
+    def _solve(self, x):
+        # interpolate at each x-coordinate of the 1D Numpy array x; override in specialised interpolation class
         pass
 
 
@@ -47,26 +56,24 @@ class PolyInterPol(_InterPol):
             self._a[k:m] = (self._a[k:m] - self._a[k - 1]) / (self._x_data[k:m] - self._x_data[k - 1])
 
     def _newton(self, x):
+        # Horner's scheme on the Newton form of the polynomial, for all x at once
         n = len(self._x_data) - 1
-        y = self._a[n]
+        y = np.full(len(x), self._a[n])
         for k in range(1, n + 1):
             y = self._a[n - k] + (x - self._x_data[n - k]) * y
         return y
 
     def _neville(self, x):
+        # column j of y holds the tableau of x[j]
         m = len(self._x_data)
-        y = self._y_data.copy()
+        xd = self._x_data[:, np.newaxis]
+        y = np.repeat(self._y_data[:, np.newaxis], len(x), axis=1)
         for k in range(1, m):
-            y[0:m - k] = (((x - self._x_data[k:m]) * y[0:m - k] + (self._x_data[0:m - k] - x) * y[1:m - k + 1]) /
-                          (self._x_data[0:m - k] - self._x_data[k:m]))
+            y[0:m - k] = (((x - xd[k:m]) * y[0:m - k] + (xd[0:m - k] - x) * y[1:m - k + 1]) /
+                          (xd[0:m - k] - xd[k:m]))
         return y[0]
 
-    def solve(self, x):
-        """
-        Get corresponding y-coordinate on polynomial for given x-coordinate.
-        Note: If Neville's method is used only one value for x must be passed. In case of Newton's method a list of
-        multiple x values can be passed.
-        """
+    def _solve(self, x):
         if self._method == "neville":
             y = self._neville(x)
         else:
@@ -79,21 +86,24 @@ class RatInterPol(_InterPol):
     Rational interpolation.
     Data is interpolated using a diagonal rational function.
     """
-    def solve(self, x):
+    def _solve(self, x):
         m = len(self._x_data)
-        r = self._y_data.copy()
-        r_old = np.zeros(m)
-        for k in range(m - 1):
-            for i in range(m - k - 1):
-                if abs(x - self._x_data[i + k + 1]) < 1.0e-9:
-                    return self._y_data[i + k + 1]
-                else:
-                    c1 = r[i + 1] - r[i]
-                    c2 = r[i + 1] - r_old[i + 1]
-                    c3 = (x - self._x_data[i]) / (x - self._x_data[i + k + 1])
-                    r[i] = r[i + 1] + c1 / (c3 * (1.0 - c1 / c2) - 1.0)
-                    r_old[i + 1] = r[i + 1]
-        return r[0]
+        # at (or very near) a data point, other than the first one, the y-coordinate of the data point is returned
+        near = np.abs(x[np.newaxis, :] - self._x_data[1:, np.newaxis]) < 1.0e-9
+        at_point = np.any(near, axis=0)
+        r = np.repeat(self._y_data[:, np.newaxis], len(x), axis=1)
+        r_old = np.zeros((m, len(x)))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for k in range(m - 1):
+                i = np.arange(m - k - 1)
+                c1 = r[i + 1] - r[i]
+                c2 = r[i + 1] - r_old[i + 1]
+                c3 = (x - self._x_data[i, np.newaxis]) / (x - self._x_data[i + k + 1, np.newaxis])
+                r_old[i + 1] = r[i + 1]
+                r[i] = r[i + 1] + c1 / (c3 * (1.0 - c1 / c2) - 1.0)
+        y = r[0]
+        y[at_point] = self._y_data[1:][np.argmax(near[:, at_point], axis=0)]
+        return y
 
 
 class CubicSplineInterPol(_InterPol):
@@ -105,6 +115,7 @@ class CubicSplineInterPol(_InterPol):
         self._curvature()
 
     def _curvature(self):
+        # the curvatures at the data points and the segment lengths are calculated once
         n = len(self._x_data) - 1
         c = np.zeros(n)
         d = np.ones(n + 1)
@@ -117,25 +128,21 @@ class CubicSplineInterPol(_InterPol):
         b[1:n] = 6.0 * ((self._y_data[0:n - 1] - self._y_data[1:n]) / (self._x_data[0:n - 1] - self._x_data[1:n]) -
                         (self._y_data[1:n] - self._y_data[2:n + 1]) / (self._x_data[1:n] - self._x_data[2:n + 1]))
         self._k = lin_sys.B3DLinSys(c, d, e, b).solve()
+        self._h = self._x_data[:-1] - self._x_data[1:]
 
     def _find_segment(self, x):
-        index_left = 0
-        index_right = len(self._x_data) - 1
-        while True:
-            if (index_right - index_left) <= 1:
-                return index_left
-            index = (index_left + index_right) // 2
-            if x < self._x_data[index]:
-                index_right = index
-            else:
-                index_left = index
+        # index of the segment of each x; x-coordinates outside the data lie on the first or last segment
+        i = np.searchsorted(self._x_data, x, side='right') - 1
+        return np.clip(i, 0, len(self._x_data) - 2)
 
-    def solve(self, x):
+    def _solve(self, x):
         i = self._find_segment(x)
-        h = self._x_data[i] - self._x_data[i + 1]
-        y = ((self._k[i] / 6) * ((x - self._x_data[i + 1]) ** 3 / h - (x - self._x_data[i + 1]) * h) -
-             (self._k[i + 1] / 6) * ((x - self._x_data[i]) ** 3 / h - (x - self._x_data[i]) * h) +
-             (self._y_data[i] * (x - self._x_data[i + 1]) - self._y_data[i + 1] * (x - self._x_data[i])) / h)
+        h = self._h[i]
+        dx0 = x - self._x_data[i]
+        dx1 = x - self._x_data[i + 1]
+        y = ((self._k[i] / 6) * (dx1 ** 3 / h - dx1 * h) -
+             (self._k[i + 1] / 6) * (dx0 ** 3 / h - dx0 * h) +
+             (self._y_data[i] * dx1 - self._y_data[i + 1] * dx0) / h)
         return y
 
 
@@ -179,11 +186,8 @@ class _CurveFit:
         if self._solved:
             n = len(self._x_data) - 1
             m = len(self._c) - 1
-            sigma = 0.0
-            for i in range(n + 1):
-                y = self.eval_fitting_curve_single(self._x_data[i])
-                sigma += (self._y_data[i] - y)**2
-            sigma = np.sqrt(sigma / (n - m))
+            y = self.eval_fitting_curve_multi(self._x_data)
+            sigma = np.sqrt(np.sum((self._y_data - y)**2) / (n - m))
             return sigma
 
     def plot(self, x_title='x', y_title='y', fig_size=None, dpi=None):
@@ -191,6 +195,7 @@ class _CurveFit:
         Show data points and fitting curve in a graph.
         """
         if self._solved:
+            import nummath.graphing as graphing
             # calculate some points on the fitting curve
             x = np.linspace(np.min(self._x_data), np.max(self._x_data), 21, endpoint=True)
             y = self.eval_fitting_curve_multi(x)
@@ -225,6 +230,7 @@ class PolyFit(_CurveFit):
         self._b = np.zeros(self._m + 1)
         self._s = np.zeros(2 * self._m + 1)
         self._c = np.zeros(self._m + 1)  # coefficients c of polynomial with degree m
+        self._lu = None  # LU-decomposition of the coefficient matrix (see solve_with_input())
         self._build_matrix_equation()
 
     def _build_matrix_equation(self):
@@ -249,6 +255,21 @@ class PolyFit(_CurveFit):
         self._solved = True
         return self._c.flatten()
 
+    def solve_with_input(self, y_data):
+        """
+        Fit the polynomial to new y-coordinates of the data points, at the same x-coordinates, and return its
+        coefficients. The coefficient matrix only depends on the x-coordinates: it is decomposed once and the
+        decomposition is reused for each new set of y-coordinates.
+        """
+        self._y_data = np.array(y_data, dtype=np.float64)
+        b = np.vander(self._x_data, self._m + 1, increasing=True).T @ self._y_data
+        if self._lu is None:
+            self._lu = lin_sys.LUDecomp(self._a.copy(), b.copy(), pivot_on=True)
+        self._b = b
+        self._c = self._lu.solve_with_input(b.copy())
+        self._solved = True
+        return self._c.flatten()
+
     def eval_fitting_curve_single(self, x):
         if self._solved:
             m = len(self._c) - 1
@@ -258,10 +279,13 @@ class PolyFit(_CurveFit):
             return y
 
     def eval_fitting_curve_multi(self, x_array):
+        # Horner's scheme for all x at once
         if self._solved:
-            y = np.zeros(len(x_array))
-            for i in range(len(x_array)):
-                y[i] = self.eval_fitting_curve_single(x_array[i])
+            x_array = np.asarray(x_array, dtype=np.float64)
+            m = len(self._c) - 1
+            y = np.full(x_array.shape, self._c[m])
+            for j in range(m):
+                y = y * x_array + self._c[m - j - 1]
             return y
 
 
@@ -292,7 +316,7 @@ class LinReg(_CurveFit):
 
     def eval_fitting_curve_multi(self, x_array):
         if self._solved:
-            return self._c[0] + self._c[1] * x_array
+            return self._c[0] + self._c[1] * np.asarray(x_array, dtype=np.float64)
 
 
 class ExpFit(_CurveFit):
@@ -324,4 +348,4 @@ class ExpFit(_CurveFit):
 
     def eval_fitting_curve_multi(self, x_array):
         if self._solved:
-            return self._c[0] * np.exp(self._c[1] * x_array)
+            return self._c[0] * np.exp(self._c[1] * np.asarray(x_array, dtype=np.float64))
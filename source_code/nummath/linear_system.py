@@ -17,6 +17,8 @@ class Swap:
 
 
 class _LinSys:
+    block_size = 64  # number of columns eliminated before the rest of the matrix is updated with a matrix product
+
     def __init__(self, a, b, tol=1.0e-12, pivot_on=False, dtype=np.float64):
         """
         Initialize linear system.
@@ -33,6 +35,7 @@ class _LinSys:
         self._det_a = None
         self._solved = False
         self._row_scf = np.empty(len(self._b), dtype=dtype)  # array with scale factor for each row of a
+        self._perm = np.arange(len(self._b))  # original index of each row of a after row pivoting
         self._tol = tol
         self._pivot_on = pivot_on
         if self._pivot_on: self._calc_row_scf()
@@ -52,9 +55,33 @@ class _LinSys:
         self._check_with_tolerance(self._a[p, k])  # if too close to zero, the matrix will be singular (det a = 0)
         if p != k:  # if cls._a[k, k] hasn't the largest rel. value, swap rows
             Swap.swap_rows(self._b, k, p)
+            Swap.swap_rows(self._perm, k, p)
             Swap.swap_rows(self._row_scf, k, p)
             Swap.swap_rows(self._a, k, p)
 
+    def _lu_decompose(self):
+        # Transform coefficient matrix in place to its LU-decomposition (Doolittle): U on and above the main diagonal,
+        # the multipliers of L below. The columns are eliminated in blocks. Within a block, each column is eliminated
+        # from the block columns of all rows below the pivot row at once (outer-product update). After the block, the
+        # rows of the block are eliminated from the columns to the right, and the remaining lower right part of the
+        # matrix is updated at once with a matrix product.
+        n = len(self._a)
+        a = self._a
+        for j0 in range(0, n - 1, self.block_size):
+            j1 = min(j0 + self.block_size, n)
+            for k in range(j0, min(j1, n - 1)):
+                if self._pivot_on:
+                    self._row_pivot(k)
+                else:
+                    self._check_with_tolerance(a[k, k])
+                a[k+1:n, k] /= a[k, k]
+                a[k+1:n, k+1:j1] -= np.multiply.outer(a[k+1:n, k], a[k, k+1:j1])
+            if j1 < n:
+                for k in range(j0, j1):
+                    a[k+1:j1, j1:n] -= np.multiply.outer(a[k+1:j1, k], a[k, j1:n])
+                a[j1:n, j1:n] -= a[j1:n, j0:j1] @ a[j0:j1, j1:n]
+        self._check_with_tolerance(a[n - 1, n - 1])
+
     def _check_with_tolerance(self, elem):
         # If during transformation (elimination or decomposition) of cls._a a diagonal el. is too close to zero,
         # it means that the coefficient matrix will be singular, i.e. there will be no unique solution.
@@ -123,14 +150,11 @@ class GaussElimin(_LinSys):
     def _eliminate(self):
         """Transform coefficient matrix to upper triangular matrix."""
         n = len(self._a)
-        for k in range(n-1):  # index k points to the 'pivot row' and 'pivot column'
-            if self._pivot_on: self._row_pivot(k)
-            for i in range(k+1, n):
-                if self._a[i, k] != 0.0:
-                    lambda_ = self._a[i, k] / self._a[k, k]
-                    self._a[i, k:n] -= lambda_ * self._a[k, k:n]
-                    self._b[i] -= lambda_ * self._b[k]
-        self._check_with_tolerance(self._a[n - 1, n - 1])
+        self._lu_decompose()
+        # apply the multipliers to the input vector, then clear them: what remains is the upper triangular matrix
+        for k in range(n-1):
+            self._b[k+1:n] -= np.multiply.outer(self._a[k+1:n, k], self._b[k])
+        self._a = np.triu(self._a)
         self._eliminated = True
 
     def _backward_substitute(self):
@@ -168,27 +192,26 @@ class LUDecomp(_LinSys):
 
     def _doolittle_decompose(self):
         n = len(self._a)
-        for k in range(n-1):
-            if self._pivot_on: self._row_pivot(k)
-            for i in range(k+1, n):
-                if self._a[i, k] != 0.0:
-                    lambda_ = self._a[i, k] / self._a[k, k]
-                    self._a[i, k + 1:n] -= lambda_ * self._a[k, k + 1:n]
-                    self._a[i, k] = lambda_
-        self._check_with_tolerance(self._a[n - 1, n - 1])
+        self._lu_decompose()
         self._u = np.triu(self._a)
         self._l = np.identity(n) + np.tril(self._a, k=-1)
         self._decomposed = True
 
     def _choleski_decompose(self):
+        # The columns are decomposed in blocks as in _lu_decompose(). Only the lower triangular part of the matrix is
+        # used.
         n = len(self._a)
-        for k in range(n):
-            try:
-                self._a[k, k] = np.sqrt(self._a[k, k] - np.dot(self._a[k, :k], self._a[k, :k]))
-            except ValueError:
-                raise ValueError("matrix is not positive definite")
-            for i in range(k+1, n):
-                self._a[i, k] = (self._a[i, k] - np.dot(self._a[i, :k], self._a[k, :k])) / self._a[k, k]
+        a = self._a
+        for j0 in range(0, n, self.block_size):
+            j1 = min(j0 + self.block_size, n)
+            for k in range(j0, j1):
+                if a[k, k] <= 0.0:
+                    raise ValueError("matrix is not positive definite")
+                a[k, k] = np.sqrt(a[k, k])
+                a[k+1:n, k] /= a[k, k]
+                a[k+1:n, k+1:j1] -= np.multiply.outer(a[k+1:n, k], a[k+1:j1, k])
+            if j1 < n:
+                a[j1:n, j1:n] -= a[j1:n, j0:j1] @ a[j1:n, j0:j1].T
         self._l = np.tril(self._a)
         self._u = np.transpose(self._l)
         self._decomposed = True
@@ -219,8 +242,8 @@ class LUDecomp(_LinSys):
 
     def solve_with_input(self, b):
         """Solve linear system with new input vector."""
-        self._b = b
         if not self._decomposed: self._decompose()
+        self._b = np.asarray(b)[self._perm]  # rows of b in the order of the rows of a after row pivoting
         self._forward_substitute()
         self._backward_substitute()
         return self._x.flatten()
@@ -328,3 +351,331 @@ class BS5DLinSys(_BandedLinSys):
         self._x[n-2] = self._y[n-2] / self._d[n-2] - self._e[n-2] * self._x[n-1]
         for k in range(n-3, -1, -1):
             self._x[k] = self._y[k] / self._d[k] - self._e[k] * self._x[k+1] - self._c[k] * self._x[k+2]
+
+
+class CSRMatrix:
+    """
+    Sparse matrix in compressed sparse row (CSR) format.
+    The nonzero elements of row i are data[indptr[i]:indptr[i+1]], in the columns indices[indptr[i]:indptr[i+1]].
+    """
+    def __init__(self, data, indices, indptr, shape):
+        """
+        Initialize sparse matrix.
+        Params:
+        - data      values of the nonzero elements, row by row
+        - indices   column index of each nonzero element
+        - indptr    index in data of the first nonzero element of each row, followed by the number of nonzero elements
+        - shape     number of rows and number of columns
+        """
+        self.data = np.asarray(data, dtype=np.float64)
+        self.indices = np.asarray(indices, dtype=np.intp)
+        self.indptr = np.asarray(indptr, dtype=np.intp)
+        self.shape = tuple(shape)
+        self._rows = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))  # row index of each nonzero element
+        self._coo_pos = None
+
+    @classmethod
+    def from_coo(cls, rows, cols, values, shape):
+        """
+        Create sparse matrix from coordinate format: element (rows[k], cols[k]) has value values[k]. Values of the same
+        element are summed.
+        The matrix remembers where each coordinate entry went, so that new values for the same coordinates can be
+        set with method update() without building the sparsity pattern again.
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        cols = np.asarray(cols, dtype=np.intp)
+        keys = rows * shape[1] + cols
+        unique_keys, coo_pos = np.unique(keys, return_inverse=True)
+        indptr = np.searchsorted(unique_keys, np.arange(shape[0] + 1) * shape[1])
+        m = cls(np.zeros(len(unique_keys)), unique_keys % shape[1], indptr, shape)
+        m._coo_pos = coo_pos.ravel()
+        m.update(values)
+        return m
+
+    @classmethod
+    def from_dense(cls, a):
+        """Create sparse matrix from the nonzero elements of a dense NumPy array."""
+        a = np.asarray(a, dtype=np.float64)
+        rows, cols = np.nonzero(a)
+        return cls.from_coo(rows, cols, a[rows, cols], a.shape)
+
+    def update(self, values):
+        """Set new values for the coordinate entries the matrix was created from (see from_coo())."""
+        self.data = np.bincount(self._coo_pos, weights=values, minlength=len(self.indices)).astype(np.float64)
+
+    def dot(self, x):
+        """Return matrix-vector product."""
+        return np.bincount(self._rows, weights=self.data * x[self.indices], minlength=self.shape[0])
+
+    def diagonal(self):
+        """Return main diagonal."""
+        d = np.zeros(min(self.shape))
+        on_diagonal = self._rows == self.indices
+        d[self.indices[on_diagonal]] = self.data[on_diagonal]
+        return d
+
+    def to_dense(self):
+        """Return matrix as dense NumPy array."""
+        a = np.zeros(self.shape)
+        np.add.at(a, (self._rows, self.indices), self.data)
+        return a
+
+    @property
+    def nnz(self):
+        """Return number of stored nonzero elements."""
+        return len(self.data)
+
+
+class PCG:
+    """
+    Solve linear system with symmetric and positive definite sparse coefficient matrix with the Preconditioned
+    Conjugate Gradient Method. The method only needs matrix-vector products, so the coefficient matrix is never
+    transformed. The default preconditioner is the main diagonal of the coefficient matrix (Jacobi preconditioner).
+    A decomposition of a nearby matrix (e.g. of an earlier iteration of Newton's method, see SparseLUDecomp) is a
+    much stronger preconditioner.
+    """
+    def __init__(self, a, b, x0=None, tol=1.0e-10, i_max=None, preconditioner=None):
+        """
+        Initialize linear system.
+        Params:
+        - a                 coefficient matrix (CSRMatrix or dense NumPy array)
+        - b                 input vector
+        - x0                starting vector of the iterations (default is the zero vector)
+        - tol               the iterations stop when the norm of the residual is smaller than tol times the norm of b
+        - i_max             maximum number of iterations (default is ten times the number of unknowns)
+        - preconditioner    object with a method solve_with_input(r) that returns an approximation of the solution of
+                            a.x = r, e.g. a SparseLUDecomp object (default is the Jacobi preconditioner)
+        """
+        self._a = a
+        self._b = np.asarray(b, dtype=np.float64)
+        self._x0 = x0
+        self._tol = tol
+        self._i_max = i_max if i_max is not None else 10 * max(len(self._b), 1)
+        self._preconditioner = preconditioner
+        if preconditioner is None:
+            d = a.diagonal()
+            if np.any(d <= 0.0):
+                raise ValueError("matrix is not positive definite")
+            self._inv_d = 1.0 / d
+        self.iterations = 0
+
+    def _precondition(self, r):
+        if self._preconditioner is None:
+            return self._inv_d * r
+        return self._preconditioner.solve_with_input(r)
+
+    def _dot(self, x):
+        if isinstance(self._a, CSRMatrix):
+            return self._a.dot(x)
+        return self._a @ x
+
+    def solve(self):
+        """Solve linear system."""
+        x = np.zeros(len(self._b)) if self._x0 is None else np.array(self._x0, dtype=np.float64)
+        r = self._b - self._dot(x)
+        r_max = self._tol * np.linalg.norm(self._b)
+        z = self._precondition(r)
+        s = z.copy()
+        rz = np.dot(r, z)
+        self.iterations = 0
+        while np.linalg.norm(r) > r_max:
+            if self.iterations >= self._i_max:
+                raise OverflowError('too many iterations')
+            u = self._dot(s)
+            alpha = rz / np.dot(s, u)
+            x += alpha * s
+            r -= alpha * u
+            z = self._precondition(r)
+            rz_new = np.dot(r, z)
+            s = z + (rz_new / rz) * s
+            rz = rz_new
+            self.iterations += 1
+        return x
+
+    def solve_with_input(self, b, x0=None):
+        """Solve linear system with new input vector (and starting vector)."""
+        self._b = np.asarray(b, dtype=np.float64)
+        self._x0 = x0
+        return self.solve()
+
+
+def rcm_ordering(a):
+    """
+    Return the Reverse Cuthill-McKee ordering of the rows and columns of sparse matrix a (CSRMatrix) as an index
+    array: row perm[i] of a becomes row i of the reordered matrix. The ordering keeps the nonzero elements close to the
+    main diagonal, which limits the band width and the fill-in of a decomposition. The sparsity pattern of a is taken
+    as symmetric.
+    """
+    n = a.shape[0]
+    rows = np.concatenate([a._rows, a.indices])
+    cols = np.concatenate([a.indices, a._rows])
+    order = np.lexsort((cols, rows))
+    rows, cols = rows[order], cols[order]
+    keep = rows != cols
+    rows, cols = rows[keep], cols[keep]
+    indptr = np.searchsorted(rows, np.arange(n + 1))
+    degree = np.diff(indptr)
+    # the neighbours of each node, sorted by ascending degree
+    neighbours = cols[np.lexsort((degree[cols], rows))].tolist()
+    indptr = indptr.tolist()
+    visited = [False] * n
+
+    def bfs(root):
+        # breadth-first search from root: returns the nodes in the order visited and the levels of the search
+        mark = {root}
+        queue, levels = [root], [[root]]
+        while True:
+            next_level = []
+            for node in levels[-1]:
+                for other in neighbours[indptr[node]:indptr[node + 1]]:
+                    if other not in mark and not visited[other]:
+                        mark.add(other)
+                        next_level.append(other)
+            if not next_level:
+                return queue, levels
+            queue.extend(next_level)
+            levels.append(next_level)
+
+    perm = []
+    for start in np.argsort(degree, kind='stable').tolist():
+        if visited[start]:
+            continue
+        # start from a pseudo-peripheral node: as long as the search gets deeper, start again from a node of minimum
+        # degree in the last level of the search
+        queue, levels = bfs(start)
+        for _ in range(5):
+            root = min(levels[-1], key=lambda node: degree[node])
+            queue_, levels_ = bfs(root)
+            if len(levels_) <= len(levels):
+                break
+            queue, levels = queue_, levels_
+        for node in queue:
+            visited[node] = True
+        perm.extend(queue)
+    return np.array(perm[::-1], dtype=np.intp)
+
+
+class SparseLUDecomp:
+    """
+    Solve linear system with sparse coefficient matrix with LU-Decomposition Methods (Doolittle or Choleski).
+    The rows and columns of the coefficient matrix are first reordered with the Reverse Cuthill-McKee ordering (see
+    rcm_ordering()), so that its nonzero elements lie in a narrow band around the main diagonal. The decomposition only
+    works inside this band: the work grows with the number of unknowns times the square of the band width, instead of
+    with the cube of the number of unknowns.
+    The ordering and the band structure are determined once. A new coefficient matrix with the same sparsity pattern,
+    e.g. in the next iteration of Newton's method, is decomposed with method update(), and a decomposition can solve
+    any number of input vectors (solve_with_input()).
+    Note 1: Choleski's method is limited to symmetric and positive definite coefficient matrices.
+    Note 2: No row pivoting is done. Doolittle's method is meant for matrices that are diagonally dominant or symmetric
+    and positive definite.
+    """
+    def __init__(self, a, b=None, method="doolittle", tol=1.0e-12, ordering="rcm"):
+        """
+        Initialize linear system.
+        Params:
+        - a         coefficient matrix (CSRMatrix or dense NumPy array)
+        - b         input vector (optional, see solve_with_input())
+        - method    "doolittle" or "choleski"
+        - tol       rounding tolerance, i.e. the smallest value that is considered as zero (default is 1.0e-12)
+        - ordering  "rcm" (Reverse Cuthill-McKee, default) or None (the rows and columns are not reordered)
+        """
+        if not isinstance(a, CSRMatrix):
+            a = CSRMatrix.from_dense(a)
+        self._method = method.lower()
+        self._tol = tol
+        self._b = b
+        self._x = None
+        n = self._n = a.shape[0]
+        self._perm = rcm_ordering(a) if ordering == "rcm" else np.arange(n)
+        inv_perm = np.empty(n, dtype=np.intp)
+        inv_perm[self._perm] = np.arange(n)
+        # position of each nonzero element in the reordered matrix
+        rows, cols = inv_perm[a._rows], inv_perm[a.indices]
+        p = int(np.max(rows - cols, initial=0))  # lower band width
+        q = int(np.max(cols - rows, initial=0))  # upper band width
+        if self._method == "choleski":
+            p = q = max(p, q)
+        self._p, self._q = p, q
+        # the band is held row by row: element (i, j) of the reordered matrix at [i, j - i + p]
+        self._pos = rows * (p + q + 1) + (cols - rows + p)
+        self._l = None
+        self._u = None
+        self.update(a)
+
+    def update(self, a):
+        """
+        Decompose new coefficient matrix a (CSRMatrix with the same sparsity pattern, or its array of nonzero elements
+        a.data).
+        """
+        data = a.data if isinstance(a, CSRMatrix) else np.asarray(a, dtype=np.float64)
+        n, p, q = self._n, self._p, self._q
+        w = p + q + 1
+        band = np.zeros((n + p + 1) * w)  # zero padding beyond the last row
+        band[self._pos] = data
+        # In the band, the elements (k + r, k + t) (r = 0...p, t = 0...q) that take part in elimination step k lie at
+        # equal distances: a strided view on the band holds them as a dense window, in which the step is done at once.
+        item = band.itemsize
+        for k in range(n):
+            window = np.lib.stride_tricks.as_strided(
+                band[k * w + p:], shape=(p + 1, q + 1), strides=((w - 1) * item, item)
+            )
+            if self._method == "choleski":
+                if window[0, 0] <= 0.0:
+                    raise ValueError("matrix is not positive definite")
+                window[:, 0] /= np.sqrt(window[0, 0])
+                window[1:, 1:] -= np.multiply.outer(window[1:, 0], window[1:, 0])
+            else:
+                if abs(window[0, 0]) < self._tol:
+                    raise ValueError("matrix is singular")
+                window[1:, 0] /= window[0, 0]
+                window[1:, 1:] -= np.multiply.outer(window[1:, 0], window[0, 1:])
+        band = band.reshape(n + p + 1, w)
+        # column k of L below the main diagonal, row k of U from the main diagonal on
+        k = np.arange(n)[:, np.newaxis]
+        r = np.arange(1, p + 1)
+        self._l = band[k + r, p - r]
+        self._u = band[:n, p:]
+
+    def _substitute(self, b):
+        n, p, q = self._n, self._p, self._q
+        l = self._l
+        y = np.zeros(n + max(p, q) + 1)
+        y[:n] = np.asarray(b, dtype=np.float64)[self._perm]
+        x = np.zeros(n + max(p, q) + 1)
+        u = self._u
+        if self._method == "choleski":
+            # the diagonal of L is held in the diagonal of u
+            for k in range(n):
+                y[k] /= u[k, 0]
+                y[k + 1:k + p + 1] -= l[k] * y[k]
+            for k in range(n - 1, -1, -1):
+                x[k] = (y[k] - np.dot(l[k], x[k + 1:k + p + 1])) / u[k, 0]
+        else:
+            for k in range(n):
+                y[k + 1:k + p + 1] -= l[k] * y[k]
+            for k in range(n - 1, -1, -1):
+                x[k] = (y[k] - np.dot(u[k, 1:], x[k + 1:k + q + 1])) / u[k, 0]
+        self._x = np.empty(n)
+        self._x[self._perm] = x[:n]
+        return self._x
+
+    def solve(self):
+        """Solve linear system."""
+        if self._x is None:
+            self._substitute(self._b)
+        return self._x
+
+    def solve_with_input(self, b):
+        """Solve linear system with new input vector."""
+        self._b = b
+        return self._substitute(b)
+
+    @property
+    def band_width(self):
+        """Return lower and upper band width of the reordered coefficient matrix."""
+        return self._p, self._q
+
+    @property
+    def perm(self):
+        """Return the ordering of the rows and columns of the coefficient matrix (see rcm_ordering())."""
+        return self._perm
@@ -2,4 +2,4 @@
 # Network flow analysis based on the Hardy Cross method
 """
 
-from pypeflow.analysis.analysis import Analyzer
+from pypeflow.analysis.analysis import Analyzer, AnalyzerSession
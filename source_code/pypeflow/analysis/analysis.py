@@ -1,30 +1,46 @@
 """
 ##  User interface for doing network flow analysis using the Hardy Cross method
 """
-from typing import Dict, Optional, Tuple
-import csv
-import pandas as pd
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple, TYPE_CHECKING
+import numpy as np
 import quantities as qty
-from pypeflow.analysis.network import Network
-from pypeflow.core.fluids import FLUIDS
+from pypeflow.analysis.network import Network, NetworkState
+from pypeflow.analysis.scenarios import ScenarioRunner
+from pypeflow.analysis.report import SolveReport
+from pypeflow.core.config_table import ConfigTable
+from pypeflow.core.fluids import create_fluid
 from pypeflow.core.pipe_schedules import PIPE_SCHEDULES
+from pypeflow.core.session import DefaultSession, Session, locked
 
+if TYPE_CHECKING:
+    import pandas as pd
 
-class Analyzer:
-    """Class that encapsulates the user interface methods for network flow analysis"""
-    network: Network = Network()
-    """Reference to the *Network* object"""
-    units: Dict[str, str] = {
+
+class AnalyzerSession(Session):
+    """
+    Session for network flow analysis. The session owns its network and the measuring units of its input and output,
+    and can be shared between threads (see *pypeflow.core.session.Session*).
+    """
+    default_units: Dict[str, str] = {
         'length': 'm',
         'diameter': 'mm',
         'flow_rate': 'L/s',
         'pressure': 'bar',
         'velocity': 'm/s'
     }
-    """Dictionary that holds the measuring units in which the quantity values are expressed"""
+    """The measuring units of a new session"""
 
-    @classmethod
-    def set_units(cls, units: Dict[str, str]):
+    def __init__(self, units: Optional[Dict[str, str]] = None):
+        """
+        Create a session with an empty network. The measuring units are the default units, updated with the optional
+        dictionary `units` (*Dict[str, str]*) (see `set_units`).
+        """
+        super().__init__(units)
+        self.network: Network = Network()
+        """Reference to the *Network* object"""
+
+    @locked
+    def set_units(self, units: Dict[str, str]):
         """
         Set the measuring SI-units of the quantities that will be used as input and that will be returned as output.
 
@@ -38,10 +54,10 @@ class Analyzer:
         - *'velocity'* (default value = *'m/s'*)
 
         """
-        cls.units.update(units)
+        self.units.update(units)
 
-    @classmethod
-    def create_network(cls, **kwargs):
+    @locked
+    def create_network(self, **kwargs):
         """
         Create the *Network* object.
 
@@ -60,26 +76,19 @@ class Analyzer:
         fluid_temperature: float = kwargs.get('fluid_temperature', 10.0)
         sch_str: str = kwargs.get('pipe_schedule', 'pipe_schedule_40')
 
-        fluid = cls._create_fluid(fluid_str, fluid_temperature)
-        pipe_schedule = cls._create_pipe_schedule(sch_str)
-        cls.network = Network.create(
+        fluid = self._create_fluid(fluid_str, fluid_temperature)
+        pipe_schedule = self._create_pipe_schedule(sch_str)
+        self.network = Network.create(
             start_node_id=start_node_id,
             end_node_id=end_node_id,
             fluid=fluid,
             pipe_schedule=pipe_schedule
         )
 
-    @classmethod
-    def _create_fluid(cls, fluid: str, temperature: float):
-        try:
-            fl = FLUIDS[fluid.lower()]
-        except KeyError:
-            raise KeyError(f'Fluid {fluid} unknown.')
-        else:
-            return fl(temperature)
+    def _create_fluid(self, fluid: str, temperature: float):
+        return create_fluid(fluid, temperature)
 
-    @classmethod
-    def _create_pipe_schedule(cls, pipe_schedule: str):
+    def _create_pipe_schedule(self, pipe_schedule: str):
         try:
             sch = PIPE_SCHEDULES[pipe_schedule.lower()]
         except KeyError:
@@ -87,8 +96,8 @@ class Analyzer:
         else:
             return sch
 
-    @classmethod
-    def configure_network(cls, file_path: str):
+    @locked
+    def configure_network(self, file_path: str):
         """
         Configure network via a network configuration file (.csv-file). Parameter `file_path` (*str*) is the file path
         to this configuration file. The configuration data is organised in a table. Each row contains the configuration
@@ -112,48 +121,93 @@ class Analyzer:
 
         Fixed pressure differences and flow rates in sections must carry a sign with reference to the positive loop
         sense (by convention clockwise sense).
+
+        A *ValueError* exception that names the row is raised if a field holds no number where a number is
+        expected, if an id or the nominal diameter of a section that is not a pseudo section is missing, if the pump
+        coefficients are incomplete, if a section is given twice in the same loop or if the rows of a section that is
+        shared by two loops have different start or end nodes. A *ValueError* exception is also raised if the start or
+        end node of the network does not occur in the file.
         """
-        with open(file_path) as f:
-            reader = csv.reader(f)
-            for i, row in enumerate(reader):
-                if i == 0:
-                    continue
-                else:
-                    cls.network.add_section(
-                        loop_id=row[0],
-                        section_id=row[1],
-                        start_node_id=row[2],
-                        end_node_id=row[3],
-                        nominal_diameter=qty.create(qty.Length, row[4], cls.units['diameter'], 0.0),
-                        length=qty.create(qty.Length, row[5], cls.units['length'], 0.0),
-                        zeta=cls._set_zeta(row[6], 0.0),
-                        pump_curve=cls._set_pump_curve(row[7], row[8], row[9]),
-                        dp_fixed=qty.create(qty.Pressure, row[10], cls.units['pressure'], None),
-                        flow_rate=qty.create(qty.VolumeFlowRate, row[11], cls.units['flow_rate'], 0.0)
-                    )
-
-    @staticmethod
-    def _set_pump_curve(a0: str, a1: str, a2: str) -> Optional[Tuple[float, float, float]]:
-        try:
-            a0 = float(a0)
-            a1 = float(a1)
-            a2 = float(a2)
-        except ValueError:
-            return None
-        else:
-            return a0, a1, a2
+        table = self._read_section_table(file_path, ['loop_id'])
+        self.network.add_section_table(table)
 
-    @staticmethod
-    def _set_zeta(value: str, fallback_value: float = 0.0) -> Optional[float]:
-        try:
-            value = float(value)
-        except ValueError:
-            return fallback_value
+    @locked
+    def configure_network_from_edges(self, file_path: str):
+        """
+        Configure network via a configuration file (.csv-file) that lists the sections of the network without loop
+        ids. The loops of the network are generated automatically (see
+        *pypeflow.analysis.network.Network.add_sections_from_edges*). Parameter `file_path` (*str*) is the file path
+        to the configuration file. Each row contains the configuration data of a section in the network. Each row has
+        the following fields (columns) in the order as mentioned here:
+
+        0. id of the section in the network
+        1. id of the start node of the section
+        2. id of the end node of the section
+        3. nominal diameter of the section
+        4. length of the section
+        5. sum of the resistance coefficients of fittings/valves in the section
+        6. pump coefficient a0 in the equation dp_pump = a0 + a1 * V + a2 * V ** 2 (leave empty if no pump is present
+        in the section)
+        7. pump coefficient a1
+        8. pump coefficient a2
+        9. fixed pressure difference between start and end node of the section (only in case of pseudo section, leave
+        empty if the section is not a pseudo section)
+        10. flow rate through the section (leave empty in case of a pseudo section)
+
+        Fixed pressure differences and flow rates in sections must carry a sign with reference to the sense from the
+        start node to the end node of the section. The initial flow rates must satisfy the flow balance at the nodes.
+
+        A *ValueError* exception that names the row is raised if a field holds no number where a number is
+        expected, if an id or the nominal diameter of a section that is not a pseudo section is missing, if the pump
+        coefficients are incomplete, if a section id is given twice or if the start or end node of the network does not
+        occur in the file.
+        """
+        table = self._read_section_table(file_path)
+        self.network.add_section_table(table)
+
+    def _read_section_table(self, file_path: str, extra_columns: Sequence[str] = ()) -> Dict[str, Any]:
+        # read and check a network configuration file in one pass and convert its columns to SI base units
+        text_columns = [*extra_columns, 'section_id', 'start_node_id', 'end_node_id']
+        table = ConfigTable(
+            file_path,
+            columns=[*text_columns, 'nominal_diameter', 'length', 'zeta', 'a0', 'a1', 'a2', 'dp_fixed', 'flow_rate'],
+            text_columns=text_columns
+        )
+        table.require(*text_columns)
+        table.require_complete('a0', 'a1', 'a2')
+        table.require('nominal_diameter', where=table.missing('dp_fixed'))
+        if 'loop_id' in extra_columns:
+            table.require_unique('loop_id', 'section_id')
+            nodes: Dict[str, Tuple[str, str]] = {}
+            for k, key in enumerate(zip(table['section_id'], table['start_node_id'], table['end_node_id'])):
+                if nodes.setdefault(key[0], key[1:]) != key[1:]:
+                    raise table.error(k, f'section {key[0]} is given with other start or end node in another loop')
         else:
-            return value
+            table.require_unique('section_id')
+        node_ids = set(table['start_node_id']).union(table['end_node_id'])
+        if self.network.start_node_id not in node_ids:
+            raise ValueError(f'start node {self.network.start_node_id} of the network does not occur in {file_path}')
+        if self.network.end_node_id not in node_ids:
+            raise ValueError(f'end node {self.network.end_node_id} of the network does not occur in {file_path}')
+        columns: Dict[str, Any] = {name: table[name] for name in text_columns}
+        columns.update(
+            nominal_diameter=qty.Length.convert(
+                np.nan_to_num(table['nominal_diameter'], nan=0.0), self.units['diameter'], 'm'
+            ),
+            length=qty.Length.convert(np.nan_to_num(table['length'], nan=0.0), self.units['length'], 'm'),
+            zeta=np.nan_to_num(table['zeta'], nan=0.0),
+            pump_curve=np.column_stack([table['a0'], table['a1'], table['a2']]),
+            dp_fixed=qty.Pressure.convert(table['dp_fixed'], self.units['pressure'], 'Pa'),
+            flow_rate=qty.VolumeFlowRate.convert(
+                np.nan_to_num(table['flow_rate'], nan=0.0), self.units['flow_rate'], 'm^3/s'
+            )
+        )
+        return columns
 
-    @classmethod
-    def solve(cls, error: float = 1.0e-3, i_max: int = 30):
+    @locked
+    def solve(self, error: float = 1.0e-3, i_max: int = 30, method: str = 'hardy_cross',
+              callback: Optional[Callable[[SolveReport], None]] = None, rel_error: float = 0.0,
+              flow_error: float = 0.0, relaxation: bool = False) -> SolveReport:
         """
         Solve the piping network for flow rates and pressure drops.
 
@@ -161,45 +215,146 @@ class Analyzer:
 
         - `error`: (*float*) = allowable deviation from zero for the pressure drop around each loop
         - `i_max`: (*int*) = the maximum number of iterations to find a solution within the given error tolerance
+        - `method`: (*str*) = the iteration method: *'hardy_cross'* (default), *'newton'* (all loop correction
+        terms are solved simultaneously) or *'node'* (flow rates and node pressures are solved simultaneously, for very
+        large networks)
+        - `callback`: (*Callable[[SolveReport], None]*) = optional function that is called after each iteration step
+        with the report of the iterations so far
+        - `rel_error`: (*float*) = allowable deviation from zero for the pressure drop around each loop relative to
+        the head around the loop, i.e. the sum of the absolute pressure differences across its sections. A loop is
+        solved if its pressure drop is smaller than `error` or than `rel_error` times its head (default 0.0: only the
+        absolute criterion `error` is used).
+        - `flow_error`: (*float*) = the iterations also stop when the largest change of a section flow rate in an
+        iteration step, relative to the largest section flow rate, is smaller than `flow_error` (default 0.0: not
+        used)
+        - `relaxation`: (*bool*) = damp the correction term of a loop that oscillates, i.e. whose correction term
+        changes sign from one step to the next without becoming much smaller (default *False*)
+
+        **Returns:** (*pypeflow.analysis.report.SolveReport*) the course of the iterations
 
         If no solution within the given fault tolerance is found after maximum number of iterations an *OverflowError*
         exception is raised.
 
         """
-        cls.network.solve(error, i_max)
+        return self.network.solve(error, i_max, method, callback, rel_error, flow_error, relaxation)
 
-    @classmethod
-    def get_network(cls) -> pd.DataFrame:
+    @locked
+    def set_zeta(self, section_id: str, zeta: float):
+        """
+        Change the sum of resistance coefficients `zeta` (*float*) of the section with id `section_id` (*str*) without
+        rebuilding the network.
+        """
+        self.network.set_zeta(section_id, zeta)
+
+    @locked
+    def set_pump_curve(self, section_id: str, pump_curve: Optional[Tuple[float, float, float]]):
+        """
+        Change the pump coefficients a0, a1 and a2 (*Tuple[float, float, float]*) of the section with id `section_id`
+        (*str*) without rebuilding the network. The coefficients are expressed as in the network configuration file.
+        Pass *None* to remove the pump from the section.
+        """
+        self.network.set_pump_curve(section_id, pump_curve)
+
+    @locked
+    def set_dp_fixed(self, section_id: str, dp_fixed: float):
+        """
+        Change the fixed pressure difference `dp_fixed` (*float*) of the pseudo section with id `section_id` (*str*)
+        without rebuilding the network. The pressure difference is expressed in the pressure unit of `units` and is
+        signed with reference to the positive sense of the loop to which the section was added first.
+        """
+        self.network.set_dp_fixed(section_id, qty.Pressure(dp_fixed, self.units['pressure']))
+
+    @locked
+    def snapshot(self) -> NetworkState:
+        """
+        Get a snapshot (*pypeflow.analysis.network.NetworkState*) of the current flow rates and loop correction terms
+        of the network.
+        """
+        return self.network.snapshot()
+
+    @locked
+    def restore(self, state: NetworkState):
+        """
+        Restore the flow rates and loop correction terms of the network from a snapshot
+        (*pypeflow.analysis.network.NetworkState*). The next call to `solve` starts from this state.
+        """
+        self.network.restore(state)
+
+    @locked
+    def save_network(self, file_path: str):
+        """
+        Save the configured or solved network to a binary snapshot file (.npz-file) with the given file path (*str*)
+        (see *pypeflow.analysis.network.Network.save*).
+        """
+        self.network.save(file_path)
+
+    @locked
+    def load_network(self, file_path: str, mmap: bool = False):
+        """
+        Replace the network by the network saved in the binary snapshot file with the given file path (*str*). With
+        `mmap` (*bool*) the arrays of the snapshot are memory-mapped read-only (see
+        *pypeflow.analysis.network.Network.load*).
+        """
+        self.network = Network.load(file_path, mmap)
+
+    @locked
+    def run_scenarios(self, cases: Any, error: float = 1.0e-3, i_max: int = 30, method: str = 'hardy_cross',
+                      warm_start: bool = True, max_workers: Optional[int] = None) -> 'pd.DataFrame':
+        """
+        Solve the configured network for a batch of cases (scenarios) that override initial flow rates, resistance
+        coefficients, pump curves and/or fixed pressure differences of sections. The network itself is not changed.
+        See *pypeflow.analysis.scenarios.ScenarioRunner* for the layout of the case table `cases` and for the other
+        parameters.
+
+        **Returns:** (*pandas.DataFrame*) the stacked results of all cases.
+
+        """
+        runner = ScenarioRunner(self.network, self.units)
+        return runner.run(cases, error, i_max, method, warm_start, max_workers)
+
+    @locked
+    def get_network(self) -> 'pd.DataFrame':
         """Return the solved network as a Pandas DataFrame."""
+        import pandas as pd
         keys = [
             'loop_id',
             'section_id',
             'start_node_id',
             'end_node_id',
-            f'length [{cls.units["length"]}]',
-            f'diameter [{cls.units["diameter"]}]',
+            f'length [{self.units["length"]}]',
+            f'diameter [{self.units["diameter"]}]',
             'zeta',
-            f'flow_rate [{cls.units["flow_rate"]}]',
-            f'velocity [{cls.units["velocity"]}]',
-            f'pressure_drop [{cls.units["pressure"]}]'
+            f'flow_rate [{self.units["flow_rate"]}]',
+            f'velocity [{self.units["velocity"]}]',
+            f'pressure_drop [{self.units["pressure"]}]'
         ]
         d = {k: [] for k in keys}
-        for loop in cls.network.loops.values():
-            for section in loop.sections.values():
-                d[keys[0]].append(loop.id)
-                d[keys[1]].append(section.id)
-                d[keys[2]].append(section.start_node.id)
-                d[keys[3]].append(section.end_node.id)
-                d[keys[4]].append(section.length(cls.units['length'], 3))
-                d[keys[5]].append(section.nominal_diameter(cls.units['diameter'], 3))
-                d[keys[6]].append(section.zeta)
-                d[keys[7]].append(section.sign * section.flow_rate(cls.units['flow_rate'], 3))
-                d[keys[8]].append(section.sign * section.velocity(cls.units['velocity'], 3))
-                d[keys[9]].append(section.pressure_drop(cls.units['pressure'], 3))
+        L, DN, V, v, dp, sign = [], [], [], [], [], []
+        rows = [(loop.id, section) for loop in self.network.loops.values() for section in loop.sections.values()]
+        rows.extend(('', section) for section in self.network.unlooped_sections)
+        for loop_id, section in rows:
+            d[keys[0]].append(loop_id)
+            d[keys[1]].append(section.id)
+            d[keys[2]].append(section.start_node.id)
+            d[keys[3]].append(section.end_node.id)
+            d[keys[6]].append(section.zeta)
+            L.append(section.length())
+            DN.append(section.nominal_diameter())
+            V.append(section.flow_rate())
+            v.append(section.velocity())
+            dp.append(section.pressure_drop())
+            sign.append(section.sign)
+        # the numerical columns are converted to the desired units as array quantities in one go
+        sign = np.array(sign, dtype=np.float64)
+        d[keys[4]] = qty.Length(np.array(L, dtype=np.float64))(self.units['length'], 3)
+        d[keys[5]] = qty.Length(np.array(DN, dtype=np.float64))(self.units['diameter'], 3)
+        d[keys[7]] = sign * qty.VolumeFlowRate(np.array(V, dtype=np.float64))(self.units['flow_rate'], 3)
+        d[keys[8]] = sign * qty.Velocity(np.array(v, dtype=np.float64))(self.units['velocity'], 3)
+        d[keys[9]] = qty.Pressure(np.array(dp, dtype=np.float64))(self.units['pressure'], 3)
         return pd.DataFrame(d)
 
-    @classmethod
-    def get_paths(cls) -> pd.DataFrame:
+    @locked
+    def get_paths(self) -> 'pd.DataFrame':
         """
         Get the flow paths in the solved network, returned as a Pandas DataFrame.
         For each flow path is returned:
@@ -210,18 +365,109 @@ class Analyzer:
         - static head
 
         """
+        import pandas as pd
         keys = [
             'path',
-            f'dp,vel [{cls.units["pressure"]}]',
-            f'dp,elev [{cls.units["pressure"]}]',
-            f'dp,dyn [{cls.units["pressure"]}]',
-            f'dp,stat [{cls.units["pressure"]}]',
+            f'dp,vel [{self.units["pressure"]}]',
+            f'dp,elev [{self.units["pressure"]}]',
+            f'dp,dyn [{self.units["pressure"]}]',
+            f'dp,stat [{self.units["pressure"]}]',
         ]
         d = {k: [] for k in keys}
-        for path in cls.network.paths:
+        heads = []
+        for path in self.network.paths:
             d[keys[0]].append(repr(path))
-            d[keys[1]].append(path.velocity_head(cls.units['pressure'], 3))
-            d[keys[2]].append(path.elevation_head(cls.units['pressure'], 3))
-            d[keys[3]].append(path.dynamic_head(cls.units['pressure'], 3))
-            d[keys[4]].append(path.static_head(cls.units['pressure'], 3))
+            heads.append((path.velocity_head(), path.elevation_head(), path.dynamic_head(), path.static_head()))
+        heads = qty.Pressure(np.array(heads, dtype=np.float64).reshape(-1, 4))(self.units['pressure'], 3)
+        for i in range(4):
+            d[keys[i + 1]] = heads[:, i]
         return pd.DataFrame(d)
+
+
+class Analyzer(metaclass=DefaultSession):
+    """
+    Class that encapsulates the user interface methods for network flow analysis. The class methods act on a default
+    *AnalyzerSession* held in class attribute `session`; class attributes `network` and `units` refer to the network
+    and the measuring units of this session. To work on several networks at once, e.g. in a thread pool, create an
+    *AnalyzerSession* for each network instead.
+    """
+    session: AnalyzerSession = AnalyzerSession()
+    """The default session"""
+
+    @classmethod
+    def set_units(cls, units: Dict[str, str]):
+        """See *AnalyzerSession.set_units*."""
+        cls.session.set_units(units)
+
+    @classmethod
+    def create_network(cls, **kwargs):
+        """See *AnalyzerSession.create_network*."""
+        cls.session.create_network(**kwargs)
+
+    @classmethod
+    def configure_network(cls, file_path: str):
+        """See *AnalyzerSession.configure_network*."""
+        cls.session.configure_network(file_path)
+
+    @classmethod
+    def configure_network_from_edges(cls, file_path: str):
+        """See *AnalyzerSession.configure_network_from_edges*."""
+        cls.session.configure_network_from_edges(file_path)
+
+    @classmethod
+    def solve(cls, error: float = 1.0e-3, i_max: int = 30, method: str = 'hardy_cross',
+              callback: Optional[Callable[[SolveReport], None]] = None, rel_error: float = 0.0,
+              flow_error: float = 0.0, relaxation: bool = False) -> SolveReport:
+        """See *AnalyzerSession.solve*."""
+        return cls.session.solve(error, i_max, method, callback, rel_error, flow_error, relaxation)
+
+    @classmethod
+    def set_zeta(cls, section_id: str, zeta: float):
+        """See *AnalyzerSession.set_zeta*."""
+        cls.session.set_zeta(section_id, zeta)
+
+    @classmethod
+    def set_pump_curve(cls, section_id: str, pump_curve: Optional[Tuple[float, float, float]]):
+        """See *AnalyzerSession.set_pump_curve*."""
+        cls.session.set_pump_curve(section_id, pump_curve)
+
+    @classmethod
+    def set_dp_fixed(cls, section_id: str, dp_fixed: float):
+        """See *AnalyzerSession.set_dp_fixed*."""
+        cls.session.set_dp_fixed(section_id, dp_fixed)
+
+    @classmethod
+    def snapshot(cls) -> NetworkState:
+        """See *AnalyzerSession.snapshot*."""
+        return cls.session.snapshot()
+
+    @classmethod
+    def restore(cls, state: NetworkState):
+        """See *AnalyzerSession.restore*."""
+        cls.session.restore(state)
+
+    @classmethod
+    def save_network(cls, file_path: str):
+        """See *AnalyzerSession.save_network*."""
+        cls.session.save_network(file_path)
+
+    @classmethod
+    def load_network(cls, file_path: str, mmap: bool = False):
+        """See *AnalyzerSession.load_network*."""
+        cls.session.load_network(file_path, mmap)
+
+    @classmethod
+    def run_scenarios(cls, cases: Any, error: float = 1.0e-3, i_max: int = 30, method: str = 'hardy_cross',
+                      warm_start: bool = True, max_workers: Optional[int] = None) -> 'pd.DataFrame':
+        """See *AnalyzerSession.run_scenarios*."""
+        return cls.session.run_scenarios(cases, error, i_max, method, warm_start, max_workers)
+
+    @classmethod
+    def get_network(cls) -> 'pd.DataFrame':
+        """See *AnalyzerSession.get_network*."""
+        return cls.session.get_network()
+
+    @classmethod
+    def get_paths(cls) -> 'pd.DataFrame':
+        """See *AnalyzerSession.get_paths*."""
+        return cls.session.get_paths()
@@ -0,0 +1,457 @@
+"""
+## Array-backed (compiled) form of a network for the analysis solver
+"""
+from typing import Dict, List, Tuple, Type, Optional, Callable
+import copy
+import time
+import numpy as np
+from nummath.linear_system import GaussElimin, CSRMatrix, SparseLUDecomp
+from pypeflow.core.fluids import Fluid
+from pypeflow.core.pipe_schedules import PipeSchedule
+from pypeflow.core.pipe import reynolds_number_array, darcy_friction_factor_array
+from pypeflow.core.graph import cycle_directions
+from pypeflow.analysis.report import SolveReport
+from pypeflow.analysis.node_solver import NodeSolver
+
+
+class CompiledNetwork:
+    """
+    Class that holds the sections and loops of a network in NumPy arrays, so that one iteration of the network
+    solver boils down to a handful of vectorized operations.
+
+    Each pipe or pump section is stored only once, even if it belongs to two loops. Its flow rate `q` is signed with
+    reference to the positive sense of the first loop the section was added to. The incidence of sections in loops is
+    stored as a sparse matrix in coordinate format: for each entry the loop index, the section index and the
+    orientation (+1 or -1) of the section in the loop. Pseudo sections have a fixed pressure difference: these are
+    kept per incidence entry in `pseudo_dp` and reduced to a constant term per loop in `dp_pseudo`.
+
+    The start and end node of the section of each incidence entry are also kept, so that the network can be solved
+    for the pressures at its nodes as well (see `node_incidence` and *pypeflow.analysis.node_solver.NodeSolver*).
+    """
+
+    RELAXATION_MIN: float = 0.05
+    """Lower limit of the under-relaxation factor of the loop correction terms"""
+
+    def __init__(self):
+        self.section_ids: List[str] = []
+        self.loop_ids: List[str] = []
+        self.length: np.ndarray = np.empty(0)
+        self.di: np.ndarray = np.empty(0)
+        self.roughness: np.ndarray = np.empty(0)
+        self.zeta: np.ndarray = np.empty(0)
+        self.a: np.ndarray = np.empty((0, 3))
+        self.q: np.ndarray = np.empty(0)
+        self.loop_idx: np.ndarray = np.empty(0, dtype=np.intp)
+        self.section_idx: np.ndarray = np.empty(0, dtype=np.intp)
+        self.orientation: np.ndarray = np.empty(0)
+        self.pseudo_ids: List[str] = []
+        self.pseudo_loop_idx: np.ndarray = np.empty(0, dtype=np.intp)
+        self.pseudo_idx: np.ndarray = np.empty(0, dtype=np.intp)
+        self.pseudo_orientation: np.ndarray = np.empty(0)
+        self.pseudo_dp: np.ndarray = np.empty(0)
+        self.dp_pseudo: np.ndarray = np.empty(0)
+        self.corr_terms: np.ndarray = np.empty(0)
+        self.section_index: Dict[str, int] = {}
+        self.pseudo_index: Dict[str, int] = {}
+        self.node_ids: List[str] = []
+        self.node_index: Dict[str, int] = {}
+        self.entry_nodes: np.ndarray = np.empty((0, 2), dtype=np.intp)
+        self.pseudo_entry_nodes: np.ndarray = np.empty((0, 2), dtype=np.intp)
+        self.rho: float = float('nan')
+        self.nu: float = float('nan')
+        self._pair_loop_idx: np.ndarray = np.empty((2, 0), dtype=np.intp)
+        self._pair_sign: np.ndarray = np.empty(0)
+        self._pair_section_idx: np.ndarray = np.empty(0, dtype=np.intp)
+        self._section_objects: List[list] = []
+        self._node_incidence: Optional[Tuple[np.ndarray, ...]] = None
+        self._jacobian: Optional[CSRMatrix] = None
+        self._jacobian_lu: Optional[SparseLUDecomp] = None
+
+    @classmethod
+    def create(cls, loops: Dict[str, 'Loop'], fluid: Fluid, pipe_schedule: Type[PipeSchedule]) -> 'CompiledNetwork':
+        """
+        Compile the loops of a network into arrays.
+
+        **Parameters:**
+
+        - `loops`: (*Dict[str, pypeflow.analysis.network.Loop]*) = the loops of the network
+        - `fluid`: (object of type *pyflow.core.fluids.Fluid*) = fluid that flows in the network
+        - `pipe_schedule`: (type of *pyflow.core.pipe_schedules.PipeSchedule*) = pipe schedule of the network sections
+
+        **Returns:** (*CompiledNetwork* object)
+
+        """
+        c = cls()
+        c.rho = fluid.density()
+        c.nu = fluid.kinematic_viscosity()
+        section_index = c.section_index
+        pseudo_index = c.pseudo_index
+        length, di, zeta, a = [], [], [], []
+        loop_idx, section_idx, orientation = [], [], []
+        pseudo_loop_idx, pseudo_idx, pseudo_orientation, pseudo_dp = [], [], [], []
+        entry_nodes, pseudo_entry_nodes = [], []
+        node_index = c.node_index
+        for i, loop in enumerate(loops.values()):
+            c.loop_ids.append(loop.id)
+            for section in loop.sections.values():
+                nodes = (
+                    node_index.setdefault(section.start_node.id, len(node_index)),
+                    node_index.setdefault(section.end_node.id, len(node_index))
+                )
+                if section.type == 'pseudo':
+                    pseudo_entry_nodes.append(nodes)
+                    k = pseudo_index.setdefault(section.id, len(pseudo_index))
+                    if k == len(c.pseudo_ids):
+                        c.pseudo_ids.append(section.id)
+                    pseudo_loop_idx.append(i)
+                    pseudo_idx.append(k)
+                    pseudo_orientation.append(section.orientation)
+                    pseudo_dp.append(section.dp)
+                    continue
+                j = section_index.get(section.id)
+                if j is None:
+                    j = section_index[section.id] = len(c.section_ids)
+                    c.section_ids.append(section.id)
+                    c._section_objects.append([])
+                    length.append(section.length())
+                    di.append(pipe_schedule.inside_diameter(section.nominal_diameter)())
+                    zeta.append(section.zeta)
+                    a.append(section.pump_coefficients)
+                c._section_objects[j].append(section)
+                entry_nodes.append(nodes)
+                loop_idx.append(i)
+                section_idx.append(j)
+                orientation.append(section.orientation)
+        c.length = np.array(length, dtype=np.float64)
+        c.di = np.array(di, dtype=np.float64)
+        c.roughness = np.full(len(c.section_ids), pipe_schedule.pipe_roughness())
+        c.zeta = np.array(zeta, dtype=np.float64)
+        c.a = np.array(a, dtype=np.float64).reshape(-1, 3)
+        c.loop_idx = np.array(loop_idx, dtype=np.intp)
+        c.section_idx = np.array(section_idx, dtype=np.intp)
+        c.orientation = np.array(orientation, dtype=np.float64)
+        c.pseudo_loop_idx = np.array(pseudo_loop_idx, dtype=np.intp)
+        c.pseudo_idx = np.array(pseudo_idx, dtype=np.intp)
+        c.pseudo_orientation = np.array(pseudo_orientation, dtype=np.float64)
+        c.pseudo_dp = np.array(pseudo_dp, dtype=np.float64)
+        c.node_ids = list(node_index)
+        c.entry_nodes = np.array(entry_nodes, dtype=np.intp).reshape(-1, 2)
+        c.pseudo_entry_nodes = np.array(pseudo_entry_nodes, dtype=np.intp).reshape(-1, 2)
+        c.update_pseudo_sections()
+        c.q = np.zeros(len(c.section_ids))
+        c.corr_terms = np.zeros(len(c.loop_ids))
+        c._pair_incidence()
+        c.read_flow_rates()
+        return c
+
+    def _pair_incidence(self):
+        # Every pair of incidence entries (e1, e2) that refer to the same section contributes the term
+        # orientation[e1] * orientation[e2] * n[section] to element (loop[e1], loop[e2]) of the loop Jacobian. The
+        # pairs are listed once, so that the sparsity pattern of the Jacobian is known before the first iteration.
+        order = np.argsort(self.section_idx, kind='stable')
+        bounds = np.searchsorted(self.section_idx[order], np.arange(len(self.section_ids) + 1))
+        e1, e2 = [], []
+        for j in range(len(self.section_ids)):
+            entries = order[bounds[j]:bounds[j + 1]]
+            e1.append(np.repeat(entries, len(entries)))
+            e2.append(np.tile(entries, len(entries)))
+        e1 = np.concatenate(e1) if e1 else np.empty(0, dtype=np.intp)
+        e2 = np.concatenate(e2) if e2 else np.empty(0, dtype=np.intp)
+        self._pair_loop_idx = np.array([self.loop_idx[e1], self.loop_idx[e2]]).reshape(2, -1)
+        self._pair_sign = self.orientation[e1] * self.orientation[e2]
+        self._pair_section_idx = self.section_idx[e1]
+
+    def node_incidence(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the nodes between which the sections lie, taken in the positive sense of the loop to which each section was
+        added first.
+
+        **Returns:** (*Tuple[np.ndarray, np.ndarray, np.ndarray]*)<br>
+
+        - for each pipe or pump section the index in `node_ids` of the node that the section leaves and of the node that
+        it enters when its flow rate `q` is positive (shape (number of sections, 2))
+        - the same for each pseudo section: its fixed pressure difference is the pressure at the first node minus the
+        pressure at the second node
+        - for each pseudo section the index of its first incidence entry in `pseudo_dp`
+
+        Only the relative senses of the loops are known, through the orientations of the sections they share. The
+        direction in which a loop runs through its sections follows from walking around the loop. A *ValueError*
+        exception is raised if the sections of a loop do not form a closed cycle, or if the orientations of the shared
+        sections contradict each other.
+
+        """
+        if self._node_incidence is None:
+            m = len(self.section_ids)
+            keys = np.concatenate([self.section_idx, m + self.pseudo_idx]).tolist()
+            loops = np.concatenate([self.loop_idx, self.pseudo_loop_idx]).tolist()
+            orientation = np.concatenate([self.orientation, self.pseudo_orientation]).astype(int).tolist()
+            nodes = np.concatenate([self.entry_nodes, self.pseudo_entry_nodes])
+            loop_entries: List[List[int]] = [[] for _ in self.loop_ids]
+            key_entries: Dict[int, List[int]] = {}
+            for e, (i, k) in enumerate(zip(loops, keys)):
+                loop_entries[i].append(e)
+                key_entries.setdefault(k, []).append(e)
+            # direction in which each loop runs through its sections, regardless of the sense of the loop
+            walk = [0] * len(keys)
+            for i, entries in enumerate(loop_entries):
+                try:
+                    directions = cycle_directions([(nodes[e, 0], nodes[e, 1]) for e in entries])
+                except ValueError:
+                    raise ValueError(f'loop {self.loop_ids[i]} is not a closed cycle of sections')
+                for e, d in zip(entries, directions):
+                    walk[e] = d
+            # sense of each loop (+1 or -1), such that all incidence entries of a section agree on the direction of the
+            # section in the sense of the loop it was added to first
+            sense = [0] * len(self.loop_ids)
+            for root in range(len(self.loop_ids)):
+                if sense[root] != 0:
+                    continue
+                sense[root] = 1
+                stack = [root]
+                while stack:
+                    i = stack.pop()
+                    for e in loop_entries[i]:
+                        direction = sense[i] * walk[e] * orientation[e]
+                        for f in key_entries[keys[e]]:
+                            required = direction * walk[f] * orientation[f]
+                            if sense[loops[f]] == 0:
+                                sense[loops[f]] = required
+                                stack.append(loops[f])
+                            elif sense[loops[f]] != required:
+                                raise ValueError(
+                                    f'orientation of section {self._key_id(keys[f])} in loop '
+                                    f'{self.loop_ids[loops[f]]} contradicts the other loops'
+                                )
+            direction = np.array(sense)[loops] * np.array(walk) * np.array(orientation)
+            nodes = np.where(direction[:, np.newaxis] > 0, nodes, nodes[:, ::-1])
+            _, first = np.unique(keys, return_index=True)  # first incidence entry of each section
+            self._node_incidence = (nodes[first[:m]], nodes[first[m:]], first[m:] - len(self.section_idx))
+        return self._node_incidence
+
+    def _key_id(self, k: int) -> str:
+        m = len(self.section_ids)
+        return self.section_ids[k] if k < m else self.pseudo_ids[k - m]
+
+    def update_pseudo_sections(self):
+        """Sum the fixed pressure differences `pseudo_dp` of the pseudo sections to a constant term per loop."""
+        self.dp_pseudo = np.bincount(self.pseudo_loop_idx, weights=self.pseudo_dp, minlength=len(self.loop_ids))
+
+    def set_zeta(self, section_id: str, zeta: float):
+        """Change the sum of resistance coefficients (*float*) of the pipe or pump section with the given id."""
+        self.zeta[self.section_index[section_id]] = zeta
+
+    def set_pump_coefficients(self, section_id: str, a: Tuple[float, float, float]):
+        """Change the pump coefficients (*Tuple[float, float, float]*) of the section with the given id."""
+        self.a[self.section_index[section_id]] = a
+
+    def set_dp_fixed(self, section_id: str, dp_fixed: float):
+        """
+        Change the fixed pressure difference (*float*) [Pa] of the pseudo section with the given id. The pressure
+        difference is signed with reference to the positive sense of the loop to which the section was added first.
+        """
+        entries = self.pseudo_idx == self.pseudo_index[section_id]
+        self.pseudo_dp[entries] = self.pseudo_orientation[entries] * dp_fixed
+        self.update_pseudo_sections()
+
+    def copy(self) -> 'CompiledNetwork':
+        """
+        Get a copy (*CompiledNetwork*) of the compiled network with its own arrays of flow rates and section data. The
+        copy is detached from the *Section* objects of the network: it can be solved and changed independently (e.g.
+        in another process), but it cannot write back its results.
+        """
+        c = copy.copy(self)
+        for name in ('zeta', 'a', 'q', 'pseudo_dp', 'dp_pseudo', 'corr_terms'):
+            setattr(c, name, getattr(self, name).copy())
+        c._section_objects = []
+        c._jacobian = c._jacobian_lu = None
+        return c
+
+    def read_flow_rates(self):
+        """Take over the current flow rates of the *Section* objects of the network."""
+        for j, sections in enumerate(self._section_objects):
+            section = sections[0]
+            self.q[j] = section.orientation * section.sign * section.V
+
+    def write_back(self):
+        """Write the flow rates and pressure drops back to the *Section* objects of the network."""
+        dp = self.pressure_drop(np.abs(self.q))
+        for j, sections in enumerate(self._section_objects):
+            for section in sections:
+                q = section.orientation * self.q[j]
+                section.sign = -1 if q < 0.0 else 1
+                section.V = abs(q)
+                section.dp = dp[j]
+
+    def pressure_drop(self, V: np.ndarray) -> np.ndarray:
+        """
+        Get the pressure drop (*np.ndarray*) [Pa] due to friction and fittings/valves across each section for the
+        given flow rates `V` (*np.ndarray*) [m^3/s].
+
+        """
+        v = V / (np.pi * self.di ** 2 / 4.0)
+        re = reynolds_number_array(v, self.di, self.nu)
+        f = darcy_friction_factor_array(re, self.roughness / self.di)
+        vp = self.rho * v ** 2 / 2.0
+        return (f * self.length / self.di + self.zeta) * vp
+
+    def section_terms(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Evaluate the sections at the current flow rates.
+
+        **Returns:** (*Tuple[np.ndarray, np.ndarray]*)<br>
+
+        - the pressure drop across each section in the sense of its flow rate `q`, less the pump head [Pa]
+        - the derivative of the pressure drop with respect to flow rate of each section (numerator term `n` of the
+        loop correction term)
+
+        """
+        V = np.abs(self.q)
+        V_safe = np.maximum(V, 1.0e-12)
+        dp = self.pressure_drop(V)
+        a0, a1, a2 = self.a[:, 0], self.a[:, 1], self.a[:, 2]
+        h = np.sign(self.q) * (dp - (a0 + a1 * V + a2 * V ** 2))
+        n = 2.0 * dp / V_safe - (a1 + 2.0 * a2 * V)
+        return h, n
+
+    def loop_residual(self, h: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sum the section pressure drops `h` (*np.ndarray*) [Pa] (see `section_terms`) around the loops.
+
+        **Returns:** (*Tuple[np.ndarray, np.ndarray]*)<br>
+
+        - the pressure drop around each loop, i.e. the loop residual [Pa]
+        - the head around each loop [Pa]: the sum of the absolute pressure differences across the sections in the loop,
+        to which the loop residual can be compared
+
+        """
+        residual = self.dp_pseudo + np.bincount(
+            self.loop_idx,
+            weights=self.orientation * h[self.section_idx],
+            minlength=len(self.loop_ids)
+        )
+        head = np.bincount(
+            self.loop_idx, weights=np.abs(h[self.section_idx]), minlength=len(self.loop_ids)
+        ) + np.bincount(
+            self.pseudo_loop_idx, weights=np.abs(self.pseudo_dp), minlength=len(self.loop_ids)
+        )
+        return residual, head
+
+    def evaluate(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Evaluate the network at the current flow rates.
+
+        **Returns:** (*Tuple[np.ndarray, np.ndarray, np.ndarray]*)<br>
+        The loop residuals, the section derivative terms `n` and the loop heads (see `section_terms` and
+        `loop_residual`).
+
+        """
+        h, n = self.section_terms()
+        residual, head = self.loop_residual(h)
+        return residual, n, head
+
+    def correction_terms(self, residual: np.ndarray, n: np.ndarray, method: str = 'hardy_cross') -> np.ndarray:
+        """
+        Calculate the loop correction terms (*np.ndarray*) from the loop residuals and the section derivative terms
+        (see `evaluate`). With method *'hardy_cross'* only the diagonal of the loop Jacobian is used, with method
+        *'newton'* the full loop Jacobian is solved.
+
+        The loop Jacobian is sparse: two loops only interact if they share a section. It is solved with a sparse
+        LU-decomposition of which the ordering and band structure are determined in the first iteration and reused in
+        the next ones. If a pivot turns out to be zero, the Jacobian is solved by Gauss elimination with row pivoting
+        instead.
+
+        """
+        m = len(self.loop_ids)
+        if method == 'newton':
+            weights = self._pair_sign * n[self._pair_section_idx]
+            if self._jacobian is None:
+                self._jacobian = CSRMatrix.from_coo(*self._pair_loop_idx, weights, (m, m))
+            else:
+                self._jacobian.update(weights)
+            try:
+                if self._jacobian_lu is None:
+                    self._jacobian_lu = SparseLUDecomp(self._jacobian)
+                else:
+                    self._jacobian_lu.update(self._jacobian)
+            except ValueError:
+                self._jacobian_lu = None
+                return GaussElimin(self._jacobian.to_dense(), residual.copy(), pivot_on=True).solve()
+            return self._jacobian_lu.solve_with_input(residual)
+        diagonal = np.bincount(self.loop_idx, weights=n[self.section_idx], minlength=m)
+        return residual / diagonal
+
+    def apply_correction_terms(self, corr_terms: np.ndarray):
+        """Apply the loop correction terms (*np.ndarray*) to the flow rates of the sections."""
+        self.q -= np.bincount(
+            self.section_idx,
+            weights=self.orientation * corr_terms[self.loop_idx],
+            minlength=len(self.section_ids)
+        )
+
+    def solve(self, error: float = 1.0e-3, i_max: int = 30, method: str = 'hardy_cross',
+              callback: Optional[Callable[[SolveReport], None]] = None, rel_error: float = 0.0,
+              flow_error: float = 0.0, relaxation: bool = False) -> SolveReport:
+        """
+        Iterate the flow rates `q` until the network is solved. See *pypeflow.analysis.network.Network.solve* for the
+        parameters.
+
+        **Returns:** (*pypeflow.analysis.report.SolveReport*) the course of the iterations.
+
+        If no solution is found, the *OverflowError* exception that is raised carries the report in its attribute
+        `report`.
+
+        """
+        method = method.lower()
+        if method not in ('hardy_cross', 'newton', 'node'):
+            raise KeyError(f'Solution method {method} unknown.')
+        report = SolveReport(method, self.loop_ids, error)
+        node_solver = NodeSolver(self) if method == 'node' else None
+        omega = np.ones(len(self.loop_ids))  # under-relaxation factor of each loop
+        corr_prev: Optional[np.ndarray] = None
+
+        def calculate_step() -> bool:
+            nonlocal corr_prev
+            t_start = time.perf_counter()
+            h, n = self.section_terms()
+            residual, head = self.loop_residual(h)
+            q_prev = self.q.copy()
+            if node_solver is not None:
+                self.corr_terms = np.zeros(len(self.loop_ids))
+                node_solver.step(h, n)
+            else:
+                corr_terms = self.correction_terms(residual, n, method)
+                if relaxation:
+                    # a loop whose correction term changes sign from one step to the next without becoming much
+                    # smaller oscillates around its solution: its correction term is damped by halving its relaxation
+                    # factor, which is restored step by step once the oscillation has stopped
+                    if corr_prev is not None:
+                        flip = (corr_terms * corr_prev < 0.0) & (np.abs(corr_terms) > 0.5 * np.abs(corr_prev))
+                        omega[flip] = np.maximum(0.5 * omega[flip], self.RELAXATION_MIN)
+                        omega[~flip] = np.minimum(2.0 * omega[~flip], 1.0)
+                    corr_prev = corr_terms
+                    corr_terms = omega * corr_terms
+                self.corr_terms = corr_terms
+                self.apply_correction_terms(self.corr_terms)
+            sign_reversals = int(np.count_nonzero((q_prev < 0.0) != (self.q < 0.0)))
+            q_max = np.max(np.abs(self.q)) if len(self.q) else 0.0
+            flow_change = float(np.max(np.abs(self.q - q_prev)) / q_max) if q_max > 0.0 else 0.0
+            report.add_step(
+                residual, self.corr_terms, time.perf_counter() - t_start, sign_reversals,
+                flow_change, float(np.min(omega)) if len(omega) else 1.0
+            )
+            if callback is not None:
+                callback(report)
+            converged = np.all(np.abs(residual) < np.maximum(error, rel_error * head))
+            return converged or flow_change < flow_error
+
+        i = 0
+        converged = calculate_step()
+        while not converged:
+            converged = calculate_step()
+            i += 1
+            if i > i_max:
+                e = OverflowError('no solution found while maximum number of iterations has been exceeded')
+                e.report = report
+                raise e
+        report.converged = True
+        return report
@@ -1,13 +1,20 @@
 """
 ## Modeling the components for network flow analysis
 """
-from typing import Dict, Tuple, Optional, List, Type
+from typing import Any, Dict, Tuple, Optional, List, Type, Iterator, Callable
 import math
-import threading
+import numpy as np
 import quantities as qty
 from pypeflow.core.fluids import Fluid
 from pypeflow.core.pipe_schedules import PipeSchedule
 from pypeflow.core.pipe import Pipe
+from pypeflow.core.graph import iter_flow_paths, fundamental_cycles, PathTrie
+from pypeflow.core.snapshot import (
+    save_snapshot, load_snapshot, get_fields, set_fields, text_array, ragged_arrays, split_ragged, fluid_arrays,
+    restore_fluid, pipe_schedule_array, restore_pipe_schedule
+)
+from pypeflow.analysis.compiled import CompiledNetwork
+from pypeflow.analysis.report import SolveReport
 
 
 class Node:
@@ -68,26 +75,29 @@ class Node:
 class Section:
     """Class that models a pipe section in a network."""
 
-    def __init__(self, section_id: str, loop_id: str, start_node: Node, end_node: Node):
+    def __init__(self, section_id: str, loop_id: Optional[str], start_node: Node, end_node: Node):
         """
         Create *Section* object.
 
         **Parameters:**
 
         - `section_id`: (*str*) = id of the pipe section in the network
-        - `loop_id`: (*str*) = id of the primary network loop to which the section belongs
+        - `loop_id`: (*str*) = id of the primary network loop to which the section belongs (*None* if the section
+        does not belong to a loop)
         - `start_node`: (*Node* object) = start node of the pipe section
         - `end_node`: (*Node* object) = end node of the pipe section
 
         """
         self.id: str = section_id
-        self.loop_id: str = loop_id
+        self.loop_id: Optional[str] = loop_id
         self.start_node: Node = start_node
         self.end_node: Node = end_node
         self.start_node.connect(self, 'out')
         self.end_node.connect(self, 'in')
         self.type: str = ''
         self.sign: int = 1
+        self.orientation: int = 1
+        self.direction: int = 1  # +1 if the positive sense of the loop runs from the start node to the end node
         self._length: float = math.nan
         self._nom_diameter: float = math.nan
         self.zeta: float = math.nan
@@ -115,26 +125,55 @@ class Section:
         - `pipe_schedule`: (type of *pyflow.core.pipe_schedules.PipeSchedule*) = pipe schedule of the section
 
         """
-        if kwargs['dp_fixed'] is not None:
+        dp_fixed = kwargs['dp_fixed']
+        if dp_fixed is not None:
+            self.configure(dp_fixed=dp_fixed())
+        else:
+            self.configure(
+                pump_curve=kwargs['pump_curve'],
+                length=kwargs['length'](),
+                nominal_diameter=kwargs['nominal_diameter'](),
+                zeta=kwargs['zeta'],
+                flow_rate=kwargs['flow_rate'](),
+                fluid=kwargs['fluid'],
+                pipe_schedule=kwargs['pipe_schedule']
+            )
+
+    def configure(self, dp_fixed: Optional[float] = None, pump_curve: Optional[Tuple[float, float, float]] = None,
+                  length: float = math.nan, nominal_diameter: float = math.nan, zeta: float = math.nan,
+                  flow_rate: float = math.nan, fluid: Optional[Fluid] = None,
+                  pipe_schedule: Optional[Type[PipeSchedule]] = None):
+        """
+        Configure the pipe section with plain values expressed in SI base units instead of quantities (see
+        `configure_section`): `dp_fixed` [Pa], `length` [m], `nominal_diameter` [m] and `flow_rate` [m^3/s]. Only
+        `dp_fixed` is used in case of a pseudo section.
+        """
+        if dp_fixed is not None:
             self.type = 'pseudo'
-            self.dp = kwargs['dp_fixed']()
+            self.dp = dp_fixed
         else:
-            if kwargs['pump_curve'] is not None:
+            if pump_curve is not None:
                 self.type = 'pump'
-                self._a = kwargs['pump_curve']
+                self._a = pump_curve
             else:
                 self.type = 'pipe'
-            self._length = kwargs['length']()
-            self._nom_diameter = kwargs['nominal_diameter']()
-            self.zeta = kwargs['zeta']
-            V = kwargs['flow_rate']()
-            if V < 0.0:
-                self.V = abs(V)
+            self._length = length
+            self._nom_diameter = nominal_diameter
+            self.zeta = zeta
+            if flow_rate < 0.0:
+                self.V = abs(flow_rate)
                 self.sign = -1
             else:
-                self.V = V
-            self._fluid = kwargs['fluid']
-            self._pipe_schedule = kwargs['pipe_schedule']
+                self.V = flow_rate
+            self._fluid = fluid
+            self._pipe_schedule = pipe_schedule
+
+    @property
+    def pump_coefficients(self) -> Tuple[float, float, float]:
+        """Get the pump coefficients (*Tuple[float, float, float]*) of the section (all zero if there is no pump)."""
+        if self.type == 'pump':
+            return self._a
+        return 0.0, 0.0, 0.0
 
     @property
     def dp_pipe(self) -> float:
@@ -165,7 +204,10 @@ class Section:
 
     def calc_pressure_drop(self):
         """Calculate pressure drop across the pipe or pump section."""
-        if self.type != 'pseudo':
+        if self.type != 'pseudo' and self.V == 0.0:
+            # e.g. a dead-end branch without flow
+            self.dp = 0.0
+        elif self.type != 'pseudo':
             pipe = Pipe.create(
                 fluid=self._fluid,
                 pipe_schedule=self._pipe_schedule,
@@ -235,22 +277,6 @@ class Loop:
         if v is not section:
             raise ValueError(f'section with {section.id} was already added to loop {self.id}')
 
-    def calculate_correction_term(self):
-        """Calculate loop correction term."""
-        d = 0.0
-        n = 0.0
-        for section in self.sections.values():
-            section.calc_pressure_drop()
-            if section.type == 'pipe':
-                d += section.dp_pipe
-                n += section.n_pipe
-            elif section.type == 'pump':
-                d += section.dp_pump
-                n += section.n_pump
-            elif section.type == 'pseudo':
-                d += section.dp_pseudo
-        self.corr_term = d / n
-
     @property
     def pressure_drop(self):
         """Get pressure drop (*float*) around the loop."""
@@ -286,12 +312,18 @@ class FlowPath(List[Section]):
     @property
     def dynamic_head(self) -> qty.Pressure:
         """Get the dynamic head (*quantities.Pressure*) between end and start node of the flow path."""
-        return qty.Pressure(sum([section.pressure_drop() for section in self if section.type != 'pseudo']))
+        # the pressure drops of the sections are signed with reference to the sense of their loop; the flow path runs
+        # through each section from its start node to its end node
+        return qty.Pressure(sum([
+            section.direction * section.pressure_drop() for section in self if section.type != 'pseudo'
+        ]))
 
     @property
     def elevation_head(self) -> qty.Pressure:
         """Get the elevation head (*quantities.Pressure*) between end and start node of the flow path."""
-        return qty.Pressure(sum([section.pressure_drop() for section in self if section.type == 'pseudo']))
+        return qty.Pressure(sum([
+            section.direction * section.pressure_drop() for section in self if section.type == 'pseudo'
+        ]))
 
     @property
     def velocity_head(self) -> qty.Pressure:
@@ -311,6 +343,33 @@ class FlowPath(List[Section]):
         return qty.Pressure(-(dp_vel + dp_elev + dp_dyn))
 
 
+_SECTION_FIELDS: Tuple[str, ...] = ('_length', '_nom_diameter', 'zeta', 'V', 'dp')
+"""Float attributes of a section that are saved in a snapshot of the network (see `Network.save`)"""
+
+
+class NetworkState:
+    """
+    Class that holds a snapshot of the solution state of a network: the signed flow rates of the pipe and pump sections
+    and the loop correction terms of the last iteration.
+    """
+
+    def __init__(self, section_ids: List[str], flow_rates: np.ndarray, corr_terms: np.ndarray):
+        """
+        Create *NetworkState* object.
+
+        **Parameters:**
+
+        - `section_ids`: (*List[str]*) = ids of the pipe and pump sections in the network
+        - `flow_rates`: (*np.ndarray*) = flow rates [m^3/s] of the sections, signed with reference to the positive
+        sense of the loop to which each section was added first
+        - `corr_terms`: (*np.ndarray*) = loop correction terms [m^3/s]
+
+        """
+        self.section_ids: List[str] = list(section_ids)
+        self.flow_rates: np.ndarray = np.array(flow_rates, dtype=np.float64)
+        self.corr_terms: np.ndarray = np.array(corr_terms, dtype=np.float64)
+
+
 class Network:
     """Class that models a piping network."""
 
@@ -323,6 +382,9 @@ class Network:
         self.nodes: Dict[str, Node] = {}
         self.sections: Dict[str, List[Section]] = {}
         self._paths: List[FlowPath] = []
+        self._path_trie: PathTrie = PathTrie()
+        self._compiled: Optional[CompiledNetwork] = None
+        self._unlooped_sections: List[Section] = []
 
     @classmethod
     def create(cls, **kwargs):
@@ -358,64 +420,189 @@ class Network:
         - `section_id`: (*str*) = id of the section
         - `start_node_id`: (*str*) = the id of the start node of the section
         - `end_node_id`: (*str*) = the id of the end node of the section
-        - `loop_id`: (*str*) = the id of the loop to which the section belongs
+        - `loop_id`: (*str*) = the id of the loop to which the section belongs (*None* for a section that does not
+        belong to any loop)
+        - `orientation`: (*int*) = +1 if the positive sense of the loop runs through the section in the same sense as
+        the loop to which the section was added first, -1 if it runs the other way. If omitted, a section that is added
+        to a second loop is taken to be oriented opposite to the first loop.
 
         """
         section_id = kwargs.pop('section_id')
         sn_id = kwargs.pop('start_node_id')
         en_id = kwargs.pop('end_node_id')
         loop_id = kwargs.pop('loop_id')
+        orientation = kwargs.pop('orientation', None)
         kwargs.update({'fluid': self.fluid, 'pipe_schedule': self.pipe_schedule})
+        section = self._add_section(section_id, sn_id, en_id, loop_id, orientation)
+        section.configure_section(**kwargs)
 
-        start_node = self.nodes.setdefault(sn_id, Node(sn_id))
-        end_node = self.nodes.setdefault(en_id, Node(en_id))
+    def _add_section(self, section_id: str, sn_id: str, en_id: str, loop_id: Optional[str],
+                     orientation: Optional[int]) -> Section:
+        # create a section between two (new or existing) nodes and add it to its loop
+        start_node = self.nodes.get(sn_id)
+        if start_node is None:
+            start_node = self.nodes[sn_id] = Node(sn_id)
+        end_node = self.nodes.get(en_id)
+        if end_node is None:
+            end_node = self.nodes[en_id] = Node(en_id)
         section = Section(section_id, loop_id, start_node, end_node)
-        section.configure_section(**kwargs)
-        loop = self.loops.setdefault(loop_id, Loop(loop_id))
-        loop.add_section(section)
         section_list = self.sections.setdefault(section_id, [])
+        if loop_id is None:
+            self._unlooped_sections.append(section)
+        else:
+            loop = self.loops.get(loop_id)
+            if loop is None:
+                loop = self.loops[loop_id] = Loop(loop_id)
+            loop.add_section(section)
+            # a section shared by two loops is oriented opposite to the positive sense of the loop it was first added
+            # to, unless its orientation is given
+            if orientation is not None:
+                section.orientation = orientation
+            elif section_list:
+                section.orientation = -1
+            section.direction = section.orientation
         section_list.append(section)
+        self._compiled = None
+        return section
+
+    def add_sections_from_edges(self, edges: List[Dict[str, Any]]):
+        """
+        Add the sections of a network given as a plain list of edges, without loop ids. The loops of the network are
+        generated automatically as a fundamental cycle basis of the network graph (see
+        *pypeflow.core.graph.fundamental_cycles*). The generated loops get ids *'L1'*, *'L2'*, ...
+
+        Parameter `edges` is a list of dictionaries (*List[Dict[str, Any]]*), one per section, with the keyword
+        arguments of `add_section` except `loop_id` and `orientation`. The flow rate (`flow_rate`) and the fixed
+        pressure difference of a pseudo section (`dp_fixed`) are signed with reference to the sense from the start node
+        to the end node of the section.
+
+        A section that does not lie on any loop (e.g. a single branch leading to the end node) is kept with its given
+        flow rate, as the flow rate through such a section is fixed by the flow balance at the nodes.
+
+        """
+        def value(edge: Dict[str, Any], key: str) -> float:
+            q = edge.get(key)
+            return math.nan if q is None else q()
+
+        no_pump = (math.nan, math.nan, math.nan)
+        self.add_section_table({
+            'section_id': [edge['section_id'] for edge in edges],
+            'start_node_id': [edge['start_node_id'] for edge in edges],
+            'end_node_id': [edge['end_node_id'] for edge in edges],
+            'nominal_diameter': [value(edge, 'nominal_diameter') for edge in edges],
+            'length': [value(edge, 'length') for edge in edges],
+            'zeta': [edge.get('zeta', math.nan) for edge in edges],
+            'pump_curve': [edge.get('pump_curve') or no_pump for edge in edges],
+            'dp_fixed': [value(edge, 'dp_fixed') for edge in edges],
+            'flow_rate': [value(edge, 'flow_rate') for edge in edges]
+        })
+
+    def add_section_table(self, table: Dict[str, Any]):
+        """
+        Add the sections of a network in bulk. The section data is given column by column as plain values expressed
+        in SI base units, so that no quantity objects are created per section. A network configuration file can be
+        read into such a table with *pypeflow.core.config_table.ConfigTable*.
+
+        Parameter `table` is a dictionary (*Dict[str, Any]*) of columns of equal length, with one element per section:
+
+        - `section_id`, `start_node_id`, `end_node_id`: (*Sequence[str]*) = the ids of the sections and of their start
+        and end nodes
+        - `loop_id`: (*Sequence[str]*) = the ids of the loops to which the sections belong (optional)
+        - `orientation`: (*Sequence[int]*) = the orientation of the sections in their loops (optional, see
+        `add_section`)
+        - `nominal_diameter`, `length`: (*Sequence[float]*) = nominal diameters and lengths [m] of the sections
+        - `zeta`: (*Sequence[float]*) = sums of resistance coefficients of the sections
+        - `pump_curve`: (*Sequence[Tuple[float, float, float]]*) = pump coefficients a0, a1 and a2 of the sections (NaN
+        if there is no pump in the section)
+        - `dp_fixed`: (*Sequence[float]*) = fixed pressure differences [Pa] of the sections (NaN if the section is not
+        a pseudo section)
+        - `flow_rate`: (*Sequence[float]*) = initial flow rates [m^3/s] of the sections
+
+        If the table has a column `loop_id`, flow rates and fixed pressure differences are signed with reference to the
+        positive sense of the loops, as in `add_section`. Without it, the loops are generated as in
+        `add_sections_from_edges` and flow rates and fixed pressure differences are signed with reference to the sense
+        from the start node to the end node of the sections.
+
+        """
+        ids, sn_ids, en_ids = table['section_id'], table['start_node_id'], table['end_node_id']
+        diameters = np.asarray(table['nominal_diameter'], dtype=np.float64).tolist()
+        lengths = np.asarray(table['length'], dtype=np.float64).tolist()
+        zetas = np.asarray(table['zeta'], dtype=np.float64).tolist()
+        pumps = np.asarray(table['pump_curve'], dtype=np.float64).reshape(-1, 3)
+        pumps = [None if math.isnan(a[0]) else tuple(a) for a in pumps.tolist()]
+        dps = np.asarray(table['dp_fixed'], dtype=np.float64).tolist()
+        flow_rates = np.asarray(table['flow_rate'], dtype=np.float64).tolist()
+        # each entry: section index, loop id, orientation in the loop and direction of the loop through the section (the
+        # sign of the flow rate and fixed pressure difference)
+        entries: List[Tuple[int, Optional[str], Optional[int], int]] = []
+        if 'loop_id' in table:
+            orientations = table.get('orientation', [None] * len(ids))
+            entries = [(k, loop_id, orientations[k], 1) for k, loop_id in enumerate(table['loop_id'])]
+        else:
+            cycles = fundamental_cycles(list(zip(sn_ids, en_ids)))
+            first_orientation: Dict[int, int] = {}
+            for i, cycle in enumerate(cycles):
+                for k, orientation in cycle:
+                    entries.append((k, f'L{i + 1}', orientation * first_orientation.setdefault(k, orientation),
+                                    orientation))
+            entries.extend((k, None, None, 1) for k in range(len(ids)) if k not in first_orientation)
+        for k, loop_id, orientation, sign in entries:
+            section = self._add_section(ids[k], sn_ids[k], en_ids[k], loop_id, orientation)
+            if 'loop_id' not in table:
+                section.direction = sign
+            if not math.isnan(dps[k]):
+                section.configure(dp_fixed=sign * dps[k])
+            else:
+                section.configure(
+                    pump_curve=pumps[k],
+                    length=lengths[k],
+                    nominal_diameter=diameters[k],
+                    zeta=zetas[k],
+                    flow_rate=sign * flow_rates[k],
+                    fluid=self.fluid,
+                    pipe_schedule=self.pipe_schedule
+                )
+
+    def compile(self) -> CompiledNetwork:
+        """
+        Get the array-backed form (*pypeflow.analysis.compiled.CompiledNetwork*) of the network that is used by the
+        network solver. It is built once after all sections have been added to the network.
+        """
+        if self._compiled is None:
+            self._compiled = CompiledNetwork.create(self.loops, self.fluid, self.pipe_schedule)
+        return self._compiled
 
     def calculate_step(self):
         """
-        Calculate new flow rates and pressure drops following the Hardy Cross method.
-
-        """
-        # calculate loop correction terms
-        for loop in self.loops.values():
-            loop.calculate_correction_term()
-
-        # apply correction terms to sections in each loop, except pseudo sections
-        for loop in self.loops.values():
-            for section in loop.sections.values():
-                if section.type != 'pseudo':
-                    # check if section belongs to two loops
-                    section_list = self.sections[section.id]
-                    if len(section_list) == 2:
-                        if section_list[0].loop_id != loop.id:
-                            second_loop_id = section_list[0].loop_id
-                        else:
-                            second_loop_id = section_list[1].loop_id
-                        corr_term = loop.corr_term - self.loops[second_loop_id].corr_term
-                    else:
-                        corr_term = loop.corr_term
-                    # apply correction term to section flow rate
-                    if section.sign == -1:
-                        section.V += corr_term
-                    else:
-                        section.V -= corr_term
-                    # if the flow rate direction is reversed after correction, reverse sign
-                    if section.V < 0.0:
-                        section.sign = -section.sign
-                        section.V = abs(section.V)
-
-    def _check_loops(self, error: float):
-        """Check if the loop pressure drops are smaller than the allowable error (i.e. deviation from zero)."""
-        if False in [abs(loop.pressure_drop) < error for loop in self.loops.values()]:
-            return False
-        return True
-
-    def solve(self, error: float = 1.0e-3, i_max: int = 30):
+        Calculate new flow rates and pressure drops following the Hardy Cross method (one iteration step of `solve`).
+        """
+        self._calculate_step('hardy_cross')
+
+    def calculate_newton_step(self):
+        """
+        Calculate new flow rates and pressure drops following the Newton-Raphson method (one iteration step of
+        `solve`).
+
+        Unlike the Hardy Cross method, which calculates the correction term of each loop on its own, the correction
+        terms of all loops are solved simultaneously from the loop Jacobian. The off-diagonal terms of the Jacobian
+        express the interaction between two loops that share a section.
+
+        """
+        self._calculate_step('newton')
+
+    def _calculate_step(self, method: str):
+        # one iteration step on the compiled network, starting from and written back to the sections
+        compiled = self.compile()
+        compiled.read_flow_rates()
+        residual, n, _ = compiled.evaluate()
+        compiled.corr_terms = compiled.correction_terms(residual, n, method)
+        compiled.apply_correction_terms(compiled.corr_terms)
+        compiled.write_back()
+        self._write_corr_terms()
+
+    def solve(self, error: float = 1.0e-3, i_max: int = 30, method: str = 'hardy_cross',
+              callback: Optional[Callable[[SolveReport], None]] = None, rel_error: float = 0.0,
+              flow_error: float = 0.0, relaxation: bool = False) -> SolveReport:
         """
         Solve the piping network for flow rates and pressure drops.
 
@@ -423,56 +610,254 @@ class Network:
 
         - `error`: (*float*) = allowable deviation from zero for the pressure drop around each loop
         - `i_max`: (*int*) = the maximum number of iterations to find a solution within the given error tolerance
+        - `method`: (*str*) = the iteration method: *'hardy_cross'* (default) corrects the loops one by one, *'newton'*
+        solves the correction terms of all loops at once (Newton-Raphson method with quadratic convergence), *'node'*
+        solves the section flow rates together with the node pressures (see
+        *pypeflow.analysis.node_solver.NodeSolver*). The work per iteration step of method *'node'* grows with the
+        number of sections instead of the number of loops squared, which makes it the method for very large networks.
+        - `callback`: (*Callable[[SolveReport], None]*) = optional function that is called after each iteration step
+        with the report of the iterations so far
+        - `rel_error`: (*float*) = allowable deviation from zero for the pressure drop around each loop relative to
+        the head around the loop, i.e. the sum of the absolute pressure differences across its sections. A loop is
+        solved if its pressure drop is smaller than `error` or than `rel_error` times its head (default 0.0: only the
+        absolute criterion `error` is used).
+        - `flow_error`: (*float*) = the iterations also stop when the largest change of a section flow rate in an
+        iteration step, relative to the largest section flow rate, is smaller than `flow_error` (default 0.0: not
+        used)
+        - `relaxation`: (*bool*) = damp the correction term of a loop that oscillates, i.e. whose correction term
+        changes sign from one step to the next without becoming much smaller (default *False*). Not used by method
+        *'node'*.
+
+        **Returns:** (*pypeflow.analysis.report.SolveReport*)<br>
+        Report with the residuals, loop correction terms, elapsed time and number of flow reversals of each iteration
+        step. The report evaluates as *True*.
+
+        The iterations start from the current flow rates of the sections. After the network has been solved, these are
+        the solution flow rates, so that solving again after a change of a section (see `set_zeta`, `set_pump_curve`
+        and `set_dp_fixed`) starts from the previous solution. Use `snapshot` and `restore` to return to another state.
 
         If no solution within the given fault tolerance is found after maximum number of iterations an *OverflowError*
-        exception is raised.
+        exception is raised. The report of the iterations is attached to the exception as attribute `report`.
 
         """
-        i = 0
-        self.calculate_step()
-        while not self._check_loops(error):
-            self.calculate_step()
-            i += 1
-            if i > i_max:
-                raise OverflowError('no solution found while maximum number of iterations has been exceeded')
-        return True
+        compiled = self.compile()
+        compiled.read_flow_rates()
+        report = compiled.solve(error, i_max, method, callback, rel_error, flow_error, relaxation)
+        compiled.write_back()
+        for section in self._unlooped_sections:
+            section.calc_pressure_drop()
+        self._write_corr_terms()
+        return report
+
+    def _write_corr_terms(self):
+        for loop, corr_term in zip(self.loops.values(), self._compiled.corr_terms):
+            loop.corr_term = corr_term
+
+    def snapshot(self) -> NetworkState:
+        """
+        Get a snapshot (*NetworkState*) of the current flow rates and loop correction terms of the network, e.g. after
+        the network has been solved.
+        """
+        compiled = self.compile()
+        compiled.read_flow_rates()
+        return NetworkState(compiled.section_ids, compiled.q, compiled.corr_terms)
+
+    def restore(self, state: NetworkState):
+        """
+        Restore the flow rates and loop correction terms of the network from a snapshot (*NetworkState*). Calling
+        `solve` afterwards starts the iterations from the restored state.
+        """
+        compiled = self.compile()
+        if state.section_ids != compiled.section_ids:
+            raise ValueError('the state does not belong to this network')
+        compiled.q[:] = state.flow_rates
+        compiled.corr_terms = state.corr_terms.copy()
+        compiled.write_back()
+        self._write_corr_terms()
+
+    def save(self, file_path: str):
+        """
+        Save the network, configured or solved, to a binary snapshot: an uncompressed NumPy .npz-file with the given
+        file path (*str*). See *pypeflow.core.snapshot*.
+        """
+        entries = [section for loop in self.loops.values() for section in loop.sections.values()]
+        entries.extend(self._unlooped_sections)
+        rank = {id(section): k for k, section in enumerate(s for lst in self.sections.values() for s in lst)}
+        out_pointers, out_ids = ragged_arrays([list(node._out) for node in self.nodes.values()])
+        in_pointers, in_ids = ragged_arrays([list(node._in) for node in self.nodes.values()])
+        arrays = {
+            'start_node_id': np.array(self.start_node_id),
+            'end_node_id': np.array(self.end_node_id),
+            'pipe_schedule': pipe_schedule_array(self.pipe_schedule),
+            'loop_ids': text_array(self.loops),
+            'corr_terms': np.array([loop.corr_term for loop in self.loops.values()], dtype=np.float64),
+            'loop_sizes': np.array([len(loop.sections) for loop in self.loops.values()], dtype=np.int64),
+            'node_ids': text_array(self.nodes),
+            'node_out_pointers': out_pointers,
+            'node_out_ids': text_array(out_ids),
+            'node_in_pointers': in_pointers,
+            'node_in_ids': text_array(in_ids),
+            'section_ids': text_array([section.id for section in entries]),
+            'section_nodes': text_array(
+                [(section.start_node.id, section.end_node.id) for section in entries]
+            ).reshape(len(entries), 2),
+            'section_types': text_array([section.type for section in entries]),
+            'section_rank': np.array([rank[id(section)] for section in entries], dtype=np.int64),
+            'section_signs': np.array(
+                [(section.sign, section.orientation, section.direction) for section in entries], dtype=np.int64
+            ).reshape(len(entries), 3),
+            'section_values': get_fields(entries, _SECTION_FIELDS),
+            'pump_coefficients': np.array([section._a for section in entries], dtype=np.float64).reshape(-1, 3)
+        }
+        arrays.update(fluid_arrays(self.fluid))
+        if self._paths:
+            arrays.update(zip(('path_parent', 'path_item', 'path_leaves'), self._path_trie.arrays()))
+        save_snapshot(file_path, 'analysis network', arrays)
+
+    @classmethod
+    def load(cls, file_path: str, mmap: bool = False) -> 'Network':
+        """
+        Load a network from a binary snapshot that was saved with `save`.
+
+        **Parameters:**
+
+        - `file_path`: (*str*) = the file path of the snapshot
+        - `mmap`: (*bool*) = memory-map the arrays of the snapshot read-only instead of reading them (default *False*)
+
+        **Returns:** (*Network*) the network in the state in which it was saved. The fluid properties are taken from the
+        snapshot, the pressure drops of the sections are not calculated again.
+
+        A *ValueError* exception is raised if the file does not hold a snapshot of an analysis network of the current
+        snapshot version.
+
+        """
+        arrays = load_snapshot(file_path, 'analysis network', mmap)
+        n = cls()
+        n.start_node_id = str(arrays['start_node_id'])
+        n.end_node_id = str(arrays['end_node_id'])
+        n.fluid = restore_fluid(arrays)
+        n.pipe_schedule = restore_pipe_schedule(arrays['pipe_schedule'])
+        n.nodes = {node_id: Node(node_id) for node_id in arrays['node_ids'].tolist()}
+        section_ids = arrays['section_ids'].tolist()
+        section_nodes = arrays['section_nodes'].tolist()
+        section_types = arrays['section_types'].tolist()
+        signs = arrays['section_signs'].tolist()
+        pump_coefficients = arrays['pump_coefficients'].tolist()
+        loop_ids = []
+        for loop_id, size in zip(arrays['loop_ids'].tolist(), arrays['loop_sizes'].tolist()):
+            loop_ids.extend([loop_id] * size)
+        loop_ids.extend([None] * (len(section_ids) - len(loop_ids)))
+        entries = []
+        for k, section_id in enumerate(section_ids):
+            sn_id, en_id = section_nodes[k]
+            section = Section(section_id, loop_ids[k], n.nodes[sn_id], n.nodes[en_id])
+            section.type = section_types[k]
+            section.sign, section.orientation = signs[k][:2]
+            # snapshots saved before the direction was kept have only two columns
+            section.direction = signs[k][2] if len(signs[k]) > 2 else section.orientation
+            section._a = tuple(pump_coefficients[k])
+            if section.type != 'pseudo':
+                section._fluid = n.fluid
+                section._pipe_schedule = n.pipe_schedule
+            entries.append(section)
+        set_fields(entries, _SECTION_FIELDS, arrays['section_values'])
+        for loop_id, corr_term in zip(arrays['loop_ids'].tolist(), arrays['corr_terms'].tolist()):
+            n.loops[loop_id] = Loop(loop_id)
+            n.loops[loop_id].corr_term = corr_term
+        for section in entries:
+            if section.loop_id is None:
+                n._unlooped_sections.append(section)
+            else:
+                n.loops[section.loop_id].sections[section.id] = section
+        for k in np.argsort(arrays['section_rank']).tolist():
+            n.sections.setdefault(section_ids[k], []).append(entries[k])
+        # the nodes refer to the first section added with a given id, in the order in which they were connected
+        out_ids = split_ragged(arrays['node_out_pointers'], arrays['node_out_ids'].tolist())
+        in_ids = split_ragged(arrays['node_in_pointers'], arrays['node_in_ids'].tolist())
+        for node, node_out_ids, node_in_ids in zip(n.nodes.values(), out_ids, in_ids):
+            node._out = {section_id: n.sections[section_id][0] for section_id in node_out_ids}
+            node._in = {section_id: n.sections[section_id][0] for section_id in node_in_ids}
+        if 'path_leaves' in arrays:
+            n._path_trie = PathTrie.from_arrays(arrays['path_parent'], arrays['path_item'], arrays['path_leaves'])
+            first_sections = [lst[0] for lst in n.sections.values()]
+            n._paths = [FlowPath(first_sections[i] for i in path) for path in n._path_trie]
+        return n
+
+    def _get_section_list(self, section_id: str) -> List[Section]:
+        try:
+            return self.sections[section_id]
+        except KeyError:
+            raise KeyError(f'Section {section_id} unknown.')
+
+    def set_zeta(self, section_id: str, zeta: float):
+        """
+        Change the sum of resistance coefficients `zeta` (*float*) of the pipe or pump section with id `section_id`
+        (*str*) in place.
+        """
+        for section in self._get_section_list(section_id):
+            if section.type == 'pseudo':
+                raise ValueError(f'section {section_id} is a pseudo section')
+            section.zeta = zeta
+        if self._compiled is not None:
+            self._compiled.set_zeta(section_id, zeta)
+
+    def set_pump_curve(self, section_id: str, pump_curve: Optional[Tuple[float, float, float]]):
+        """
+        Change the pump coefficients `pump_curve` (*Tuple[float, float, float]*) of the section with id `section_id`
+        (*str*) in place. A pipe section becomes a pump section; passing *None* removes the pump from the section.
+        """
+        section_list = self._get_section_list(section_id)
+        for section in section_list:
+            if section.type == 'pseudo':
+                raise ValueError(f'section {section_id} is a pseudo section')
+            if pump_curve is not None:
+                section.type = 'pump'
+                section._a = tuple(pump_curve)
+            else:
+                section.type = 'pipe'
+                section._a = (math.nan, math.nan, math.nan)
+        if self._compiled is not None:
+            self._compiled.set_pump_coefficients(section_id, section_list[0].pump_coefficients)
+
+    def set_dp_fixed(self, section_id: str, dp_fixed: qty.Pressure):
+        """
+        Change the fixed pressure difference `dp_fixed` (*quantities.Pressure*) of the pseudo section with id
+        `section_id` (*str*) in place. The pressure difference is signed with reference to the positive sense of the
+        loop to which the section was added first.
+        """
+        for section in self._get_section_list(section_id):
+            if section.type != 'pseudo':
+                raise ValueError(f'section {section_id} is not a pseudo section')
+            section.dp = section.orientation * dp_fixed()
+        if self._compiled is not None:
+            self._compiled.set_dp_fixed(section_id, dp_fixed())
 
     def _find_flow_paths(self):
         """Find all the possible flow paths between the start node and end node of the network."""
-        path = FlowPath()
-        self._paths.append(path)
-        try:
-            node = self.nodes[self.start_node_id]  # get start node of network
-            self._search(node, path)               # begin searching at start node of network
-        except IndexError:
-            self._paths = []
-
-    def _search(self, node: Node, path: FlowPath):
-        # search until the end node of the network has been reached
-        # if the current node has more than 1 outgoing connection, then
-        # for each outgoing connection except the first one...
-        #   create a new empty path
-        #   add the current path to the new path
-        #   add the connection to the new path
-        #   add the new path to the list of paths in the network
-        #   create a thread that begins searching from the end node of the connection
-        # add the first outgoing connection of the current node to the current path
-        # and then set current node to the end node of the first outgoing connection
-        while node.id != self.end_node_id:
-            if len(node.outgoing) > 1:
-                for section in node.outgoing[1:]:
-                    new_path = FlowPath()
-                    new_path.extend(path)
-                    new_path.append(section)
-                    self._paths.append(new_path)
-                    thread = threading.Thread(
-                        target=self._search,
-                        args=(self.nodes[section.end_node.id], new_path)
-                    )
-                    thread.start()
-                    thread.join()
-            path.append(node.outgoing[0])
-            node = self.nodes[path[-1].end_node.id]
+        section_index = {section_id: i for i, section_id in enumerate(self.sections.keys())}
+        self._path_trie = PathTrie()
+        self._paths = []
+        for path in self.iter_paths():
+            self._path_trie.insert([section_index[section.id] for section in path])
+            self._paths.append(path)
+
+    def iter_paths(self) -> Iterator[FlowPath]:
+        """
+        Generate the flow paths (*FlowPath*) between the start node and end node of the network one at a time,
+        without keeping them in memory. Use this instead of property `paths` for networks with a very large number of
+        flow paths.
+        """
+        for sections in iter_flow_paths(self.nodes, self.start_node_id, self.end_node_id):
+            yield FlowPath(sections)
+
+    @property
+    def path_trie(self) -> PathTrie:
+        """
+        Get the flow paths of the network as a *pypeflow.core.graph.PathTrie*. The sections in the trie are identified
+        by their position in the sections dictionary of the network.
+        """
+        if not self._paths: self._find_flow_paths()
+        return self._path_trie
 
     @property
     def paths(self) -> List[FlowPath]:
@@ -480,6 +865,14 @@ class Network:
         if not self._paths: self._find_flow_paths()
         return self._paths
 
+    @property
+    def unlooped_sections(self) -> List[Section]:
+        """
+        Get the sections (*List[Section]*) that do not belong to any loop, e.g. a branch leading to the end node of
+        the network.
+        """
+        return list(self._unlooped_sections)
+
     @property
     def flow_rate(self) -> qty.VolumeFlowRate:
         """
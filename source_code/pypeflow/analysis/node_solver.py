@@ -0,0 +1,138 @@
+"""
+## Node-head solver for the compiled network
+"""
+from typing import List, TYPE_CHECKING
+import numpy as np
+from nummath.linear_system import CSRMatrix, PCG
+
+if TYPE_CHECKING:
+    from pypeflow.analysis.compiled import CompiledNetwork
+
+
+def _find(parent: List[int], offset: List[float], i: int) -> int:
+    # Find the root of node i in a union-find forest. The offset of a node is its pressure minus the pressure at its
+    # parent. On return node i and the nodes on its way to the root are attached directly to the root.
+    path = []
+    while parent[i] != i:
+        path.append(i)
+        i = parent[i]
+    for j in reversed(path):
+        if parent[j] != i:
+            offset[j] += offset[parent[j]]
+            parent[j] = i
+    return i
+
+
+class NodeSolver:
+    """
+    Class that solves a compiled network for the flow rates of its sections together with the pressures at its nodes,
+    following the global gradient method of Todini and Pilati. The unknowns are the section flow rates and the node
+    pressures instead of the loop correction terms. The loops of the network are only needed to check the solution.
+
+    Nodes between which a pseudo section fixes the pressure difference are merged into one group with a single pressure
+    unknown. In each connected part of the network the pressure of one group is taken as reference (zero). In each
+    iteration step the pressures are solved from a sparse, symmetric and positive definite system with the conjugate
+    gradient method, after which the flow rates are updated section by section. The sparsity pattern of the system only
+    depends on the network and is built once; the previous pressures are the starting point of the next solve.
+
+    The flow balance at the nodes is taken from the flow rates at the start: as with the loop methods, a flow imbalance
+    at a node (i.e. an external flow rate) is kept as it is.
+    """
+
+    N_MIN: float = 1.0e-9
+    """Lower limit of the derivative of the section pressure drops, relative to the largest derivative"""
+
+    def __init__(self, compiled: 'CompiledNetwork', tol: float = 1.0e-10):
+        """
+        Create *NodeSolver* object.
+
+        **Parameters:**
+
+        - `compiled`: (*pypeflow.analysis.compiled.CompiledNetwork*) = the network to solve
+        - `tol`: (*float*) = relative tolerance of the conjugate gradient solver
+
+        A *ValueError* exception is raised if the fixed pressure differences of pseudo sections that form a closed
+        chain do not add up to zero.
+
+        """
+        self.compiled = compiled
+        self.tol = tol
+        sections, pseudo_sections, pseudo_first = compiled.node_incidence()
+        num_nodes = len(compiled.node_ids)
+        # merge the nodes between which pseudo sections fix the pressure difference
+        dp_fixed = (compiled.pseudo_dp[pseudo_first] * compiled.pseudo_orientation[pseudo_first]).tolist()
+        parent, offset = list(range(num_nodes)), [0.0] * num_nodes
+        for k, (a, b) in enumerate(pseudo_sections.tolist()):
+            ra, rb = _find(parent, offset, a), _find(parent, offset, b)
+            dp = offset[a] - offset[b] - dp_fixed[k]  # pressure at rb minus pressure at ra
+            if ra != rb:
+                parent[rb] = ra
+                offset[rb] = dp
+            elif abs(dp) > 1.0e-9 * max(abs(dp_fixed[k]), 1.0):
+                raise ValueError(
+                    f'fixed pressure differences in the closed chain of pseudo sections with section '
+                    f'{compiled.pseudo_ids[k]} do not add up to zero'
+                )
+        roots = [_find(parent, offset, i) for i in range(num_nodes)]
+        _, group = np.unique(roots, return_inverse=True)
+        self.num_groups = int(group.max()) + 1 if num_nodes else 0
+        self.node_group: np.ndarray = group.ravel()
+        self.node_offset: np.ndarray = np.array(offset)
+        self.tail: np.ndarray = self.node_group[sections[:, 0]]
+        self.head: np.ndarray = self.node_group[sections[:, 1]]
+        self.d: np.ndarray = self.node_offset[sections[:, 0]] - self.node_offset[sections[:, 1]]
+        # one reference group in each connected part of the network
+        parent, offset = list(range(self.num_groups)), [0.0] * self.num_groups
+        for a, b in zip(self.tail.tolist(), self.head.tolist()):
+            ra, rb = _find(parent, offset, a), _find(parent, offset, b)
+            if ra != rb:
+                parent[rb] = ra
+        is_reference = np.array([_find(parent, offset, g) == g for g in range(self.num_groups)], dtype=bool)
+        self.unknowns: np.ndarray = np.flatnonzero(~is_reference)
+        column = np.full(self.num_groups, -1, dtype=np.intp)
+        column[self.unknowns] = np.arange(len(self.unknowns))
+        # sparsity pattern of the pressure system: each section between two groups contributes 1 / n to both diagonal
+        # elements and -1 / n to both off-diagonal elements
+        ct, ch = column[self.tail], column[self.head]
+        idx = np.arange(len(ct))
+        rows = np.concatenate([ct, ch, ct, ch])
+        cols = np.concatenate([ct, ch, ch, ct])
+        sign = np.repeat([1.0, 1.0, -1.0, -1.0], len(ct))
+        keep = (rows >= 0) & (cols >= 0) & np.tile(ct != ch, 4)
+        self._entry_section = np.tile(idx, 4)[keep]
+        self._entry_sign = sign[keep]
+        self._matrix = CSRMatrix.from_coo(
+            rows[keep], cols[keep], np.zeros(np.count_nonzero(keep)), (len(self.unknowns), len(self.unknowns))
+        )
+        self.p_group: np.ndarray = np.zeros(self.num_groups)
+        self.demand: np.ndarray = self._group_sums(compiled.q)
+
+    def _group_sums(self, v: np.ndarray) -> np.ndarray:
+        # net outflow of each group for the section values v
+        return (np.bincount(self.tail, weights=v, minlength=self.num_groups)
+                - np.bincount(self.head, weights=v, minlength=self.num_groups))
+
+    def step(self, h: np.ndarray, n: np.ndarray):
+        """
+        Calculate new node pressures and section flow rates from the pressure drops `h` (*np.ndarray*) [Pa] of the
+        sections in the sense of their flow rates and their derivatives `n` (*np.ndarray*) with respect to flow rate
+        (see *pypeflow.analysis.compiled.CompiledNetwork.section_terms*).
+        """
+        q = self.compiled.q
+        n = np.maximum(n, self.N_MIN * np.max(n, initial=1.0))
+        inv_n = 1.0 / n
+        b = self.demand - self._group_sums(q) + self._group_sums(inv_n * (h - self.d))
+        if len(self.unknowns):
+            self._matrix.update(self._entry_sign * inv_n[self._entry_section])
+            self.p_group[self.unknowns] = PCG(
+                self._matrix, b[self.unknowns], x0=self.p_group[self.unknowns], tol=self.tol
+            ).solve()
+        q += inv_n * (self.p_group[self.tail] - self.p_group[self.head] + self.d - h)
+
+    @property
+    def node_pressures(self) -> np.ndarray:
+        """
+        Get the pressure (*np.ndarray*) [Pa] at each node of the compiled network (see `node_ids`), relative to the
+        reference node in its connected part of the network.
+        """
+        return self.p_group[self.node_group] + self.node_offset
@@ -0,0 +1,93 @@
+"""
+## Convergence report of the network solver
+"""
+from typing import List, TYPE_CHECKING
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class SolveReport:
+    """
+    Class that records the course of the iterations of the network solver. For each iteration step are recorded:
+
+    - `max_residual`: the largest absolute pressure drop around a loop [Pa] at the start of the step
+    - `rms_residual`: the root mean square of the pressure drops around the loops [Pa] at the start of the step
+    - `corr_terms`: the loop correction terms [m^3/s] applied in the step (zero with method *'node'*)
+    - `step_time`: the time spent in the step [s]
+    - `sign_reversals`: the number of sections of which the flow direction was reversed by the step
+    - `flow_change`: the largest change of a section flow rate in the step, relative to the largest section flow rate
+    - `relaxation`: the smallest under-relaxation factor applied to a loop correction term in the step
+
+    A *SolveReport* object evaluates as *True* if the network has been solved.
+    """
+
+    def __init__(self, method: str, loop_ids: List[str], error: float):
+        """
+        Create *SolveReport* object.
+
+        **Parameters:**
+
+        - `method`: (*str*) = the iteration method
+        - `loop_ids`: (*List[str]*) = the ids of the loops in the network
+        - `error`: (*float*) = allowable deviation from zero for the pressure drop around each loop [Pa]
+
+        """
+        self.method: str = method
+        self.loop_ids: List[str] = list(loop_ids)
+        self.error: float = error
+        self.converged: bool = False
+        self.max_residual: List[float] = []
+        self.rms_residual: List[float] = []
+        self.corr_terms: List[np.ndarray] = []
+        self.step_time: List[float] = []
+        self.sign_reversals: List[int] = []
+        self.flow_change: List[float] = []
+        self.relaxation: List[float] = []
+
+    def add_step(self, residual: np.ndarray, corr_terms: np.ndarray, step_time: float, sign_reversals: int,
+                 flow_change: float = float('nan'), relaxation: float = 1.0):
+        """Record an iteration step."""
+        self.max_residual.append(float(np.max(np.abs(residual))) if len(residual) else 0.0)
+        self.rms_residual.append(float(np.sqrt(np.mean(residual ** 2))) if len(residual) else 0.0)
+        self.corr_terms.append(corr_terms.copy())
+        self.step_time.append(step_time)
+        self.sign_reversals.append(sign_reversals)
+        self.flow_change.append(flow_change)
+        self.relaxation.append(relaxation)
+
+    @property
+    def iterations(self) -> int:
+        """Get the number of iteration steps (*int*)."""
+        return len(self.step_time)
+
+    @property
+    def elapsed_time(self) -> float:
+        """Get the total time (*float*) [s] spent in the iteration steps."""
+        return sum(self.step_time)
+
+    def to_dataframe(self) -> 'pd.DataFrame':
+        """Get the recorded iteration steps as a Pandas DataFrame, one row per step."""
+        import pandas as pd
+        d = {
+            'max_residual [Pa]': self.max_residual,
+            'rms_residual [Pa]': self.rms_residual,
+            'step_time [s]': self.step_time,
+            'sign_reversals': self.sign_reversals,
+            'flow_change': self.flow_change,
+            'relaxation': self.relaxation
+        }
+        corr_terms = np.array(self.corr_terms).reshape(-1, len(self.loop_ids))
+        for i, loop_id in enumerate(self.loop_ids):
+            d[f'corr_term {loop_id} [m^3/s]'] = corr_terms[:, i]
+        return pd.DataFrame(d, index=pd.RangeIndex(1, self.iterations + 1, name='iteration'))
+
+    def __bool__(self) -> bool:
+        return self.converged
+
+    def __repr__(self) -> str:
+        status = 'converged' if self.converged else 'not converged'
+        max_residual = self.max_residual[-1] if self.max_residual else float('nan')
+        return (f"SolveReport({self.method}, {status} after {self.iterations} iterations in "
+                f"{self.elapsed_time:.3g} s, last max residual {max_residual:.3g} Pa)")
@@ -0,0 +1,191 @@
+"""
+## Solving a batch of scenarios (cases) on one network topology
+"""
+from typing import Dict, List, Tuple, Any, Optional, TYPE_CHECKING
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import quantities as qty
+from pypeflow.analysis.compiled import CompiledNetwork
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from pypeflow.analysis.network import Network
+
+
+FIELDS: Tuple[str, ...] = ('flow_rate', 'zeta', 'a0', 'a1', 'a2', 'dp_fixed')
+"""The section data that can be overridden per case"""
+
+
+def _solve_cases(compiled: CompiledNetwork, targets: List[Tuple[str, int]], values: np.ndarray, error: float,
+                 i_max: int, method: str, warm_start: bool, labels: List[Any]) -> Tuple[np.ndarray, ...]:
+    # Solve the cases (rows of `values`) one after the other on a detached copy of the compiled network. The
+    # overrides of a case are applied to the base data of the network. With `warm_start`, a case starts from the
+    # solution of the previous case: the loop flow rates found for the previous case (its solution minus its initial
+    # flow rates) are added to the initial flow rates of the case, so that the start still satisfies continuity at
+    # the nodes.
+    zeta, a, pseudo_dp = compiled.zeta.copy(), compiled.a.copy(), compiled.pseudo_dp.copy()
+    q_init_base = compiled.q.copy()
+    q = np.empty((len(values), len(compiled.section_ids)))
+    dp = np.empty((len(values), len(compiled.section_ids)))
+    iterations = np.empty(len(values), dtype=np.intp)
+    q_loop: Optional[np.ndarray] = None
+    for r, row in enumerate(values):
+        compiled.zeta[:] = zeta
+        compiled.a[:] = a
+        compiled.pseudo_dp[:] = pseudo_dp
+        q_init = q_init_base.copy()
+        for (field, j), value in zip(targets, row):
+            if np.isnan(value):
+                continue  # no override in this case
+            if field == 'flow_rate':
+                q_init[j] = value
+            elif field == 'zeta':
+                compiled.zeta[j] = value
+            elif field == 'dp_fixed':
+                entries = compiled.pseudo_idx == j
+                compiled.pseudo_dp[entries] = compiled.pseudo_orientation[entries] * value
+            else:
+                compiled.a[j, int(field[1])] = value
+        compiled.update_pseudo_sections()
+        if warm_start and q_loop is not None:
+            compiled.q = q_init + q_loop
+        else:
+            compiled.q = q_init.copy()
+        try:
+            iterations[r] = compiled.solve(error, i_max, method).iterations
+        except OverflowError as e:
+            overflow = OverflowError(f'no solution found for case {labels[r]} while maximum number of iterations has '
+                                     f'been exceeded')
+            overflow.report = getattr(e, 'report', None)  # the course of the iterations of the case
+            raise overflow from e
+        q_loop = compiled.q - q_init
+        V = np.abs(compiled.q)
+        q[r] = compiled.q
+        dp[r] = np.sign(compiled.q) * (compiled.pressure_drop(V) - (
+            compiled.a[:, 0] + compiled.a[:, 1] * V + compiled.a[:, 2] * V ** 2
+        ))
+    return q, dp, iterations
+
+
+class ScenarioRunner:
+    """
+    Class that solves one network topology for a batch of cases (scenarios). Each case overrides some of the section
+    data of the network: initial flow rates, resistance coefficients, pump curves and fixed pressure differences. The
+    network itself is left untouched.
+
+    The cases are given as a table, one row per case. The columns of the table identify the section data to override
+    with a tuple *(field, section_id)* or a string *'field:section_id'*, where *field* is one of `FIELDS`:
+
+    - *'flow_rate'*: (initial guess of) the flow rate through a pipe or pump section, signed with reference to the
+    positive sense of the loop to which the section was added first
+    - *'zeta'*: sum of resistance coefficients of fittings/valves in a pipe or pump section
+    - *'a0'*, *'a1'*, *'a2'*: pump coefficients as in the network configuration file
+    - *'dp_fixed'*: fixed pressure difference across a pseudo section, signed with reference to the positive sense of
+    the loop to which the section was added first
+
+    Flow rates and pressure differences are expressed in the measuring units passed to the runner. An empty (NaN)
+    cell leaves the section data of the network as it is for that case.
+    """
+
+    def __init__(self, network: 'Network', units: Dict[str, str]):
+        """
+        Create *ScenarioRunner* object.
+
+        **Parameters:**
+
+        - `network`: (*pypeflow.analysis.network.Network*) = the configured network. The current flow rates of its
+        sections are the initial flow rates of the cases.
+        - `units`: (*Dict[str, str]*) = the measuring units of the case table and of the results (keys *'flow_rate'*,
+        *'pressure'* and *'velocity'*)
+
+        """
+        compiled = network.compile()
+        compiled.read_flow_rates()
+        self._compiled: CompiledNetwork = compiled.copy()
+        self._units: Dict[str, str] = units
+
+    def _parse_column(self, column) -> Tuple[str, int]:
+        if isinstance(column, str):
+            field, _, section_id = column.partition(':')
+        else:
+            field, section_id = column
+        if field not in FIELDS:
+            raise KeyError(f'Field {field} unknown.')
+        index = self._compiled.pseudo_index if field == 'dp_fixed' else self._compiled.section_index
+        try:
+            return field, index[section_id]
+        except KeyError:
+            raise KeyError(f'Section {section_id} unknown or not applicable to field {field}.')
+
+    def _to_base_units(self, field: str, values: np.ndarray) -> np.ndarray:
+        if field == 'flow_rate':
+            return qty.VolumeFlowRate(values, self._units['flow_rate'])()
+        if field == 'dp_fixed':
+            return qty.Pressure(values, self._units['pressure'])()
+        return values
+
+    def run(self, cases: Any, error: float = 1.0e-3, i_max: int = 30, method: str = 'hardy_cross',
+            warm_start: bool = True, max_workers: Optional[int] = None) -> 'pd.DataFrame':
+        """
+        Solve all cases.
+
+        **Parameters:**
+
+        - `cases`: (*pandas.DataFrame* or anything a DataFrame can be created from, e.g. a dictionary of sequences or
+        a NumPy structured array) = the case table. The index of the DataFrame labels the cases.
+        - `error`: (*float*) = allowable deviation from zero for the pressure drop around each loop
+        - `i_max`: (*int*) = the maximum number of iterations per case
+        - `method`: (*str*) = the iteration method: *'hardy_cross'* (default), *'newton'* or *'node'*
+        - `warm_start`: (*bool*) = start each case from the solution of the previous case (default *True*)
+        - `max_workers`: (*int*) = if set, the cases are divided in consecutive chunks that are solved in parallel by
+        this number of worker processes (*concurrent.futures.ProcessPoolExecutor*). Default is *None*: all cases are
+        solved in the current process.
+
+        **Returns:** (*pandas.DataFrame*)<br>
+        The results of all cases stacked: for each case a row per pipe or pump section with the flow rate, velocity
+        and pressure drop of the section (signed with reference to the positive sense of the loop to which the section
+        was added first) and the number of iterations needed to solve the case.
+
+        If a case cannot be solved within the maximum number of iterations, an *OverflowError* exception is raised. The
+        report of the iterations of the case (*pypeflow.analysis.report.SolveReport*) is attached to the exception as
+        attribute `report`.
+
+        """
+        import pandas as pd
+        if not isinstance(cases, pd.DataFrame):
+            cases = pd.DataFrame(cases)
+        targets = [self._parse_column(column) for column in cases.columns]
+        values = np.empty((len(cases), len(targets)))
+        for c, (field, _) in enumerate(targets):
+            values[:, c] = self._to_base_units(field, cases.iloc[:, c].to_numpy(dtype=np.float64))
+        labels = list(cases.index)
+        if max_workers is None or max_workers <= 1 or len(cases) <= 1:
+            q, dp, iterations = _solve_cases(
+                self._compiled.copy(), targets, values, error, i_max, method, warm_start, labels
+            )
+        else:
+            chunks = [chunk for chunk in np.array_split(np.arange(len(cases)), max_workers) if len(chunk)]
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(
+                        _solve_cases, self._compiled.copy(), targets, values[chunk], error, i_max, method,
+                        warm_start, [labels[r] for r in chunk]
+                    )
+                    for chunk in chunks
+                ]
+                results = [future.result() for future in futures]
+            q, dp, iterations = (np.concatenate(arrays) for arrays in zip(*results))
+        return self._get_results(labels, q, dp, iterations)
+
+    def _get_results(self, labels: List[Any], q: np.ndarray, dp: np.ndarray, iterations: np.ndarray) -> 'pd.DataFrame':
+        import pandas as pd
+        n = len(self._compiled.section_ids)
+        area = np.pi * self._compiled.di ** 2 / 4.0
+        return pd.DataFrame({
+            'case': np.repeat(np.array(labels, dtype=object), n),
+            'section_id': np.tile(np.array(self._compiled.section_ids, dtype=object), len(labels)),
+            f'flow_rate [{self._units["flow_rate"]}]': qty.VolumeFlowRate(q.ravel())(self._units['flow_rate']),
+            f'velocity [{self._units["velocity"]}]': qty.Velocity((q / area).ravel())(self._units['velocity']),
+            f'pressure_drop [{self._units["pressure"]}]': qty.Pressure(dp.ravel())(self._units['pressure']),
+            'iterations': np.repeat(iterations, n)
+        })
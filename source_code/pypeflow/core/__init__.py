@@ -5,3 +5,4 @@
 from pypeflow.core.pipe import Pipe
 from pypeflow.core.fitting import Fitting
 from pypeflow.core.valves import BalancingValve, ControlValve
+from pypeflow.core.cache_stats import CacheStats
@@ -0,0 +1,48 @@
+"""
+## Counting the hits and misses of the caches of network components
+"""
+import threading
+
+
+class CacheStats:
+    """
+    Class that counts how often a cached value could be returned (hit) and how often it had to be calculated (miss).
+    The fittings and the sections of a design network each share an instance of this class in class attribute
+    `cache_stats`, so that the effect of their caches can be profiled.
+
+    The instances are shared by all sessions (see *pypeflow.core.session.Session*). The counters are therefore only
+    changed through `hit`, `miss` and `reset`, which hold a lock, so that sessions that run concurrently in different
+    threads do not lose counts.
+    """
+    __slots__ = ('hits', 'misses', '_lock')
+
+    def __init__(self):
+        self.hits: int = 0
+        self.misses: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+    def hit(self):
+        """Count a lookup that returned a cached value."""
+        with self._lock:
+            self.hits += 1
+
+    def miss(self):
+        """Count a lookup for which the value had to be calculated."""
+        with self._lock:
+            self.misses += 1
+
+    def reset(self):
+        """Set the counters back to zero."""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Get the fraction (*float*) of the lookups that were hits (0.0 if there were no lookups yet)."""
+        with self._lock:
+            hits, lookups = self.hits, self.hits + self.misses
+        return hits / lookups if lookups else 0.0
+
+    def __repr__(self):
+        return f'CacheStats(hits={self.hits}, misses={self.misses})'
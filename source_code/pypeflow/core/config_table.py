@@ -0,0 +1,116 @@
+"""
+## Reading network configuration files (.csv-files) column by column
+"""
+from typing import Dict, List, Optional, Sequence, Union
+import csv
+import numpy as np
+
+
+class ConfigTable:
+    """
+    Class that reads a configuration file (.csv-file) in one pass and holds its contents column by column. The first
+    row of the file is a header row and is skipped, as are empty rows. Text columns are kept as lists of strings;
+    the other columns are converted to NumPy arrays of floats in one operation, an empty field becoming NaN.
+
+    The validation methods raise a *ValueError* exception that names the file and the row number (the line number in
+    the file, the header being row 1) of the first offending row, so that errors in a configuration file surface
+    before a network is built from it.
+    """
+
+    def __init__(self, file_path: str, columns: Sequence[str], text_columns: Sequence[str] = ()):
+        """
+        Read configuration file.
+
+        **Parameters:**
+
+        - `file_path`: (*str*) = the file path of the configuration file
+        - `columns`: (*Sequence[str]*) = the names given to the columns of the file in the order of the fields in each
+        row. Fields beyond the last named column are ignored.
+        - `text_columns`: (*Sequence[str]*) = the names of the columns that hold text (e.g. ids) instead of numbers
+
+        """
+        self.file_path: str = file_path
+        cells: List[List[str]] = [[] for _ in columns]
+        row_numbers: List[int] = []
+        with open(file_path, newline='') as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            for row in reader:
+                if not row or not any(field.strip() for field in row):
+                    continue
+                if len(row) < len(columns):
+                    raise ValueError(
+                        f'{file_path}, row {reader.line_num}: {len(columns)} fields expected, {len(row)} found'
+                    )
+                row_numbers.append(reader.line_num)
+                for j in range(len(columns)):
+                    cells[j].append(row[j].strip())
+        self.row_numbers: np.ndarray = np.array(row_numbers, dtype=np.int64)
+        self._columns: Dict[str, Union[List[str], np.ndarray]] = {}
+        for name, values in zip(columns, cells):
+            if name in text_columns:
+                self._columns[name] = values
+            else:
+                self._columns[name] = self._to_float(name, values)
+
+    def _to_float(self, name: str, values: List[str]) -> np.ndarray:
+        column = np.array(values, dtype=str)
+        given = column != ''
+        result = np.full(len(column), np.nan)
+        try:
+            result[given] = column[given].astype(np.float64)
+        except ValueError:
+            for k in np.flatnonzero(given):
+                try:
+                    float(column[k])
+                except ValueError:
+                    raise self.error(k, f'{name} "{column[k]}" is not a number') from None
+        return result
+
+    def __getitem__(self, name: str) -> Union[List[str], np.ndarray]:
+        """Get the column with the given name: a list of strings for a text column, else a NumPy array of floats."""
+        return self._columns[name]
+
+    def __len__(self) -> int:
+        return len(self.row_numbers)
+
+    def missing(self, name: str) -> np.ndarray:
+        """Get a boolean NumPy array that is *True* for the rows in which the field of column `name` is empty."""
+        column = self._columns[name]
+        if isinstance(column, list):
+            return np.array([value == '' for value in column], dtype=bool)
+        return np.isnan(column)
+
+    def error(self, k: int, message: str) -> ValueError:
+        """Get a *ValueError* exception with the given message about the k-th row of the table."""
+        return ValueError(f'{self.file_path}, row {self.row_numbers[k]}: {message}')
+
+    def require(self, *names: str, where: Optional[np.ndarray] = None):
+        """
+        Check that the fields of the columns `names` are not empty, either in all rows or only in the rows for which
+        the boolean NumPy array `where` is *True*.
+        """
+        for name in names:
+            missing = self.missing(name)
+            if where is not None:
+                missing &= where
+            if missing.any():
+                raise self.error(int(np.argmax(missing)), f'{name} is missing')
+
+    def require_complete(self, *names: str):
+        """Check that in each row the fields of the columns `names` are either all given or all empty."""
+        missing = np.array([self.missing(name) for name in names]).reshape(len(names), len(self))
+        incomplete = missing.any(axis=0) & ~missing.all(axis=0)
+        if incomplete.any():
+            raise self.error(int(np.argmax(incomplete)), f'{", ".join(names)} must be all given or all left empty')
+
+    def require_unique(self, *names: str):
+        """Check that no two rows have the same values in the columns `names`."""
+        first: Dict[tuple, int] = {}
+        for k, key in enumerate(zip(*(self._columns[name] for name in names))):
+            j = first.setdefault(key, k)
+            if j != k:
+                raise self.error(
+                    k, f'duplicate {", ".join(names)} {", ".join(map(str, key))} (first given in row '
+                    f'{self.row_numbers[j]})'
+                )
@@ -5,12 +5,20 @@
 from typing import Optional, Dict
 import math
 import quantities as qty
+from pypeflow.core.cache_stats import CacheStats
 from pypeflow.core.fluids import Fluid
 from pypeflow.core.resistance_coefficient import ResistanceCoefficient
 
 
 class Fitting:
-    """Class that models a fitting or valve in a pipe section."""
+    """
+    Class that models a fitting or valve in a pipe section.
+
+    The pressure drop and the resistance coefficient of the fitting or valve are calculated once and kept until the
+    flow rate, flow velocity, fluid, diameter or coefficients of the fitting or valve are set again.
+    """
+    cache_stats: CacheStats = CacheStats()
+    """Hits and misses of the cached pressure drops and resistance coefficients of all fittings"""
 
     def __init__(self):
         self._type: str = ''
@@ -24,6 +32,8 @@ class Fitting:
         self._zeta_d: float = math.nan
         self._ELR: float = math.nan
         self._dp: float = math.nan
+        self._dp_cached: bool = False
+        self._zeta_cached: Optional[float] = None
 
     @classmethod
     def create_w_flow_rate(cls, type_: str, fluid: Fluid, flow_rate: qty.VolumeFlowRate, Kv: float):
@@ -76,6 +86,11 @@ class Fitting:
         f.set_coefficients(**coefficients)
         return f
 
+    def _invalidate(self):
+        # discard the cached pressure drop and resistance coefficient
+        self._dp_cached = False
+        self._zeta_cached = None
+
     def _calc_pressure_drop(self):
         """Calculate pressure drop across fitting or valve."""
         if not math.isnan(self._Kv):
@@ -116,7 +131,12 @@ class Fitting:
         Get the pressure drop (*quantities.Pressure*) across the fitting or valve.
 
         """
-        self._calc_pressure_drop()
+        if self._dp_cached:
+            self.cache_stats.hit()
+        else:
+            self.cache_stats.miss()
+            self._calc_pressure_drop()
+            self._dp_cached = True
         return qty.Pressure(self._dp)
 
     @property
@@ -125,6 +145,14 @@ class Fitting:
         Get the resistance coefficient (*float*) of the fitting or valve.
 
         """
+        if self._zeta_cached is not None:
+            self.cache_stats.hit()
+        else:
+            self.cache_stats.miss()
+            self._zeta_cached = self._calc_zeta()
+        return self._zeta_cached
+
+    def _calc_zeta(self) -> Optional[float]:
         if not math.isnan(self._zeta_inf):
             dp = self._calc_pressure_drop_3K()
             vp = self._fluid.density('kg/m^3') * self._vel ** 2.0 / 2.0
@@ -147,6 +175,7 @@ class Fitting:
     @flow_rate.setter
     def flow_rate(self, V: qty.VolumeFlowRate):
         self._flow_rate = V()
+        self._invalidate()
 
     @property
     def velocity(self) -> qty.Velocity:
@@ -159,6 +188,7 @@ class Fitting:
     @velocity.setter
     def velocity(self, v: qty.Velocity):
         self._vel = v()
+        self._invalidate()
 
     @property
     def fluid(self) -> Fluid:
@@ -171,6 +201,7 @@ class Fitting:
     @fluid.setter
     def fluid(self, fl: Fluid):
         self._fluid = fl
+        self._invalidate()
 
     @property
     def diameter(self) -> qty.Length:
@@ -184,6 +215,7 @@ class Fitting:
     @diameter.setter
     def diameter(self, di: qty.Length):
         self._di = di()
+        self._invalidate()
 
     @property
     def type(self) -> str:
@@ -216,6 +248,7 @@ class Fitting:
         self._zeta_inf = kwargs.get('zeta_inf', math.nan)
         self._zeta_d = kwargs.get('zeta_d', math.nan)
         self._ELR = kwargs.get('ELR', math.nan)
+        self._invalidate()
 
     def get_coefficients(self) -> Dict[str, float]:
         """
@@ -3,13 +3,12 @@
 """
 import math
 import quantities as qty
-from pypeflow.core.fluids import Water
 
 
 class FlowCoefficient:
     """Class that groups class methods to convert between flow coefficient units."""
 
-    rho: float = Water(15).density('kg/m^3')  # water density @ 15 °C
+    rho: float = 999.1026214671009  # water density @ 15 °C and standard atmospheric pressure (CoolProp)
 
     @classmethod
     def Av_to_Kv(cls, Av: float) -> float:
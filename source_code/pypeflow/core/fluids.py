@@ -1,15 +1,151 @@
 """
 ## Definitions of fluids used in piping networks
 """
-from typing import Dict, Type
-from CoolProp.CoolProp import PropsSI
+from typing import Dict, Type, Tuple, Optional, Sequence, Union
+from functools import lru_cache
+import numpy as np
 import quantities as qty
+from nummath.interpolation import CubicSplineInterPol
+
+
+@lru_cache(maxsize=256)
+def _coolprop_properties(fluid: str, T_abs: float, P_abs: float) -> Tuple[float, float]:
+    # Get mass density [kg/m^3] and dynamic viscosity [Pa.s] from CoolProp. CoolProp is only imported when fluid
+    # properties are looked up for the first time.
+    from CoolProp.CoolProp import PropsSI
+    rho = PropsSI('D', 'T', T_abs, 'P', P_abs, fluid)
+    mu = PropsSI('V', 'T', T_abs, 'P', P_abs, fluid)
+    return rho, mu
+
+
+class FluidPropertyTable:
+    """
+    Class that holds the mass density and dynamic viscosity of a fluid, precomputed on a grid of temperatures and
+    gauge pressures. Properties in between grid points are found by cubic spline interpolation.
+
+    A table can be saved to disk and loaded again without CoolProp being imported. Register a table with
+    `use_property_table` to let all fluid objects of that kind take their properties from the table.
+    """
+    _P_SPLINES_MAX: int = 256
+    """Maximum number of temperatures at which the splines through the pressure grid are kept"""
+
+    def __init__(self, fluid: str, T: Sequence[float], p_gauge: Sequence[float],
+                 density: np.ndarray, dynamic_viscosity: np.ndarray):
+        """
+        Create *FluidPropertyTable* object.
+
+        **Parameters:**
+
+        - `fluid`: (*str*) = the CoolProp name of the fluid (e.g. *'Water'*)
+        - `T`: (*Sequence[float]*) = ascending grid temperatures [°C]
+        - `p_gauge`: (*Sequence[float]*) = ascending grid gauge pressures [Pa]
+        - `density`: (*np.ndarray*) = mass density [kg/m^3] with shape (len(p_gauge), len(T))
+        - `dynamic_viscosity`: (*np.ndarray*) = dynamic viscosity [Pa.s] with shape (len(p_gauge), len(T))
+
+        """
+        self.fluid: str = fluid
+        self.T: np.ndarray = np.array(T, dtype=np.float64)
+        self.p_gauge: np.ndarray = np.array(p_gauge, dtype=np.float64)
+        self.density: np.ndarray = np.array(density, dtype=np.float64).reshape(len(self.p_gauge), len(self.T))
+        self.dynamic_viscosity: np.ndarray = np.array(
+            dynamic_viscosity, dtype=np.float64
+        ).reshape(len(self.p_gauge), len(self.T))
+        # a spline through the temperature grid of each pressure row
+        self._rho_splines = [CubicSplineInterPol(self.T, row) for row in self.density]
+        self._mu_splines = [CubicSplineInterPol(self.T, row) for row in self.dynamic_viscosity]
+        # the splines through the pressure grid at the temperatures that were looked up before
+        self._p_splines: Dict[float, Tuple[CubicSplineInterPol, CubicSplineInterPol]] = {}
+
+    @classmethod
+    def create(cls, fluid: Union[str, Type['Fluid']], T: Sequence[float],
+               p_gauge: Sequence[float] = (0.0,)) -> 'FluidPropertyTable':
+        """
+        Create a property table with CoolProp.
+
+        **Parameters:**
+
+        - `fluid`: (*str* or type of *Fluid*) = the fluid, e.g. *'water'* or *Water*
+        - `T`: (*Sequence[float]*) = ascending grid temperatures [°C]
+        - `p_gauge`: (*Sequence[float]*) = ascending grid gauge pressures [Pa] (default is only 0 Pa)
+
+        **Returns:** (*FluidPropertyTable* object)
+
+        """
+        if isinstance(fluid, str):
+            fluid = _get_fluid_type(fluid)
+        T = np.array(T, dtype=np.float64)
+        p_gauge = np.array(p_gauge, dtype=np.float64)
+        density = np.empty((len(p_gauge), len(T)))
+        dynamic_viscosity = np.empty((len(p_gauge), len(T)))
+        for i, p in enumerate(p_gauge):
+            for j, t in enumerate(T):
+                density[i, j], dynamic_viscosity[i, j] = _coolprop_properties(
+                    fluid.fluid, 273.15 + t, 101325.0 + p
+                )
+        return cls(fluid.fluid, T, p_gauge, density, dynamic_viscosity)
+
+    def save(self, file_path: str):
+        """Save the property table to a NumPy .npz-file with the given file path (*str*)."""
+        np.savez(
+            file_path,
+            fluid=np.array(self.fluid),
+            T=self.T,
+            p_gauge=self.p_gauge,
+            density=self.density,
+            dynamic_viscosity=self.dynamic_viscosity
+        )
+
+    @classmethod
+    def load(cls, file_path: str) -> 'FluidPropertyTable':
+        """Load a property table from the NumPy .npz-file with the given file path (*str*)."""
+        with np.load(file_path) as data:
+            return cls(str(data['fluid']), data['T'], data['p_gauge'], data['density'], data['dynamic_viscosity'])
+
+    def properties(self, T: float, p_gauge: float = 0.0) -> Tuple[float, float]:
+        """
+        Get mass density [kg/m^3] and dynamic viscosity [Pa.s] (*Tuple[float, float]*) at temperature `T` [°C] and
+        gauge pressure `p_gauge` [Pa].
+
+        A *ValueError* exception is raised if the state lies outside the table.
+
+        """
+        if not (self.T[0] <= T <= self.T[-1] and self.p_gauge[0] <= p_gauge <= self.p_gauge[-1]):
+            raise ValueError(f'state (T = {T} °C, p_gauge = {p_gauge} Pa) outside property table of {self.fluid}')
+        if len(self.p_gauge) == 1:
+            return float(self._rho_splines[0].solve(T)), float(self._mu_splines[0].solve(T))
+        splines = self._p_splines.get(T)
+        if splines is None:
+            # the column of the table at temperature T is interpolated once and kept for the next lookups
+            if len(self._p_splines) >= self._P_SPLINES_MAX:
+                self._p_splines.clear()
+            rho = np.array([spline.solve(T) for spline in self._rho_splines])
+            mu = np.array([spline.solve(T) for spline in self._mu_splines])
+            splines = self._p_splines[T] = (
+                CubicSplineInterPol(self.p_gauge, rho), CubicSplineInterPol(self.p_gauge, mu)
+            )
+        return float(splines[0].solve(p_gauge)), float(splines[1].solve(p_gauge))
+
+
+_PROPERTY_TABLES: Dict[str, FluidPropertyTable] = {}
+
+
+def use_property_table(table: Optional[FluidPropertyTable], fluid: Optional[str] = None):
+    """
+    Let fluid objects take their properties from a precomputed property table (*FluidPropertyTable*) instead of
+    CoolProp. Pass *None* as `table` together with the CoolProp name of the `fluid` to return to CoolProp.
+    """
+    if table is not None:
+        _PROPERTY_TABLES[table.fluid] = table
+    else:
+        _PROPERTY_TABLES.pop(fluid, None)
+    create_fluid.cache_clear()
 
 
 class Fluid:
     """
     Base class that defines the available properties for fluids that are needed in piping network calculations.
-    Fluid properties are retrieved using the third-party package [CoolProp](http://www.coolprop.org/).
+    Fluid properties are retrieved using the third-party package [CoolProp](http://www.coolprop.org/), or from a
+    precomputed *FluidPropertyTable* if one is in use for the fluid.
     """
     fluid = None
 
@@ -24,11 +160,14 @@ class Fluid:
         - `p_gauge`: *float*<br>
         The gauge pressure of the fluid in Pa (optional, default is 0 Pa).
         """
-        T_abs = 273.15 + T
-        P_abs = 101325.0 + p_gauge
-        self._density = PropsSI('D', 'T', T_abs, 'P', P_abs, self.fluid)            # [kg/m^3]
-        self._dynamic_viscosity = PropsSI('V', 'T', T_abs, 'P', P_abs, self.fluid)  # [Pa.s]
-        self._kinematic_viscosity = self._dynamic_viscosity / self._density         # [m^2/s]
+        table = _PROPERTY_TABLES.get(self.fluid)
+        if table is not None:
+            self._density, self._dynamic_viscosity = table.properties(T, p_gauge)  # [kg/m^3], [Pa.s]
+        else:
+            T_abs = 273.15 + T
+            P_abs = 101325.0 + p_gauge
+            self._density, self._dynamic_viscosity = _coolprop_properties(self.fluid, T_abs, P_abs)
+        self._kinematic_viscosity = self._dynamic_viscosity / self._density  # [m^2/s]
 
     @property
     def density(self) -> qty.MassDensity:
@@ -70,3 +209,22 @@ FLUIDS: Dict[str, Type[Fluid]] = {
     'air': Air
 }
 """Dictionary that holds the available types of Fluid"""
+
+
+def _get_fluid_type(fluid: str) -> Type[Fluid]:
+    try:
+        return FLUIDS[fluid.lower()]
+    except KeyError:
+        raise KeyError(f'Fluid {fluid} unknown.')
+
+
+@lru_cache(maxsize=128)
+def create_fluid(fluid: str, T: float, p_gauge: float = 0.0) -> Fluid:
+    """
+    Get a Fluid object for the fluid with name `fluid` (*str*, see `FLUIDS`) at temperature `T` (*float*) [°C] and
+    gauge pressure `p_gauge` (*float*) [Pa].
+
+    Fluid objects are memoized: asking again for the same fluid and state returns the same object without looking up
+    the fluid properties again. The least recently used objects are discarded once 128 objects are held.
+    """
+    return _get_fluid_type(fluid)(T, p_gauge)
@@ -0,0 +1,307 @@
+"""
+## Graph algorithms shared by the network models of the design and analysis packages
+"""
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from array import array
+import numpy as np
+
+
+def iter_flow_paths(nodes: Dict[str, Any], start_node_id: str, end_node_id: str) -> Iterator[List[Any]]:
+    """
+    Generate the flow paths between the start node and the end node of a network one at a time.
+
+    **Parameters:**
+
+    - `nodes`: (*Dict[str, Node]*) = the nodes of the network. A node has a property `outgoing` that returns the
+    sections leaving the node. A section has a property `end_node` that returns a node with the `id` of its end node.
+    - `start_node_id`: (*str*) = the id of the start node of the network
+    - `end_node_id`: (*str*) = the id of the end node of the network
+
+    **Returns:** a generator of flow paths, each flow path being a list of sections.
+
+    The network is traversed depth-first with an explicit stack. At a node with more than one outgoing section the
+    path continues along the first section, while the other sections are pushed on the stack as the start of a new
+    path. Path prefixes are linked lists of (section, previous prefix) pairs, so new paths share the sections they
+    have in common with the path they branch off. A path that runs into a dead end is not a flow path and is skipped.
+
+    """
+    stack: List[Tuple[Any, Any]] = [(None, nodes[start_node_id])]
+    while stack:
+        prefix, node = stack.pop()
+        branches = []
+        while node.id != end_node_id:
+            outgoing = node.outgoing
+            if not outgoing:
+                break
+            for section in outgoing[1:]:
+                branches.append(((section, prefix), nodes[section.end_node.id]))
+            prefix = (outgoing[0], prefix)
+            node = nodes[outgoing[0].end_node.id]
+        else:
+            path = []
+            while prefix is not None:
+                section, prefix = prefix
+                path.append(section)
+            path.reverse()
+            yield path
+        # the branches nearest to the start node are searched first
+        stack.extend(reversed(branches))
+
+
+class PathTrie:
+    """
+    Class that stores flow paths compactly as sequences of section indices in a prefix tree (trie). Flow paths that
+    begin with the same sections share the trie nodes of their common part.
+    """
+
+    def __init__(self):
+        self._parent = array('l')  # parent trie node of each trie node (-1 at the root)
+        self._item = array('l')    # section index of each trie node
+        self._children: Dict[Tuple[int, int], int] = {}
+        self._leaves = array('l')  # trie node at which each path ends
+
+    def insert(self, items: Sequence[int]) -> int:
+        """
+        Add a path, given as a sequence of section indices (*Sequence[int]*), to the trie.
+
+        **Returns:** (*int*) the index of the path in the trie.
+
+        """
+        node = -1
+        for item in items:
+            child = self._children.get((node, item))
+            if child is None:
+                child = len(self._item)
+                self._parent.append(node)
+                self._item.append(item)
+                self._children[(node, item)] = child
+            node = child
+        self._leaves.append(node)
+        return len(self._leaves) - 1
+
+    def path(self, k: int) -> List[int]:
+        """Get the section indices (*List[int]*) of the k-th path in the trie."""
+        items = []
+        node = self._leaves[k]
+        while node != -1:
+            items.append(self._item[node])
+            node = self._parent[node]
+        items.reverse()
+        return items
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the trie as three NumPy arrays: the parent trie node and the section index of each trie node, and the trie
+        node at which each path ends (see `from_arrays`).
+        """
+        return (np.array(self._parent, dtype=np.int64), np.array(self._item, dtype=np.int64),
+                np.array(self._leaves, dtype=np.int64))
+
+    @classmethod
+    def from_arrays(cls, parent: np.ndarray, item: np.ndarray, leaves: np.ndarray) -> 'PathTrie':
+        """Create a *PathTrie* from the arrays returned by `arrays`."""
+        trie = cls()
+        trie._parent = array('l', np.asarray(parent).tolist())
+        trie._item = array('l', np.asarray(item).tolist())
+        trie._leaves = array('l', np.asarray(leaves).tolist())
+        trie._children = {(p, i): k for k, (p, i) in enumerate(zip(trie._parent, trie._item))}
+        return trie
+
+    @property
+    def num_nodes(self) -> int:
+        """Get the number of trie nodes (*int*), i.e. the number of stored section indices."""
+        return len(self._item)
+
+    def __len__(self) -> int:
+        return len(self._leaves)
+
+    def __iter__(self) -> Iterator[List[int]]:
+        for k in range(len(self._leaves)):
+            yield self.path(k)
+
+
+def fundamental_cycles(edges: Sequence[Tuple[str, str]], shorten: bool = True) -> List[List[Tuple[int, int]]]:
+    """
+    Find a cycle basis of a network graph made up of short cycles.
+
+    **Parameters:**
+
+    - `edges`: (*Sequence[Tuple[str, str]]*) = the edges of the graph, each edge given as a tuple of the id of its
+    start node and the id of its end node
+    - `shorten`: (*bool*) = look for cycles that are shorter than the fundamental cycles of the spanning tree (default
+    *True*)
+
+    **Returns:** (*List[List[Tuple[int, int]]]*)<br>
+    A list of cycles. Each cycle is a list of tuples (edge index, orientation) in the order in which the cycle runs
+    through the edges. The orientation is +1 if the cycle runs through the edge from its start node to its end node and
+    -1 if it runs the other way.
+
+    A spanning tree (forest) of the graph is grown breadth-first, starting in each connected part of the graph from
+    the node with the most edges. Each edge that is not part of the spanning tree (a chord) closes one cycle with the
+    tree path between its end nodes, which a breadth-first tree keeps short. Edges that do not lie on any cycle are
+    not part of the cycle basis. The number of cycles equals the number of edges minus the number of nodes plus the
+    number of connected parts of the graph.
+
+    In a meshed network a fundamental cycle can still be much longer than the meshes of the network, e.g. in a
+    ladder-shaped network. With `shorten` the chords are taken one by one, starting near the roots of the tree, and a
+    chord is closed by the shortest path between its end nodes that runs along tree edges and the chords taken before.
+    As each cycle contains a chord that is not part of any earlier cycle, the cycles remain independent. The path is
+    searched breadth-first and no further than the length of the tree path, so that the search stays local in a meshed
+    network. The search is given up in favour of the tree path once `SEARCH_LIMIT` nodes have been visited.
+
+    """
+    adjacency: Dict[str, List[int]] = {}
+    for k, (start, end) in enumerate(edges):
+        adjacency.setdefault(start, []).append(k)
+        adjacency.setdefault(end, []).append(k)
+    parent_edge: Dict[str, int] = {}  # tree edge between a node and its parent (-1 at the root)
+    depth: Dict[str, int] = {}
+    is_tree_edge = [False] * len(edges)
+    for root in sorted(adjacency, key=lambda node: len(adjacency[node]), reverse=True):
+        if root in depth:
+            continue
+        parent_edge[root] = -1
+        depth[root] = 0
+        queue = [root]
+        for node in queue:  # the queue grows while it is iterated
+            for k in adjacency[node]:
+                other = _other_end(edges[k], node)
+                if other not in depth:
+                    parent_edge[other] = k
+                    depth[other] = depth[node] + 1
+                    is_tree_edge[k] = True
+                    queue.append(other)
+
+    def step_up(node: str) -> Tuple[Tuple[int, int], str]:
+        # go from a node to its parent: get the tree edge with the orientation in which it is run through
+        k = parent_edge[node]
+        start, end = edges[k]
+        if start == node:
+            return (k, 1), end
+        return (k, -1), start
+
+    def tree_path(source: str, target: str) -> List[Tuple[int, int]]:
+        # path along the tree from source up to the lowest common ancestor and down to target
+        up, down = [], []
+        u, v = source, target
+        while depth[u] > depth[v]:
+            item, u = step_up(u)
+            up.append(item)
+        while depth[v] > depth[u]:
+            item, v = step_up(v)
+            down.append(item)
+        while u != v:
+            item, u = step_up(u)
+            up.append(item)
+            item, v = step_up(v)
+            down.append(item)
+        return up + [(j, -orientation) for j, orientation in reversed(down)]
+
+    # each chord closes a cycle: it is run through from its start node to its end node, and the cycle returns from
+    # its end node to its start node; chords near the roots of the tree are taken first
+    chords = [k for k in range(len(edges)) if not is_tree_edge[k]]
+    chords.sort(key=lambda k: depth[edges[k][0]] + depth[edges[k][1]])
+    available: Dict[str, List[int]] = {}  # edges that cycles may run through: tree edges and chords taken before
+    if shorten:
+        for k in range(len(edges)):
+            if is_tree_edge[k]:
+                start, end = edges[k]
+                available.setdefault(start, []).append(k)
+                available.setdefault(end, []).append(k)
+    cycles = []
+    for k in chords:
+        start, end = edges[k]
+        if shorten:
+            # the tree path is at most depth[start] + depth[end] edges long; only if the search is given up, the tree
+            # path is taken
+            path = _shortest_path(available, edges, end, start, depth[start] + depth[end])
+            if path is None:
+                path = tree_path(end, start)
+            available.setdefault(start, []).append(k)
+            available.setdefault(end, []).append(k)
+        else:
+            path = tree_path(end, start)
+        cycles.append([(k, 1)] + path)
+    return cycles
+
+
+def _other_end(edge: Tuple[str, str], node: str) -> str:
+    return edge[1] if edge[0] == node else edge[0]
+
+
+SEARCH_LIMIT: int = 200
+"""Maximum number of nodes visited in the search for a short cycle through a chord (see `fundamental_cycles`)"""
+
+
+def _shortest_path(adjacency: Dict[str, List[int]], edges: Sequence[Tuple[str, str]], source: str, target: str,
+                   max_length: int) -> Optional[List[Tuple[int, int]]]:
+    # Search breadth-first for the shortest path from source to target along the edges in adjacency, with at most
+    # max_length edges. The path is returned as a list of tuples (edge index, orientation), or None if there is no such
+    # path or if the search is given up after visiting SEARCH_LIMIT nodes.
+    if source == target:
+        return []
+    previous: Dict[str, int] = {source: -1}  # edge through which a node has been reached
+    level = [source]
+    for _ in range(max_length):
+        next_level = []
+        for node in level:
+            for k in adjacency.get(node, ()):
+                other = _other_end(edges[k], node)
+                if other in previous:
+                    continue
+                previous[other] = k
+                if other == target:
+                    path = []
+                    while other != source:
+                        k = previous[other]
+                        start, end = edges[k]
+                        if end == other:
+                            path.append((k, 1))
+                            other = start
+                        else:
+                            path.append((k, -1))
+                            other = end
+                    path.reverse()
+                    return path
+                next_level.append(other)
+            if len(previous) > SEARCH_LIMIT:
+                return None
+        level = next_level
+    return None
+
+
+def cycle_directions(edges: Sequence[Tuple[str, str]]) -> List[int]:
+    """
+    Get the direction in which a cycle runs through its edges.
+
+    **Parameters:**
+
+    - `edges`: (*Sequence[Tuple[str, str]]*) = the edges of the cycle in any order, each edge given as a tuple of the id
+    of its start node and the id of its end node
+
+    **Returns:** (*List[int]*)<br>
+    For each edge +1 if the cycle runs through the edge from its start node to its end node, and -1 if it runs the
+    other way. The cycle is taken to run through the first edge from its start node to its end node.
+
+    A *ValueError* exception is raised if the edges do not form a single closed cycle.
+
+    """
+    incident: Dict[str, List[int]] = {}
+    for k, (start, end) in enumerate(edges):
+        incident.setdefault(start, []).append(k)
+        incident.setdefault(end, []).append(k)
+    if any(len(ks) != 2 for ks in incident.values()):
+        raise ValueError('the edges do not form a single closed cycle')
+    directions = [0] * len(edges)
+    k, node = 0, edges[0][1]
+    directions[0] = 1
+    for _ in range(len(edges) - 1):
+        k = incident[node][0] if incident[node][1] == k else incident[node][1]
+        if directions[k] != 0:
+            break
+        start, end = edges[k]
+        directions[k] = 1 if start == node else -1
+        node = end if start == node else start
+    if 0 in directions:
+        raise ValueError('the edges do not form a single closed cycle')
+    return directions
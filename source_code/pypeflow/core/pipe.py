@@ -1,8 +1,9 @@
 """
 ## Modeling straight pipe
 """
-from typing import Optional, Type
+from typing import Optional, Type, Union
 import math
+import numpy as np
 import quantities as qty
 from pypeflow.core.fluids import Fluid
 from pypeflow.core.pipe_schedules import PipeSchedule
@@ -39,23 +40,171 @@ def _serghide(re: float, rel_pipe_rough: float) -> float:
     return (var1 - (var2 - var1) ** 2.0 / (var3 - 2.0 * var2 + var1)) ** -2.0
 
 
+def _colebrook(re: float, rel_pipe_rough: float) -> float:
+    # Colebrook-White equation for calculating the Darcy friction factor (see `colebrook_white`).
+    return float(colebrook_white(re, rel_pipe_rough))
+
+
+RE_LAMINAR = 2300.0
+"""Reynolds number below which flow is considered laminar"""
+RE_TURBULENT = 4000.0
+"""Reynolds number above which flow is considered turbulent"""
+
+
 def darcy_friction_factor(re: float, rel_pipe_rough: float, use: str = 'haaland') -> float:
     """
     Calculate the Darcy friction factor.
 
+    - Laminar flow (Re < 2300): f = 64 / Re.
+    - Turbulent flow (Re >= 4000): `use` selects the friction factor equation.
+    - Transitional flow: f is interpolated linearly between the laminar value at Re = 2300 and the turbulent value
+    at Re = 4000.
+
+    The branches are the same as those of `darcy_friction_factor_array`.
+
     **Parameters:**
 
     - `re`: (*float*) = Reynolds number
     - `rel_pipe_rough`: (*float*) = relative pipe wall roughness
-    - `use`: (*str*) = friction factor equation to be used. valid values: 'haaland'/'serghide'
+    - `use`: (*str*) = friction factor equation to be used for turbulent flow. valid values:
+    'haaland'/'serghide'/'colebrook'
 
     **Returns:** (*float*)
 
     """
     if use == 'serghide':
-        return _serghide(re, rel_pipe_rough)
+        turbulent = _serghide
+    elif use == 'colebrook':
+        turbulent = _colebrook
+    else:
+        turbulent = _haaland
+    re = max(abs(re), 1.0e-12)
+    if re >= RE_TURBULENT:
+        return turbulent(re, rel_pipe_rough)
+    if re >= RE_LAMINAR:
+        w = (re - RE_LAMINAR) / (RE_TURBULENT - RE_LAMINAR)
+        return (1.0 - w) * 64.0 / RE_LAMINAR + w * turbulent(RE_TURBULENT, rel_pipe_rough)
+    return 64.0 / re
+
+
+def reynolds_number_array(v: Union[float, np.ndarray], d_hyd: Union[float, np.ndarray],
+                          kin_visco: Union[float, np.ndarray]) -> np.ndarray:
+    """
+    Calculate Reynolds numbers for arrays of flow velocities and hydraulic diameters (the arguments are broadcast
+    against each other).
+
+    **Parameters:**
+
+    - `v`: (*float* or *np.ndarray*) = flow velocity [m/s]
+    - `d_hyd`: (*float* or *np.ndarray*) = hydraulic diameter [m]
+    - `kin_visco`: (*float* or *np.ndarray*) = kinematic viscosity [m^2/s]
+
+    **Returns:** (*np.ndarray*)
+
+    """
+    return np.abs(np.asarray(v, dtype=np.float64)) * d_hyd / kin_visco
+
+
+def _haaland_array(re: np.ndarray, rel_pipe_rough: np.ndarray) -> np.ndarray:
+    # Haaland equation evaluated element-wise.
+    var = 6.9 / re + (rel_pipe_rough / 3.71) ** 1.11
+    return (1.0 / (-1.8 * np.log10(var))) ** 2.0
+
+
+def _serghide_array(re: np.ndarray, rel_pipe_rough: np.ndarray) -> np.ndarray:
+    # Serghide equation evaluated element-wise.
+    var1 = -2.0 * np.log10(rel_pipe_rough / 3.7 + 12.0 / re)
+    var2 = -2.0 * np.log10(rel_pipe_rough / 3.7 + 2.51 * var1 / re)
+    var3 = -2.0 * np.log10(rel_pipe_rough / 3.7 + 2.51 * var2 / re)
+    return (var1 - (var2 - var1) ** 2.0 / (var3 - 2.0 * var2 + var1)) ** -2.0
+
+
+def colebrook_white(re: Union[float, np.ndarray], rel_pipe_rough: Union[float, np.ndarray],
+                    tol: float = 1.0e-10, i_max: int = 50) -> np.ndarray:
+    """
+    Solve the implicit Colebrook-White equation for the Darcy friction factor of turbulent flow.
+
+    All elements are iterated simultaneously with the Newton-Raphson method on x = 1 / sqrt(f), starting from the
+    Haaland approximation.
+
+    **Parameters:**
+
+    - `re`: (*float* or *np.ndarray*) = Reynolds number
+    - `rel_pipe_rough`: (*float* or *np.ndarray*) = relative pipe wall roughness
+    - `tol`: (*float*) = allowable relative change of x between two iterations
+    - `i_max`: (*int*) = maximum number of iterations
+
+    If no solution within the given tolerance is found after the maximum number of iterations an *OverflowError*
+    exception is raised.
+
+    **Returns:** (*np.ndarray*)
+
+    """
+    re, rel_pipe_rough = np.broadcast_arrays(
+        np.asarray(re, dtype=np.float64),
+        np.asarray(rel_pipe_rough, dtype=np.float64)
+    )
+    a = rel_pipe_rough / 3.7
+    b = 2.51 / re
+    x = 1.0 / np.sqrt(_haaland_array(re, rel_pipe_rough))
+    for _ in range(i_max):
+        arg = a + b * x
+        g = x + 2.0 * np.log10(arg)
+        dg = 1.0 + 2.0 / math.log(10.0) * b / arg
+        dx = g / dg
+        x = x - dx
+        if np.all(np.abs(dx) <= tol * np.abs(x)):
+            return 1.0 / x ** 2
+    raise OverflowError('too many iterations. no solution found')
+
+
+def darcy_friction_factor_array(re: Union[float, np.ndarray], rel_pipe_rough: Union[float, np.ndarray],
+                                use: str = 'haaland') -> Union[float, np.ndarray]:
+    """
+    Calculate the Darcy friction factor for arrays of Reynolds numbers and relative pipe wall roughnesses (the
+    arguments are broadcast against each other).
+
+    - Laminar flow (Re < 2300): f = 64 / Re.
+    - Turbulent flow (Re >= 4000): `use` selects the friction factor equation.
+    - Transitional flow: f is interpolated linearly between the laminar value at Re = 2300 and the turbulent value
+    at Re = 4000.
+
+    **Parameters:**
+
+    - `re`: (*float* or *np.ndarray*) = Reynolds number
+    - `rel_pipe_rough`: (*float* or *np.ndarray*) = relative pipe wall roughness
+    - `use`: (*str*) = friction factor equation to be used for turbulent flow. valid values:
+    'haaland'/'serghide'/'colebrook'
+
+    **Returns:** (*float* or *np.ndarray*)<br>
+    A float if both arguments are scalars, else an array with the broadcast shape of the arguments.
+
+    """
+    re, rel_pipe_rough = np.broadcast_arrays(
+        np.maximum(np.abs(np.asarray(re, dtype=np.float64)), 1.0e-12),
+        np.asarray(rel_pipe_rough, dtype=np.float64)
+    )
+    shape = re.shape
+    re, rel_pipe_rough = np.atleast_1d(re), np.atleast_1d(rel_pipe_rough)
+    if use == 'serghide':
+        turbulent = _serghide_array
+    elif use == 'colebrook':
+        turbulent = colebrook_white
     else:
-        return _haaland(re, rel_pipe_rough)
+        turbulent = _haaland_array
+    f = np.array(64.0 / re)
+    is_turbulent = re >= RE_TURBULENT
+    if np.any(is_turbulent):
+        f[is_turbulent] = turbulent(re[is_turbulent], rel_pipe_rough[is_turbulent])
+    is_transition = (re >= RE_LAMINAR) & ~is_turbulent
+    if np.any(is_transition):
+        f_lam = 64.0 / RE_LAMINAR
+        f_turb = turbulent(np.full(np.count_nonzero(is_transition), RE_TURBULENT), rel_pipe_rough[is_transition])
+        w = (re[is_transition] - RE_LAMINAR) / (RE_TURBULENT - RE_LAMINAR)
+        f[is_transition] = (1.0 - w) * f_lam + w * f_turb
+    if not shape:
+        return float(f[0])
+    return f.reshape(shape)
 
 
 class Pipe:
@@ -2,23 +2,98 @@
 ## Definitions of pipe schedules (dimensional pipe data and pipe wall roughness)
 """
 from typing import Optional, Dict, Type
-import pandas as pd
+import numpy as np
 import quantities as qty
 
 
+class _DimensionTable:
+    """
+    Descriptor that builds the dimensional data of a pipe schedule as a Pandas DataFrame when it is accessed for the
+    first time, so that Pandas is not imported together with the module.
+    """
+
+    def __get__(self, instance, owner):
+        if owner.d_nom is None:
+            return None
+        table = owner.__dict__.get('_dimension_table')
+        if table is None:
+            import pandas as pd
+            table = pd.DataFrame(
+                data={
+                    'd_ext': owner.d_ext,
+                    't': owner.t,
+                    'd_int': owner.d_int
+                },
+                index=pd.Index(data=owner.d_nom, name='DN')
+            )
+            setattr(owner, '_dimension_table', table)
+        return table
+
+
 class PipeSchedule:
-    """Base class that implements the user interface for the derived classes."""
-    dimensions = None
+    """
+    Base class that implements the user interface for the derived classes.
+
+    The dimensional data of a derived class is indexed once when the class is created: NumPy arrays hold the
+    dimensions and a dictionary maps each nominal diameter to its position in the arrays. The Pandas DataFrame
+    `dimensions` is only an optional view of the same data.
+    """
+    d_ext = None
+    t = None
+    d_int = None
+    d_nom = None
+    dimensions = _DimensionTable()
     pipe_roughness = None
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.d_nom is not None:
+            cls._index_dimensions()
+
+    @classmethod
+    def _index_dimensions(cls):
+        cls._d_ext_array = np.array(cls.d_ext, dtype=np.float64)
+        cls._t_array = np.array(cls.t, dtype=np.float64)
+        cls._d_int_array = np.array(cls.d_int, dtype=np.float64)
+        cls._d_nom_index = {round(float(DN), 3): i for i, DN in enumerate(cls.d_nom)}
+        # diameters sorted in ascending order for nearest-size searches
+        cls._d_int_order = np.argsort(cls._d_int_array, kind='stable')
+        cls._d_ext_order = np.argsort(cls._d_ext_array, kind='stable')
+
+    @classmethod
+    def _get_index(cls, DN: qty.Length) -> Optional[int]:
+        # Get the position of nominal diameter DN in the dimension arrays; nominal diameters are looked up in mm, first
+        # as given and then truncated to an integer.
+        DN = DN('mm')
+        i = cls._d_nom_index.get(round(DN, 3))
+        if i is None:
+            i = cls._d_nom_index.get(float(int(DN)))
+        return i
+
+    @classmethod
+    def _get_dimension(cls, DN: qty.Length, dimensions: np.ndarray) -> qty.Length:
+        i = cls._get_index(DN)
+        if i is None:
+            raise KeyError(f'Nominal diameter {DN("mm")} mm unknown.')
+        return qty.Length(float(dimensions[i]), 'mm')
+
+    @classmethod
+    def _get_nearest(cls, d: float, dimensions: np.ndarray, order: np.ndarray) -> qty.Length:
+        # Get the nominal diameter of the dimension nearest to d [mm]. The two neighbours of d in the sorted dimensions
+        # are compared; on a tie the size listed first in the schedule wins.
+        sorted_dimensions = dimensions[order]
+        k = int(np.searchsorted(sorted_dimensions, d))
+        candidates = [order[j] for j in (k - 1, k) if 0 <= j < len(order)]
+        i = min(candidates, key=lambda i: (abs(d - dimensions[i]), i))
+        return qty.Length(cls.d_nom[i], 'mm')
+
     @classmethod
     def outside_diameter(cls, DN: qty.Length) -> qty.Length:
         """
         Get outside diameter (*quantities.Length*) of pipe with nominal diameter DN (*quantities.Length*).
 
         """
-        DN = int(DN('mm'))
-        return qty.Length(cls.dimensions.loc[DN, 'd_ext'], 'mm')
+        return cls._get_dimension(DN, cls._d_ext_array)
 
     @classmethod
     def wall_thickness(cls, DN: qty.Length) -> qty.Length:
@@ -26,8 +101,7 @@ class PipeSchedule:
         Get wall thickness (*quantities.Length*) of pipe with nominal diameter DN (*quantities.Length*).
 
         """
-        DN = int(DN('mm'))
-        return qty.Length(cls.dimensions.loc[DN, 't'], 'mm')
+        return cls._get_dimension(DN, cls._t_array)
 
     @classmethod
     def inside_diameter(cls, DN: qty.Length) -> qty.Length:
@@ -35,9 +109,8 @@ class PipeSchedule:
         Get inside diameter (*quantities.Length*) of pipe with nominal diameter DN (*quantities.Length*).
 
         """
-        DN = int(DN('mm'))
         try:
-            return qty.Length(cls.dimensions.loc[DN, 'd_int'], 'mm')
+            return cls._get_dimension(DN, cls._d_int_array)
         except KeyError:
             return qty.Length(0.0, 'mm')
 
@@ -55,15 +128,9 @@ class PipeSchedule:
 
         """
         if d_int:
-            d_int = d_int('mm')
-            delta = [abs(d_int - d_int_40) for d_int_40 in cls.dimensions['d_int']]
-            idx = delta.index(min(delta))
-            return qty.Length(cls.dimensions.index[idx], 'mm')
+            return cls._get_nearest(d_int('mm'), cls._d_int_array, cls._d_int_order)
         elif d_ext:
-            d_ext = d_ext('mm')
-            delta = [d_ext - d_ext_40 for d_ext_40 in cls.dimensions['d_ext']]
-            idx = delta.index(min(delta))
-            return qty.Length(cls.dimensions.index[idx], 'mm')
+            return cls._get_nearest(d_ext('mm'), cls._d_ext_array, cls._d_ext_order)
 
 
 class PipeSchedule40(PipeSchedule):
@@ -75,14 +142,6 @@ class PipeSchedule40(PipeSchedule):
     t = [1.73, 2.24, 2.31, 2.77, 2.87, 3.38, 3.56, 3.68, 3.91, 5.16, 5.49, 5.74, 6.02]        # [mm]
     d_int = [6.84, 9.22, 12.5, 15.8, 21.0, 26.6, 35.1, 40.9, 52.5, 62.7, 77.9, 90.1, 102.3]   # [mm]
     d_nom = [6, 8, 10, 15, 20, 25, 32, 40, 50, 65, 80, 90, 100]                               # [mm]
-    dimensions = pd.DataFrame(
-        data={
-            'd_ext': d_ext,
-            't': t,
-            'd_int': d_int
-        },
-        index=pd.Index(data=d_nom, name='DN')
-    )
     pipe_roughness = qty.Length(0.046, 'mm')
 
 
@@ -94,14 +153,6 @@ class GebMapressSteel(PipeSchedule):
     t = [1.2, 1.2, 1.2, 1.5, 1.5, 1.5, 1.5, 1.5, 2.0, 1.5, 2.0, 2.0]                   # [mm]
     d_int = [d_ext - 2 * t for d_ext, t in zip(d_ext, t)]                              # [mm]
     d_nom = [10, 12, 15, 20, 25, 32, 40, 50, 65, 66.7, 80, 100]                        # [mm]
-    dimensions = pd.DataFrame(
-        data={
-            'd_ext': d_ext,
-            't': t,
-            'd_int': d_int
-        },
-        index=pd.Index(data=d_nom, name='DN')
-    )
     pipe_roughness = qty.Length(0.010, 'mm')
 
 
@@ -0,0 +1,67 @@
+"""
+## Sessions of the user interfaces for network analysis and design
+"""
+from typing import Any, Callable, Dict, Optional, TypeVar
+import functools
+import threading
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+
+class Session:
+    """
+    Base class of the sessions of the user interfaces. A session owns a network and the measuring units in which the
+    quantity values of its input and output are expressed, so that several networks can be worked on in the same
+    process.
+
+    The public methods of a session hold the reentrant lock of the session while they run (see `locked`). A session
+    can therefore be shared between threads: its methods run one at a time, while the methods of different sessions
+    run concurrently.
+    """
+    default_units: Dict[str, str] = {}
+    """The measuring units of a new session"""
+
+    def __init__(self, units: Optional[Dict[str, str]] = None):
+        """
+        Create a session with an empty network. The measuring units are the default units of the session class,
+        updated with the optional dictionary `units` (*Dict[str, str]*).
+        """
+        self.units: Dict[str, str] = dict(self.default_units)
+        if units is not None:
+            self.units.update(units)
+        self.lock: threading.RLock = threading.RLock()
+
+
+def locked(method: F) -> F:
+    """Decorator that lets a method of a session hold the lock of the session while it runs."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class DefaultSession(type):
+    """
+    Metaclass of the user interface classes *Analyzer* and *Designer*, whose class methods act on a default session
+    held in class attribute `session`. The class attributes `network` and `units` refer to the network and the
+    measuring units of the default session.
+    """
+
+    @property
+    def network(cls):
+        """Get/set the network of the default session."""
+        return cls.session.network
+
+    @network.setter
+    def network(cls, network):
+        cls.session.network = network
+
+    @property
+    def units(cls) -> Dict[str, str]:
+        """Get/set the measuring units (*Dict[str, str]*) of the default session."""
+        return cls.session.units
+
+    @units.setter
+    def units(cls, units: Dict[str, str]):
+        cls.session.units = units
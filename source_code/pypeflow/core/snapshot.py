@@ -0,0 +1,183 @@
+"""
+## Binary snapshots of networks
+
+A snapshot is an uncompressed NumPy .npz-file that holds the state of a configured or solved network as a set of
+arrays, together with the kind of network and the version of the snapshot format. Because the arrays are stored
+uncompressed, they can be memory-mapped read-only when the snapshot is loaded, so that processes that load the same
+snapshot share its pages instead of each reading a copy.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+import struct
+import zipfile
+import numpy as np
+from pypeflow.core.fluids import Fluid, FLUIDS
+from pypeflow.core.pipe_schedules import PipeSchedule, PIPE_SCHEDULES
+
+SNAPSHOT_VERSION: int = 1
+"""Version of the snapshot format written by `save_snapshot`"""
+
+
+def save_snapshot(file_path: str, kind: str, arrays: Dict[str, np.ndarray]):
+    """
+    Save a snapshot.
+
+    **Parameters:**
+
+    - `file_path`: (*str*) = the file path of the .npz-file
+    - `kind`: (*str*) = the kind of network, checked again when the snapshot is loaded
+    - `arrays`: (*Dict[str, np.ndarray]*) = the arrays of the snapshot; arrays of Python objects are not allowed
+
+    """
+    np.savez(file_path, __kind__=np.array(kind), __version__=np.array(SNAPSHOT_VERSION), **arrays)
+
+
+def load_snapshot(file_path: str, kind: str, mmap: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Load a snapshot.
+
+    **Parameters:**
+
+    - `file_path`: (*str*) = the file path of the .npz-file
+    - `kind`: (*str*) = the kind of network that the snapshot must hold
+    - `mmap`: (*bool*) = memory-map the arrays read-only instead of reading them into memory (default *False*)
+
+    **Returns:** (*Dict[str, np.ndarray]*) the arrays of the snapshot.
+
+    A *ValueError* exception is raised if the file holds a snapshot of another kind of network or of another version
+    of the snapshot format.
+
+    """
+    if mmap:
+        arrays = _memmap_npz(file_path)
+    else:
+        with np.load(file_path, allow_pickle=False) as data:
+            arrays = {name: data[name] for name in data.files}
+    if '__version__' not in arrays or '__kind__' not in arrays:
+        raise ValueError(f'{file_path} is not a network snapshot')
+    version = int(arrays.pop('__version__'))
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(
+            f'{file_path} holds a snapshot of version {version}, version {SNAPSHOT_VERSION} expected'
+        )
+    kind_ = str(arrays.pop('__kind__'))
+    if kind_ != kind:
+        raise ValueError(f'{file_path} holds a snapshot of {kind_}, not of {kind}')
+    return arrays
+
+
+def _memmap_npz(file_path: str) -> Dict[str, np.ndarray]:
+    # Map each .npy member of an uncompressed .npz-file (a zip archive) read-only: the array data starts after the
+    # local file header of the member in the archive and the header of the .npy-file.
+    arrays = {}
+    with zipfile.ZipFile(file_path) as archive, open(file_path, 'rb') as f:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f'{file_path} is compressed and cannot be memory-mapped')
+            f.seek(info.header_offset + 26)
+            name_length, extra_length = struct.unpack('<HH', f.read(4))
+            f.seek(info.header_offset + 30 + name_length + extra_length)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            name = info.filename[:-4] if info.filename.endswith('.npy') else info.filename
+            if dtype.hasobject:
+                raise ValueError(f'{file_path} holds Python objects and cannot be memory-mapped')
+            if int(np.prod(shape)) == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)
+            else:
+                arrays[name] = np.memmap(
+                    file_path, dtype=dtype, mode='r', offset=f.tell(), shape=shape,
+                    order='F' if fortran_order else 'C'
+                )
+    return arrays
+
+
+def get_fields(objects: Sequence[Any], names: Sequence[str]) -> np.ndarray:
+    """
+    Get the float attributes `names` (*Sequence[str]*) of the objects `objects` (*Sequence[Any]*) as a NumPy array
+    with one row per object and one column per attribute.
+    """
+    values = [[getattr(obj, name) for name in names] for obj in objects]
+    return np.array(values, dtype=np.float64).reshape(len(objects), len(names))
+
+
+def set_fields(objects: Sequence[Any], names: Sequence[str], values: np.ndarray):
+    """
+    Set the float attributes `names` (*Sequence[str]*) of the objects `objects` (*Sequence[Any]*) from a NumPy array
+    `values` with one row per object and one column per attribute (see `get_fields`).
+    """
+    for obj, row in zip(objects, np.asarray(values).tolist()):
+        for name, value in zip(names, row):
+            setattr(obj, name, value)
+
+
+def text_array(values: Sequence[str]) -> np.ndarray:
+    """Get a NumPy array of unicode strings from a sequence of strings (*Sequence[str]*)."""
+    return np.array(list(values), dtype=str)
+
+
+def ragged_arrays(lists: Sequence[Sequence[Any]]) -> Tuple[np.ndarray, List[Any]]:
+    """
+    Flatten a sequence of lists of unequal length. **Returns:** a tuple of a NumPy array with the start index of each
+    list in the flat list and the length of the flat list as last element, and the flat list itself.
+    """
+    pointers = np.zeros(len(lists) + 1, dtype=np.int64)
+    pointers[1:] = np.cumsum([len(items) for items in lists])
+    return pointers, [item for items in lists for item in items]
+
+
+def split_ragged(pointers: np.ndarray, flat: Sequence[Any]) -> List[List[Any]]:
+    """Get back the lists (*List[List[Any]]*) that were flattened with `ragged_arrays`."""
+    pointers = np.asarray(pointers).tolist()
+    flat = list(flat)
+    return [flat[pointers[i]:pointers[i + 1]] for i in range(len(pointers) - 1)]
+
+
+def fluid_arrays(fluid: Optional[Fluid]) -> Dict[str, np.ndarray]:
+    """
+    Get the arrays that hold a fluid (*pypeflow.core.fluids.Fluid*) in a snapshot: the name of the fluid and its
+    properties, so that the fluid can be restored without looking up its properties again.
+    """
+    if fluid is None:
+        return {'fluid': np.array(''), 'fluid_properties': np.full(3, np.nan)}
+    return {
+        'fluid': np.array(fluid.fluid),
+        'fluid_properties': get_fields([fluid], ('_density', '_dynamic_viscosity', '_kinematic_viscosity'))[0]
+    }
+
+
+def restore_fluid(arrays: Dict[str, np.ndarray]) -> Optional[Fluid]:
+    """Get back the fluid (*pypeflow.core.fluids.Fluid*) held in the arrays of a snapshot (see `fluid_arrays`)."""
+    name = str(arrays['fluid'])
+    if not name:
+        return None
+    for fluid_type in FLUIDS.values():
+        if fluid_type.fluid == name:
+            fluid = fluid_type.__new__(fluid_type)
+            set_fields([fluid], ('_density', '_dynamic_viscosity', '_kinematic_viscosity'),
+                       np.asarray(arrays['fluid_properties']).reshape(1, 3))
+            return fluid
+    raise KeyError(f'Fluid {name} unknown.')
+
+
+def pipe_schedule_array(pipe_schedule: Optional[Type[PipeSchedule]]) -> np.ndarray:
+    """Get the array that holds a pipe schedule in a snapshot: its key in `PIPE_SCHEDULES`."""
+    if pipe_schedule is None:
+        return np.array('')
+    for name, schedule in PIPE_SCHEDULES.items():
+        if schedule is pipe_schedule:
+            return np.array(name)
+    raise ValueError(f'pipe schedule {pipe_schedule.__name__} is not one of PIPE_SCHEDULES')
+
+
+def restore_pipe_schedule(array: np.ndarray) -> Optional[Type[PipeSchedule]]:
+    """Get back the pipe schedule held in a snapshot (see `pipe_schedule_array`)."""
+    name = str(array)
+    if not name:
+        return None
+    try:
+        return PIPE_SCHEDULES[name]
+    except KeyError:
+        raise KeyError(f'Pipe schedule {name} unknown.')
@@ -1,4 +1,4 @@
 """
 # Designing a piping network
 """
-from pypeflow.design.design import Designer
+from pypeflow.design.design import Designer, DesignerSession
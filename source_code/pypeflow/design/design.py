@@ -1,23 +1,27 @@
 """
 ## User interface for designing a piping network
 """
-from typing import Type, Dict, List, Tuple
+from typing import Type, Dict, List, Optional, Tuple, TYPE_CHECKING
 import csv
 import math
-import pandas as pd
+import numpy as np
 import quantities as qty
 from pypeflow.core.pipe_schedules import PipeSchedule, PIPE_SCHEDULES
-from pypeflow.core.fluids import Fluid, FLUIDS
+from pypeflow.core.config_table import ConfigTable
+from pypeflow.core.fluids import Fluid, create_fluid
+from pypeflow.core.session import DefaultSession, Session, locked
 from pypeflow.design.network import Network
 
+if TYPE_CHECKING:
+    import pandas as pd
 
-class Designer:
+
+class DesignerSession(Session):
     """
-    Class that encapsulates the user interface methods
+    Session for designing a piping network. The session owns its network and the measuring units of its input and
+    output, and can be shared between threads (see *pypeflow.core.session.Session*).
     """
-    network: Network = Network()
-    """Reference to the *Network* object"""
-    units: Dict[str, str] = {
+    default_units: Dict[str, str] = {
         'length': 'm',
         'diameter': 'mm',
         'flow_rate': 'L/s',
@@ -25,10 +29,19 @@ class Designer:
         'velocity': 'm/s',
         'height': 'm'
     }
-    """Dictionary that holds the measuring units in which the quantity values are expressed"""
+    """The measuring units of a new session"""
 
-    @classmethod
-    def set_units(cls, units: Dict[str, str]):
+    def __init__(self, units: Optional[Dict[str, str]] = None):
+        """
+        Create a session with an empty network. The measuring units are the default units, updated with the optional
+        dictionary `units` (*Dict[str, str]*) (see `set_units`).
+        """
+        super().__init__(units)
+        self.network: Network = Network()
+        """Reference to the *Network* object"""
+
+    @locked
+    def set_units(self, units: Dict[str, str]):
         """
         Set the measuring SI-units of the quantities that will be used as input and that will be returned as output.
 
@@ -42,10 +55,10 @@ class Designer:
         - *'velocity'* (default value = *'m/s'*)
 
         """
-        cls.units.update(units)
+        self.units.update(units)
 
-    @classmethod
-    def create_network(cls, **kwargs):
+    @locked
+    def create_network(self, **kwargs):
         """
         Create piping network.
 
@@ -65,9 +78,9 @@ class Designer:
         fluid: str = kwargs.get('fluid', 'water')
         fluid_temperature: float = kwargs.get('fluid_temperature', 10.0)
         pipe_schedule: str = kwargs.get('pipe_schedule', 'pipe_schedule_40')
-        fluid_obj = cls._create_fluid(fluid, fluid_temperature)
-        pipe_schedule_type = cls._create_pipe_schedule(pipe_schedule)
-        cls.network = Network.create(
+        fluid_obj = self._create_fluid(fluid, fluid_temperature)
+        pipe_schedule_type = self._create_pipe_schedule(pipe_schedule)
+        self.network = Network.create(
             start_node_id=start_node_id,
             end_node_id=end_node_id,
             fluid=fluid_obj,
@@ -77,12 +90,7 @@ class Designer:
     @staticmethod
     def _create_fluid(fluid: str, temperature: float) -> Fluid:
         """Create Fluid object from given fluid string and temperature."""
-        try:
-            fluid_type = FLUIDS[fluid.lower()]
-        except KeyError:
-            raise KeyError(f'Fluid {fluid} unknown.')
-        else:
-            return fluid_type(temperature)
+        return create_fluid(fluid, temperature)
 
     @staticmethod
     def _create_pipe_schedule(pipe_schedule: str) -> Type[PipeSchedule]:
@@ -94,8 +102,8 @@ class Designer:
         else:
             return pipe_schedule_type
 
-    @classmethod
-    def configure_network(cls, file_path: str):
+    @locked
+    def configure_network(self, file_path: str):
         """
         Configure network via a network configuration file (.csv-file). Parameter `file_path` (*str*) is the file path
         to this configuration file. The configuration data is organised in a table. Each row contains the configuration
@@ -117,27 +125,72 @@ class Designer:
         1. Diameter and flow rate are known -> find the pressure drop across the section<br>
         2. Friction loss and flow rate are known -> find the calculated, theoretical inside diameter
 
+        The file is read and checked in one pass before the sections are added to the network. A *ValueError*
+        exception that names the row is raised if a field holds no number where a number is expected, if the id or a
+        node id of a section is missing, if a section id is given twice or if neither the nominal diameter nor the
+        pressure drop of a section with a flow rate is given. A *ValueError* exception is also raised if the start or
+        end node of the network does not occur in the file.
+
         """
-        with open(file_path) as f:
-            reader = csv.reader(f)
-            for i, row in enumerate(reader):
-                if i == 0:
-                    continue
-                else:
-                    cls.network.add_section(
-                        id=row[0],
-                        start_node_id=row[1],
-                        start_node_height=qty.create(qty.Length, row[2], cls.units['length'], 0.0),
-                        end_node_id=row[3],
-                        end_node_height=qty.create(qty.Length, row[4], cls.units['length'], 0.0),
-                        length=qty.create(qty.Length, row[5], cls.units['length'], 0.0),
-                        nominal_diameter=qty.create(qty.Length, row[6], cls.units['diameter'], None),
-                        flow_rate=qty.create(qty.VolumeFlowRate, row[7], cls.units['flow_rate'], None),
-                        pressure_drop=qty.create(qty.Pressure, row[8], cls.units['pressure'], None),
-                    )
+        text_columns = ['id', 'start_node_id', 'end_node_id']
+        table = ConfigTable(
+            file_path,
+            columns=[
+                'id', 'start_node_id', 'start_node_height', 'end_node_id', 'end_node_height', 'length',
+                'nominal_diameter', 'flow_rate', 'pressure_drop'
+            ],
+            text_columns=text_columns
+        )
+        table.require(*text_columns)
+        table.require_unique('id')
+        real = ~table.missing('flow_rate')
+        no_size = table.missing('nominal_diameter') & table.missing('pressure_drop') & real
+        if no_size.any():
+            raise table.error(int(np.argmax(no_size)), 'nominal_diameter or pressure_drop is missing')
+        if self.network.start_node_id not in table['start_node_id']:
+            raise ValueError(f'start node {self.network.start_node_id} of the network does not occur in {file_path}')
+        if self.network.end_node_id not in table['end_node_id']:
+            raise ValueError(f'end node {self.network.end_node_id} of the network does not occur in {file_path}')
+        # all values are converted to SI base units in one go; the sections take them as quantities in the base unit
+        length_unit = self.units['length']
+        z1 = qty.Length.convert(np.nan_to_num(table['start_node_height'], nan=0.0), length_unit, 'm').tolist()
+        z2 = qty.Length.convert(np.nan_to_num(table['end_node_height'], nan=0.0), length_unit, 'm').tolist()
+        L = qty.Length.convert(np.nan_to_num(table['length'], nan=0.0), length_unit, 'm').tolist()
+        DN = qty.Length.convert(table['nominal_diameter'], self.units['diameter'], 'm').tolist()
+        V = qty.VolumeFlowRate.convert(table['flow_rate'], self.units['flow_rate'], 'm^3/s').tolist()
+        dp = qty.Pressure.convert(table['pressure_drop'], self.units['pressure'], 'Pa').tolist()
+        for k in range(len(table)):
+            self.network.add_section(
+                id=table['id'][k],
+                start_node_id=table['start_node_id'][k],
+                start_node_height=qty.Length(z1[k]),
+                end_node_id=table['end_node_id'][k],
+                end_node_height=qty.Length(z2[k]),
+                length=qty.Length(L[k]),
+                nominal_diameter=None if math.isnan(DN[k]) else qty.Length(DN[k]),
+                flow_rate=None if math.isnan(V[k]) else qty.VolumeFlowRate(V[k]),
+                pressure_drop=None if math.isnan(dp[k]) else qty.Pressure(dp[k])
+            )
+
+    @locked
+    def save_network(self, file_path: str):
+        """
+        Save the network, with its fittings, valves and pumps, to a binary snapshot file (.npz-file) with the given
+        file path (*str*) (see *pypeflow.design.network.Network.save*).
+        """
+        self.network.save(file_path)
 
-    @classmethod
-    def add_fittings(cls, file_path: str):
+    @locked
+    def load_network(self, file_path: str, mmap: bool = False):
+        """
+        Replace the network by the network saved in the binary snapshot file with the given file path (*str*). With
+        `mmap` (*bool*) the arrays of the snapshot are memory-mapped read-only (see
+        *pypeflow.design.network.Network.load*).
+        """
+        self.network = Network.load(file_path, mmap)
+
+    @locked
+    def add_fittings(self, file_path: str):
         """
         Add fittings/valves to the sections of the piping network. Fitting data is read from a .csv-file.  Parameter
         `file_path` (*str*) is the file path to this fitting data file. The fitting data is organised in a table.
@@ -164,16 +217,16 @@ class Designer:
                     continue
                 else:
                     section_id = row[0]
-                    section = cls.network.sections[section_id]
+                    section = self.network.sections[section_id]
                     if section.real:
                         section.add_fitting(
                             id=row[1],
                             type=row[2],
-                            zeta=cls._set_float(row[3]),
-                            zeta_inf=cls._set_float(row[4]),
-                            zeta_d=cls._set_float(row[5]),
-                            ELR=cls._set_float(row[6]),
-                            Kv=cls._set_float(row[7]),
+                            zeta=self._set_float(row[3]),
+                            zeta_inf=self._set_float(row[4]),
+                            zeta_d=self._set_float(row[5]),
+                            ELR=self._set_float(row[6]),
+                            Kv=self._set_float(row[7]),
                         )
 
     @staticmethod
@@ -185,8 +238,8 @@ class Designer:
         else:
             return value
 
-    @classmethod
-    def add_balancing_valves(cls, dp_100_list: List[Tuple[str, float]]) -> List[Tuple[str, float]]:
+    @locked
+    def add_balancing_valves(self, dp_100_list: List[Tuple[str, float]]) -> List[Tuple[str, float]]:
         """
         Add one or more balancing valves to the network.
 
@@ -204,13 +257,13 @@ class Designer:
         """
         Kvs_pre_list: List[Tuple[str, float]] = []
         for section_id, dp_100 in dp_100_list:
-            section = cls.network.sections[section_id]
-            Kvs_pre = section.add_balancing_valve(qty.Pressure(dp_100, cls.units['pressure']))
+            section = self.network.sections[section_id]
+            Kvs_pre = section.add_balancing_valve(qty.Pressure(dp_100, self.units['pressure']))
             Kvs_pre_list.append((section_id, Kvs_pre))
         return Kvs_pre_list
 
-    @classmethod
-    def init_balancing_valves(cls, Kvs_list: List[Tuple[str, float]]):
+    @locked
+    def init_balancing_valves(self, Kvs_list: List[Tuple[str, float]]):
         """
         Set the commercially available Kvs values of the balancing valves in the network.
 
@@ -222,11 +275,11 @@ class Designer:
 
         """
         for section_id, Kvs in Kvs_list:
-            section = cls.network.sections[section_id]
+            section = self.network.sections[section_id]
             section.init_balancing_valve(Kvs)
 
-    @classmethod
-    def add_control_valves(cls, target_authority_list: List[Tuple[str, float]]) -> List[Tuple[str, float]]:
+    @locked
+    def add_control_valves(self, target_authority_list: List[Tuple[str, float]]) -> List[Tuple[str, float]]:
         """
         Add one ore more control valves to the network.
 
@@ -245,15 +298,15 @@ class Designer:
         # get the critical path in the network before any control valve has been added to the network.
         # the static head of the critical path together with the target valve authority will be the criterion to
         # calculate the preliminary Kvs values of the control valves.
-        dp_crit_path = cls.network.critical_path.static_head_required
+        dp_crit_path = self.network.critical_path.static_head_required
         for section_id, target_authority in target_authority_list:
-            section = cls.network.sections[section_id]
+            section = self.network.sections[section_id]
             Kvs = section.add_control_valve(target_authority, dp_crit_path)
             Kvs_pre_list.append((section_id, Kvs))
         return Kvs_pre_list
 
-    @classmethod
-    def set_control_valves(cls, Kvs_list: List[Tuple[str, float]]):
+    @locked
+    def set_control_valves(self, Kvs_list: List[Tuple[str, float]]):
         """
         Set the commercially available Kvs value of the control valves in the network.
 
@@ -265,11 +318,29 @@ class Designer:
 
         """
         for section_id, Kvs in Kvs_list:
-            section = cls.network.sections[section_id]
+            section = self.network.sections[section_id]
             section.set_control_valve(Kvs)
 
-    @classmethod
-    def set_balancing_valves(cls) -> List[Tuple[str, float]]:
+    @locked
+    def set_nominal_diameters(self, dn_list: List[Tuple[str, float]]):
+        """
+        Change the nominal diameter of one or more sections in the network. Only the pressure drop of these sections
+        and the heads of the flow paths through them are calculated again.
+
+        **Parameters:**
+
+        - `dn_list`: (*List[Tuple[str, float]]*)<br>
+        List of tuples. The first element (*str*) of the tuple is the id of the section. The second element (*float*)
+        is the new nominal diameter of the section. The measuring unit is taken from the units set (see method
+        `set_units`).
+
+        """
+        for section_id, dn in dn_list:
+            section = self.network.sections[section_id]
+            section.set_nominal_diameter(qty.Length(dn, self.units['diameter']))
+
+    @locked
+    def set_balancing_valves(self) -> List[Tuple[str, float]]:
         """
         Calculate the Kvr setting of the balancing valves in the network in order to dissipate excess feed pressure.
 
@@ -279,44 +350,59 @@ class Designer:
 
         """
         Kvr_list: List[Tuple[str, float]] = []
-        bv_dict = cls.network.get_balancing_valves()
-        dp_max = cls.network.critical_path.static_head_required()
-        for section_id in bv_dict.keys():
-            section = cls.network.sections[section_id]
-            dp_path = bv_dict[section_id][1].static_head_required()
+        dp_max = self.network.critical_path.static_head_required()
+        for section in self.network.sections.values():
+            if section.balancing_valve is None:
+                continue
+            # the flow path with the largest static head required through the balancing valve; its static head
+            # includes the pressure excess dissipated by the balancing valves set before on this flow path
+            path = self.network.critical_path_through(section.id)
+            if path is None:
+                continue
+            dp_path = path.static_head_required()
             section.set_balancing_valve(qty.Pressure(dp_max - dp_path))
-            Kvr_list.append((section_id, section.balancing_valve.Kvr))
+            Kvr_list.append((section.id, section.balancing_valve.Kvr))
         return Kvr_list
 
-    @classmethod
-    def get_sections(cls) -> pd.DataFrame:
+    @locked
+    def get_sections(self) -> 'pd.DataFrame':
         """
         Returns an overview of the sections in the network organised in a Pandas DataFrame.
         """
+        import pandas as pd
         keys = [
             'section_id',
-            f'L [{cls.units["length"]}]',
-            f'Di,th [{cls.units["diameter"]}]',
-            f'Di [{cls.units["diameter"]}]',
-            f'DN [{cls.units["diameter"]}]',
-            f'V [{cls.units["flow_rate"]}]',
-            f'v [{cls.units["velocity"]}]',
-            f'dp,dyn [{cls.units["pressure"]}]',
+            f'L [{self.units["length"]}]',
+            f'Di,th [{self.units["diameter"]}]',
+            f'Di [{self.units["diameter"]}]',
+            f'DN [{self.units["diameter"]}]',
+            f'V [{self.units["flow_rate"]}]',
+            f'v [{self.units["velocity"]}]',
+            f'dp,dyn [{self.units["pressure"]}]',
         ]
         d = {k: [] for k in keys}
-        for section in cls.network.sections.values():
+        L, Di_th, Di, DN, V, v, dp = [], [], [], [], [], [], []
+        for section in self.network.sections.values():
             d[keys[0]].append(section.id)
-            d[keys[1]].append(section.pipe.length(cls.units['length'], 3))
-            d[keys[2]].append(section.pipe.cross_section.calculated_diameter(cls.units['diameter'], 3))
-            d[keys[3]].append(section.pipe.cross_section.diameter(cls.units['diameter'], 3))
-            d[keys[4]].append(section.pipe.cross_section.nominal_diameter(cls.units['diameter'], 3))
-            d[keys[5]].append(section.pipe.flow_rate(cls.units['flow_rate'], 3))
-            d[keys[6]].append(section.pipe.velocity(cls.units['velocity'], 3))
-            d[keys[7]].append(section.pressure_drop(cls.units['pressure'], 3))
+            L.append(section.pipe.length())
+            Di_th.append(section.pipe.cross_section.calculated_diameter())
+            Di.append(section.pipe.cross_section.diameter())
+            DN.append(section.pipe.cross_section.nominal_diameter())
+            V.append(section.pipe.flow_rate())
+            v.append(section.pipe.velocity())
+            dp.append(section.pressure_drop())
+        # the numerical columns are converted to the desired units as array quantities in one go
+        d[keys[1]] = qty.Length(np.array(L, dtype=np.float64))(self.units['length'], 3)
+        d[keys[2]] = qty.Length(np.array(Di_th, dtype=np.float64))(self.units['diameter'], 3)
+        d[keys[3]] = qty.Length(np.array(Di, dtype=np.float64))(self.units['diameter'], 3)
+        d[keys[4]] = qty.Length(np.array(DN, dtype=np.float64))(self.units['diameter'], 3)
+        d[keys[5]] = qty.VolumeFlowRate(np.array(V, dtype=np.float64))(self.units['flow_rate'], 3)
+        d[keys[6]] = qty.Velocity(np.array(v, dtype=np.float64))(self.units['velocity'], 3)
+        d[keys[7]] = qty.Pressure(np.array(dp, dtype=np.float64))(self.units['pressure'], 3)
         return pd.DataFrame(d)
 
-    @classmethod
-    def get_paths(cls) -> pd.DataFrame:
+    @locked
+    def get_paths(self, max_workers: Optional[int] = None) -> 'pd.DataFrame':
         """
         Returns an overview of the flow paths in the network organised in a Pandas DataFrame.
 
@@ -330,36 +416,45 @@ class Designer:
         - the pressure difference between the critical path and the path under consideration (after balancing the
         network for design flow rates, there should be zero difference)
 
+        **Parameters:**
+
+        - `max_workers`: (*int*) = if set, the heads of the flow paths are evaluated in parallel by this number of
+        worker processes (see *pypeflow.design.path_evaluator.PathEvaluator.heads*), which pays off for networks with
+        a very large number of flow paths. Default is *None*.
+
         """
+        import pandas as pd
         keys = [
             'path',
-            f'dp,vel [{cls.units["pressure"]}]',
-            f'dp,elev [{cls.units["pressure"]}]',
-            f'dp,dyn [{cls.units["pressure"]}]',
-            f'dp,stat req. [{cls.units["pressure"]}]',
-            f'dp,dif [{cls.units["pressure"]}]'
+            f'dp,vel [{self.units["pressure"]}]',
+            f'dp,elev [{self.units["pressure"]}]',
+            f'dp,dyn [{self.units["pressure"]}]',
+            f'dp,stat req. [{self.units["pressure"]}]',
+            f'dp,dif [{self.units["pressure"]}]'
         ]
         d = {k: [] for k in keys}
-        static_head_max = cls.network.critical_path.static_head_required
-        for path in cls.network.paths:
-            d[keys[0]].append(repr(path))
-            d[keys[1]].append(path.velocity_head(cls.units['pressure'], 3))
-            d[keys[2]].append(path.elevation_head(cls.units['pressure'], 3))
-            d[keys[3]].append(path.dynamic_head(cls.units['pressure'], 3))
-            d[keys[4]].append(path.static_head_required(cls.units['pressure'], 3))
-            dp_dif = qty.Pressure(static_head_max() - path.static_head_required())
-            d[keys[5]].append(dp_dif(cls.units['pressure'], 3))
+        static_head_max = self.network.critical_path.static_head_required()
+        # the heads of the flow paths are kept by the network and only evaluated again for changed flow paths
+        heads = np.zeros((len(self.network.paths), 5))
+        heads[:, :3] = self.network.path_heads(max_workers)
+        heads[:, 3] = heads[:, 0] + heads[:, 1] + heads[:, 2]
+        heads[:, 4] = static_head_max - heads[:, 3]
+        d[keys[0]] = [repr(path) for path in self.network.paths]
+        heads = qty.Pressure(heads)(self.units['pressure'], 3)
+        for i in range(5):
+            d[keys[i + 1]] = heads[:, i]
         return pd.DataFrame(d).sort_values(by=keys[4])
 
-    @classmethod
-    def get_fittings(cls) -> pd.DataFrame:
+    @locked
+    def get_fittings(self) -> 'pd.DataFrame':
         """
         Returns an overview of the fittings in the network organised as a Pandas DataFrame.
         """
+        import pandas as pd
         keys = [
             'section_id',
             'fitting_id',
-            f'dp [{cls.units["pressure"]}]',
+            f'dp [{self.units["pressure"]}]',
             'zeta',
             'zeta_inf',
             'zeta_d',
@@ -367,12 +462,12 @@ class Designer:
             'Kv'
         ]
         d = {k: [] for k in keys}
-        for section in cls.network.sections.values():
+        for section in self.network.sections.values():
             if section.fittings:
                 for id_, fitting in section.fittings.items():
                     d[keys[0]].append(section.id)
                     d[keys[1]].append(id_)
-                    d[keys[2]].append(fitting.pressure_drop(cls.units['pressure'], 3))
+                    d[keys[2]].append(fitting.pressure_drop(self.units['pressure'], 3))
                     c = fitting.get_coefficients()
                     d[keys[3]].append(c['zeta'])
                     d[keys[4]].append(c['zeta_inf'])
@@ -381,45 +476,143 @@ class Designer:
                     d[keys[7]].append(c['Kv'])
         return pd.DataFrame(d)
 
-    @classmethod
-    def get_control_valves(cls) -> pd.DataFrame:
+    @locked
+    def get_control_valves(self) -> 'pd.DataFrame':
         """
         Get an overview of the control valves in the network organised as a Pandas DataFrame.
         """
+        import pandas as pd
         keys = [
             'section_id',
-            f'dp [{cls.units["pressure"]}]',
+            f'dp [{self.units["pressure"]}]',
             'Kvs',
             'auth'
         ]
         d = {k: [] for k in keys}
-        cv_dict = cls.network.get_control_valves()
-        dp_crit_path = cls.network.critical_path.static_head_required
+        cv_dict = self.network.get_control_valves()
+        dp_crit_path = self.network.critical_path.static_head_required
         for section_id, tup in cv_dict.items():
             control_valve = tup[0]
             d[keys[0]].append(section_id)
-            d[keys[1]].append(control_valve.pressure_drop(cls.units['pressure'], 3))
+            d[keys[1]].append(control_valve.pressure_drop(self.units['pressure'], 3))
             d[keys[2]].append(control_valve.Kvs)
             d[keys[3]].append(control_valve.authority(dp_crit_path))
         return pd.DataFrame(d)
 
-    @classmethod
-    def get_balancing_valves(cls) -> pd.DataFrame:
+    @locked
+    def get_balancing_valves(self) -> 'pd.DataFrame':
         """
         Returns an overview of the balancing valves in the network organised as a Pandas DataFrame.
         """
+        import pandas as pd
         keys = [
             'section_id',
-            f'dp [{cls.units["pressure"]}]',
+            f'dp [{self.units["pressure"]}]',
             'Kvr',
             'Kvs'
         ]
         d = {k: [] for k in keys}
-        bv_dict = cls.network.get_balancing_valves()
+        bv_dict = self.network.get_balancing_valves()
         for section_id, tup in bv_dict.items():
             balancing_valve = tup[0]
             d[keys[0]].append(section_id)
-            d[keys[1]].append(balancing_valve.pressure_drop(cls.units['pressure'], 3))
+            d[keys[1]].append(balancing_valve.pressure_drop(self.units['pressure'], 3))
             d[keys[2]].append(round(balancing_valve.Kvr, 3))
             d[keys[3]].append(balancing_valve.Kvs)
         return pd.DataFrame(d)
+
+
+class Designer(metaclass=DefaultSession):
+    """
+    Class that encapsulates the user interface methods. The class methods act on a default *DesignerSession* held in
+    class attribute `session`; class attributes `network` and `units` refer to the network and the measuring units of
+    this session. To design several networks at once, e.g. in a thread pool, create a *DesignerSession* for each
+    network instead.
+    """
+    session: DesignerSession = DesignerSession()
+    """The default session"""
+
+    @classmethod
+    def set_units(cls, units: Dict[str, str]):
+        """See *DesignerSession.set_units*."""
+        cls.session.set_units(units)
+
+    @classmethod
+    def create_network(cls, **kwargs):
+        """See *DesignerSession.create_network*."""
+        cls.session.create_network(**kwargs)
+
+    @classmethod
+    def configure_network(cls, file_path: str):
+        """See *DesignerSession.configure_network*."""
+        cls.session.configure_network(file_path)
+
+    @classmethod
+    def save_network(cls, file_path: str):
+        """See *DesignerSession.save_network*."""
+        cls.session.save_network(file_path)
+
+    @classmethod
+    def load_network(cls, file_path: str, mmap: bool = False):
+        """See *DesignerSession.load_network*."""
+        cls.session.load_network(file_path, mmap)
+
+    @classmethod
+    def add_fittings(cls, file_path: str):
+        """See *DesignerSession.add_fittings*."""
+        cls.session.add_fittings(file_path)
+
+    @classmethod
+    def add_balancing_valves(cls, dp_100_list: List[Tuple[str, float]]) -> List[Tuple[str, float]]:
+        """See *DesignerSession.add_balancing_valves*."""
+        return cls.session.add_balancing_valves(dp_100_list)
+
+    @classmethod
+    def init_balancing_valves(cls, Kvs_list: List[Tuple[str, float]]):
+        """See *DesignerSession.init_balancing_valves*."""
+        cls.session.init_balancing_valves(Kvs_list)
+
+    @classmethod
+    def add_control_valves(cls, target_authority_list: List[Tuple[str, float]]) -> List[Tuple[str, float]]:
+        """See *DesignerSession.add_control_valves*."""
+        return cls.session.add_control_valves(target_authority_list)
+
+    @classmethod
+    def set_control_valves(cls, Kvs_list: List[Tuple[str, float]]):
+        """See *DesignerSession.set_control_valves*."""
+        cls.session.set_control_valves(Kvs_list)
+
+    @classmethod
+    def set_nominal_diameters(cls, dn_list: List[Tuple[str, float]]):
+        """See *DesignerSession.set_nominal_diameters*."""
+        cls.session.set_nominal_diameters(dn_list)
+
+    @classmethod
+    def set_balancing_valves(cls) -> List[Tuple[str, float]]:
+        """See *DesignerSession.set_balancing_valves*."""
+        return cls.session.set_balancing_valves()
+
+    @classmethod
+    def get_sections(cls) -> 'pd.DataFrame':
+        """See *DesignerSession.get_sections*."""
+        return cls.session.get_sections()
+
+    @classmethod
+    def get_paths(cls, max_workers: Optional[int] = None) -> 'pd.DataFrame':
+        """See *DesignerSession.get_paths*."""
+        return cls.session.get_paths(max_workers)
+
+    @classmethod
+    def get_fittings(cls) -> 'pd.DataFrame':
+        """See *DesignerSession.get_fittings*."""
+        return cls.session.get_fittings()
+
+    @classmethod
+    def get_control_valves(cls) -> 'pd.DataFrame':
+        """See *DesignerSession.get_control_valves*."""
+        return cls.session.get_control_valves()
+
+    @classmethod
+    def get_balancing_valves(cls) -> 'pd.DataFrame':
+        """See *DesignerSession.get_balancing_valves*."""
+        return cls.session.get_balancing_valves()
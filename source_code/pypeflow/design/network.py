@@ -1,19 +1,53 @@
 """
 ## Modeling the components for piping network design
 """
-from typing import List, Dict, Optional, Tuple, Type
-import threading
+from typing import Callable, List, Dict, Optional, Set, Tuple, Type, Iterator
 import math
+import numpy as np
 import quantities as qty
 from pypeflow.core import Pipe, Fitting, BalancingValve, ControlValve
+from pypeflow.core.cache_stats import CacheStats
 from pypeflow.core.pipe_schedules import PipeSchedule
 from pypeflow.core.fluids import Fluid
 from pypeflow.core.pump import Pump
 from pypeflow.core.resistance_coefficient import ResistanceCoefficient
+from pypeflow.core.graph import iter_flow_paths, PathTrie
+from pypeflow.core.snapshot import (
+    save_snapshot, load_snapshot, get_fields, set_fields, text_array, ragged_arrays, split_ragged, fluid_arrays,
+    restore_fluid, pipe_schedule_array, restore_pipe_schedule
+)
+from pypeflow.design.path_evaluator import PathEvaluator
+
+# float attributes of the pipes, fittings, valves and pumps that are saved in a snapshot of the network (see
+# Network.save)
+_PIPE_FIELDS: Tuple[str, ...] = ('_length', '_rough', '_flow_rate', '_dp_fric', '_dp_minor')
+_CROSS_SECTION_FIELDS: Tuple[str, ...] = ('_di', '_dn', '_di_th')
+_FITTING_FIELDS: Tuple[str, ...] = (
+    '_flow_rate', '_vel', '_di', '_Kv', '_zeta', '_zeta_inf', '_zeta_d', '_ELR', '_dp'
+)
+_BALANCING_VALVE_FIELDS: Tuple[str, ...] = ('_dp', '_flow_rate', '_Kvs', '_Kvr', '_dp_excess')
+_CONTROL_VALVE_FIELDS: Tuple[str, ...] = ('_flow_rate', '_dp', '_Kvs', '_target_authority', '_dp_crit_path')
+
+
+def _new_objects(cls: type, values: np.ndarray, fields: Tuple[str, ...], fluid: Optional[Fluid] = None) -> list:
+    # create objects of class cls with their float attributes taken from a snapshot
+    objects = [cls() for _ in range(len(values))]
+    set_fields(objects, fields, values)
+    if fluid is not None:
+        for obj in objects:
+            obj._fluid = fluid
+    return objects
 
 
 class Section:
-    """Class that models a pipe section in a network."""
+    """
+    Class that models a pipe section in a network.
+
+    The pressure drop and the global resistance coefficient of the section are calculated once and kept until the
+    section is changed (see `invalidate`).
+    """
+    cache_stats: CacheStats = CacheStats()
+    """Hits and misses of the cached pressure drops and resistance coefficients of all sections"""
 
     def __init__(self):
         self._id: str = ''
@@ -25,6 +59,9 @@ class Section:
         self._control_valve: Optional[ControlValve] = None
         self._pump: Optional[Pump] = None
         self._real: bool = False
+        self._dp: Optional[float] = None  # cached pressure drop, None if it must be calculated again
+        self._zeta: Optional[float] = None  # cached global resistance coefficient
+        self._observers: List[Callable[['Section'], None]] = []
 
     @classmethod
     def create_pseudo(cls, **kwargs):
@@ -131,6 +168,7 @@ class Section:
                                           zeta=zeta, zeta_inf=zeta_inf, zeta_d=zeta_d, ELR=ELR)
         v = self._fittings.setdefault(id_, f)
         if v is not f: raise ValueError(f'a fitting with {id_} was already added to the section')
+        self.invalidate()
 
     def add_balancing_valve(self, dp_100: qty.Pressure) -> float:
         """
@@ -149,6 +187,7 @@ class Section:
             self._pipe.flow_rate,
             dp_100
         )
+        self.invalidate()
         return self._balancing_valve.Kvs
 
     def init_balancing_valve(self, Kvs: float):
@@ -156,6 +195,7 @@ class Section:
         Set commercial available Kvs value (*float*) for the balancing valve.
         """
         self._balancing_valve.Kvs = Kvs
+        self.invalidate()
 
     def set_balancing_valve(self, dp_excess: qty.Pressure) -> float:
         """
@@ -166,6 +206,7 @@ class Section:
 
         """
         self._balancing_valve.set_pressure_excess(dp_excess)
+        self.invalidate()
         return self._balancing_valve.Kvr
 
     def add_control_valve(self, target_authority: float, dp_crit_path: qty.Pressure) -> float:
@@ -185,11 +226,13 @@ class Section:
             target_authority,
             dp_crit_path
         )
+        self.invalidate()
         return self._control_valve.Kvs
 
     def set_control_valve(self, Kvs: float):
         """Set commercial available Kvs value (*float*) for the control valve."""
         self._control_valve.Kvs = Kvs
+        self.invalidate()
 
     def add_pump(self, pump_coefficients: Tuple[float, float, float]):
         """
@@ -200,6 +243,38 @@ class Section:
 
         """
         self._pump = Pump.create(*pump_coefficients)
+        self.invalidate()
+
+    def set_nominal_diameter(self, dn: qty.Length):
+        """
+        Change the nominal diameter (*quantities.Length*) of the section pipe. The friction loss of the pipe and the
+        pressure drop across the fittings that depend on the flow velocity are calculated again.
+        """
+        self._pipe.cross_section.nominal_diameter = dn
+        self._pipe.calculate_pressure_loss()
+        for fitting in self._fittings.values():
+            if not math.isnan(fitting.velocity()):
+                fitting.velocity = self._pipe.velocity
+                fitting.diameter = self._pipe.cross_section.diameter
+        self.invalidate()
+
+    def add_observer(self, callback: Callable[['Section'], None]):
+        """
+        Register a function that is called with the section as argument each time the pressure drop of the section may
+        have changed (see `invalidate`).
+        """
+        self._observers.append(callback)
+
+    def invalidate(self):
+        """
+        Discard the cached pressure drop and resistance coefficient of the section and notify the observers of the
+        section. The methods of the section that change its pipe, fittings, valves or pump call this method; call it
+        after changing these objects directly.
+        """
+        self._dp = None
+        self._zeta = None
+        for callback in self._observers:
+            callback(self)
 
     @property
     def id(self) -> str:
@@ -243,15 +318,20 @@ class Section:
     @property
     def pressure_drop(self) -> qty.Pressure:
         """Get the pressure drop (*quantities.Pressure*) across the section."""
-        dp = self._pipe.friction_loss()
-        dp += sum([fitting.pressure_drop() for fitting in self._fittings.values()])
-        if self._balancing_valve is not None:
-            dp += self._balancing_valve.pressure_drop()
-        if self._pump is not None:
-            dp -= self._pump.added_head(self._pipe.flow_rate)()
-        if self._control_valve is not None:
-            dp += self._control_valve.pressure_drop()
-        return qty.Pressure(dp)
+        if self._dp is not None:
+            self.cache_stats.hit()
+        else:
+            self.cache_stats.miss()
+            dp = self._pipe.friction_loss()
+            dp += sum([fitting.pressure_drop() for fitting in self._fittings.values()])
+            if self._balancing_valve is not None:
+                dp += self._balancing_valve.pressure_drop()
+            if self._pump is not None:
+                dp -= self._pump.added_head(self._pipe.flow_rate)()
+            if self._control_valve is not None:
+                dp += self._control_valve.pressure_drop()
+            self._dp = dp
+        return qty.Pressure(self._dp)
 
     @property
     def real(self) -> bool:
@@ -268,6 +348,10 @@ class Section:
     @property
     def zeta(self) -> float:
         """Get the global resistance coefficient of all fittings, balancing valve and control valve in the section."""
+        if self._zeta is not None:
+            self.cache_stats.hit()
+            return self._zeta
+        self.cache_stats.miss()
         zeta = 0.0
         for fitting in self._fittings.values():
             zeta += fitting.zeta
@@ -289,6 +373,7 @@ class Section:
                 self._pipe.cross_section.diameter
             )
             zeta += zeta_ctrl
+        self._zeta = zeta
         return zeta
 
     @property
@@ -462,8 +547,163 @@ class FlowPath(List[Section]):
         return qty.Pressure(dp_vel + dp_elev + dp_dyn)
 
 
+class _StaticHeads:
+    """
+    Dynamic program over the nodes of a design network that finds the largest static head required of the flow paths
+    in the network, without enumerating the flow paths.
+
+    The static head required of a flow path is the difference in velocity pressure and in elevation between the end
+    of its last real section and the start of its first real section, plus the pressure drops of its real sections.
+    Passing the nodes in reverse topological order, the largest remainder of this sum from each node to the end node
+    is found, once for the case that no real section has been passed yet and once for the case that one has.
+    Passing the nodes in topological order, the largest sum up to each node is found. Together they give the largest
+    static head required of the flow paths through each section. The choices made are kept to reconstruct the
+    critical path and the critical path through each section.
+    """
+
+    def __init__(self, nodes: Dict[str, 'Node'], order: List[str], start_node_id: str, end_node_id: str,
+                 previous: Optional['_StaticHeads'] = None, changed: Set[str] = frozenset()):
+        # the terms of the sections that did not change are taken from a previous run, if given
+        self._nodes = nodes
+        self._start_node_id = start_node_id
+        self._end_node_id = end_node_id
+        no_path = -math.inf
+        # pressure drop, head term of a first real section and tail term of a last real section
+        terms: Dict[str, Tuple[float, float, float]] = {}
+        self.terms: Dict[str, Tuple[float, float, float]] = terms  # kept for the next run
+        for node_id in order:
+            for section in nodes[node_id].outgoing:
+                if previous is not None and section.id in previous.terms and section.id not in changed:
+                    terms[section.id] = previous.terms[section.id]
+                elif section.real:
+                    vp = section.pipe.velocity_pressure()
+                    terms[section.id] = (
+                        section.pressure_drop(),
+                        -vp - qty.Pressure(section.start_node.height(), 'm')(),
+                        vp + qty.Pressure(section.end_node.height(), 'm')()
+                    )
+        # backward pass: `pseudo_end` tells if the end node can be reached along pseudo sections only, `after` is the
+        # largest remainder once a real section has been passed and `before` the largest remainder if not
+        self._pseudo_end: Dict[str, Section] = {}
+        self._after: Dict[str, Tuple[Section, bool]] = {}
+        self._before: Dict[str, Tuple[Section, bool]] = {}
+        self._last: Dict[str, bool] = {}  # real sections after which the end node is reached along pseudo sections
+        pseudo_end: Dict[str, bool] = {}
+        after: Dict[str, float] = {}
+        before: Dict[str, float] = {}
+        rest: Dict[str, float] = {}  # largest remainder after each real section, including its own tail term
+        for node_id in reversed(order):
+            pseudo_end[node_id] = node_id == end_node_id
+            after[node_id] = before[node_id] = no_path
+            if node_id == end_node_id:
+                continue
+            for section in nodes[node_id].outgoing:
+                v = section.end_node.id
+                if not section.real:
+                    if pseudo_end[v] and not pseudo_end[node_id]:
+                        pseudo_end[node_id] = True
+                        self._pseudo_end[node_id] = section
+                    if after[v] > after[node_id]:
+                        after[node_id] = after[v]
+                        self._after[node_id] = (section, False)
+                    if before[v] > before[node_id]:
+                        before[node_id] = before[v]
+                        self._before[node_id] = (section, False)
+                else:
+                    dp, head, tail = terms[section.id]
+                    rest[section.id], last = after[v], False
+                    if pseudo_end[v] and tail > rest[section.id]:
+                        rest[section.id], last = tail, True
+                    self._last[section.id] = last
+                    if dp + rest[section.id] > after[node_id]:
+                        after[node_id] = dp + rest[section.id]
+                        self._after[node_id] = (section, last)
+                    if head + dp + rest[section.id] > before[node_id]:
+                        before[node_id] = head + dp + rest[section.id]
+                        self._before[node_id] = (section, last)
+        self.static_head_max: float = before[start_node_id]
+        # forward pass: `pseudo_start` tells if the node can be reached from the start node along pseudo sections
+        # only, `up_to` is the largest sum up to the node once a real section has been passed
+        pseudo_start: Dict[str, bool] = {start_node_id: True}
+        up_to: Dict[str, float] = {}
+        self._pseudo_start: Dict[str, Section] = {}
+        self._up_to: Dict[str, Tuple[Section, bool]] = {}
+        self._first: Dict[str, bool] = {}  # real sections that are the first real section of their critical path
+        self.through: Dict[str, float] = {}
+        """The largest static head required of the flow paths through each real section that lies on a flow path"""
+        for node_id in order:
+            if node_id == end_node_id:
+                continue
+            ps, ut = pseudo_start.get(node_id, False), up_to.get(node_id, no_path)
+            for section in nodes[node_id].outgoing:
+                v = section.end_node.id
+                if not section.real:
+                    if ps and not pseudo_start.get(v, False):
+                        pseudo_start[v] = True
+                        self._pseudo_start[v] = section
+                    if ut > up_to.get(v, no_path):
+                        up_to[v] = ut
+                        self._up_to[v] = (section, False)
+                else:
+                    dp, head, _ = terms[section.id]
+                    prefix, first = ut, False
+                    if ps and head > prefix:
+                        prefix, first = head, True
+                    self._first[section.id] = first
+                    if prefix > no_path and rest[section.id] > no_path:
+                        self.through[section.id] = prefix + dp + rest[section.id]
+                    if prefix + dp > up_to.get(v, no_path):
+                        up_to[v] = prefix + dp
+                        self._up_to[v] = (section, first)
+
+    def critical_path(self) -> 'FlowPath':
+        # follow the choices of the backward pass from the start node
+        if self.static_head_max == -math.inf:
+            raise ValueError('no flow path with a real section runs from the start node to the end node')
+        section, _ = self._before[self._start_node_id]
+        return self._complete(FlowPath(), section, self._before)
+
+    def critical_path_through(self, section: Section) -> 'FlowPath':
+        # follow the choices of the forward pass back to the start node and those of the backward pass on to the end
+        # node
+        prefix = []
+        node_id, first = section.start_node.id, self._first[section.id]
+        while node_id != self._start_node_id:
+            if first:
+                s = self._pseudo_start[node_id]
+            else:
+                s, first = self._up_to[node_id]
+            prefix.append(s)
+            node_id = s.start_node.id
+        prefix.reverse()
+        return self._complete(FlowPath(prefix), section, self._after)
+
+    def _complete(self, path: 'FlowPath', section: Section, choices: Dict[str, Tuple[Section, bool]]) -> 'FlowPath':
+        # append the section and the sections chosen after it up to the end node
+        while True:
+            path.append(section)
+            node_id = section.end_node.id
+            if section.real:
+                choices = self._after
+                if self._last[section.id]:
+                    while node_id != self._end_node_id:
+                        section = self._pseudo_end[node_id]
+                        path.append(section)
+                        node_id = section.end_node.id
+                    return path
+            if node_id == self._end_node_id:
+                return path
+            section, _ = choices[node_id]
+
+
 class Network:
     """Class that models a piping network."""
+    DOWNSTREAM_MASKS_MAX: int = 10000
+    """
+    Maximum number of sections for which `critical_path_through` keeps bit masks of the sections downstream of each
+    node. The masks take up to (number of nodes) x (number of sections) bits, i.e. at most about 12 MB at the default
+    limit. In larger networks the sections downstream of a changed section are searched each time instead.
+    """
 
     def __init__(self):
         self._start_node_id: str = ''
@@ -473,6 +713,18 @@ class Network:
         self._nodes: Dict[str, Node] = {}
         self._sections: Dict[str, Section] = {}
         self._paths: List[FlowPath] = []
+        self._path_trie: PathTrie = PathTrie()
+        self._path_index: Dict[str, List[int]] = {}  # indices of the flow paths through each section
+        self._path_heads: Optional[np.ndarray] = None  # velocity, elevation and dynamic head of each flow path
+        self._dirty_paths: Set[int] = set()  # flow paths whose heads must be calculated again
+        self._path_evaluator: Optional[PathEvaluator] = None
+        self._stale_sections: Dict[str, Section] = {}  # sections changed since the heads were calculated
+        self._static_heads: Optional[_StaticHeads] = None
+        self._topological: Optional[List[str]] = None  # ids of the nodes in topological order
+        self._changed_sections: Set[str] = set()  # sections changed since the static heads were calculated
+        self._downstream: Optional[Dict[str, int]] = None  # bit mask of the sections downstream of each node
+        self._section_bits: Dict[str, int] = {}
+        self._node_rank: Optional[Dict[str, int]] = None  # position of each node in the topological order
 
     @classmethod
     def create(cls, **kwargs):
@@ -526,11 +778,130 @@ class Network:
         if v is not section:
             raise ValueError(f'a section with {section.id} was already added to the network')
         else:
+            section.add_observer(self._section_changed)
+            self._static_heads = self._topological = self._downstream = self._node_rank = None
             sn = self._nodes.setdefault(section.start_node.id, section.start_node)
             sn.connect(section, 'out')
             en = self._nodes.setdefault(section.end_node.id, section.end_node)
             en.connect(section, 'in')
 
+    def save(self, file_path: str):
+        """
+        Save the network, with its fittings, valves and pumps, to a binary snapshot: an uncompressed NumPy .npz-file
+        with the given file path (*str*). See *pypeflow.core.snapshot*.
+        """
+        sections = list(self._sections.values())
+        pipes = [section._pipe for section in sections]
+        fitting_pointers, fittings = ragged_arrays([list(section._fittings.items()) for section in sections])
+        balancing_valves = [section._balancing_valve for section in sections if section._balancing_valve is not None]
+        control_valves = [section._control_valve for section in sections if section._control_valve is not None]
+        pumps = [section._pump for section in sections if section._pump is not None]
+        arrays = {
+            'start_node_id': np.array(self._start_node_id),
+            'end_node_id': np.array(self._end_node_id),
+            'pipe_schedule': pipe_schedule_array(self._pipe_schedule),
+            'section_ids': text_array([section.id for section in sections]),
+            'section_nodes': text_array(
+                [(section.start_node.id, section.end_node.id) for section in sections]
+            ).reshape(len(sections), 2),
+            'node_heights': get_fields(
+                [node for section in sections for node in (section.start_node, section.end_node)], ('_height',)
+            ).reshape(len(sections), 2),
+            'section_flags': np.array([
+                (section._real, pipe._fluid is not None, pipe._cross_section._pipe_schedule is not None,
+                 section._balancing_valve is not None, section._control_valve is not None, section._pump is not None)
+                for section, pipe in zip(sections, pipes)
+            ], dtype=bool).reshape(len(sections), 6),
+            'pipe_values': get_fields(pipes, _PIPE_FIELDS),
+            'cross_section_values': get_fields([pipe._cross_section for pipe in pipes], _CROSS_SECTION_FIELDS),
+            'fitting_pointers': fitting_pointers,
+            'fitting_ids': text_array([fitting_id for fitting_id, _ in fittings]),
+            'fitting_types': text_array([fitting._type for _, fitting in fittings]),
+            'fitting_values': get_fields([fitting for _, fitting in fittings], _FITTING_FIELDS),
+            'balancing_valve_values': get_fields(balancing_valves, _BALANCING_VALVE_FIELDS),
+            'control_valve_values': get_fields(control_valves, _CONTROL_VALVE_FIELDS),
+            'pump_values': get_fields(pumps, ('_a0', '_a1', '_a2'))
+        }
+        arrays.update(fluid_arrays(self._fluid))
+        if self._paths:
+            arrays.update(zip(('path_parent', 'path_item', 'path_leaves'), self._path_trie.arrays()))
+        save_snapshot(file_path, 'design network', arrays)
+
+    @classmethod
+    def load(cls, file_path: str, mmap: bool = False) -> 'Network':
+        """
+        Load a network from a binary snapshot that was saved with `save`.
+
+        **Parameters:**
+
+        - `file_path`: (*str*) = the file path of the snapshot
+        - `mmap`: (*bool*) = memory-map the arrays of the snapshot read-only instead of reading them (default *False*)
+
+        **Returns:** (*Network*) the network in the state in which it was saved. The fluid properties are taken from the
+        snapshot and the pipes, fittings and valves are not calculated again.
+
+        A *ValueError* exception is raised if the file does not hold a snapshot of a design network of the current
+        snapshot version.
+
+        """
+        arrays = load_snapshot(file_path, 'design network', mmap)
+        n = cls()
+        n._start_node_id = str(arrays['start_node_id'])
+        n._end_node_id = str(arrays['end_node_id'])
+        n._fluid = restore_fluid(arrays)
+        n._pipe_schedule = restore_pipe_schedule(arrays['pipe_schedule'])
+        section_ids = arrays['section_ids'].tolist()
+        section_nodes = arrays['section_nodes'].tolist()
+        node_heights = arrays['node_heights'].tolist()
+        flags = arrays['section_flags'].tolist()
+        sections = [Section() for _ in section_ids]
+        pipes = [section._pipe for section in sections]
+        set_fields(pipes, _PIPE_FIELDS, arrays['pipe_values'])
+        set_fields([pipe._cross_section for pipe in pipes], _CROSS_SECTION_FIELDS, arrays['cross_section_values'])
+        fittings = [Fitting() for _ in range(len(arrays['fitting_ids']))]
+        set_fields(fittings, _FITTING_FIELDS, arrays['fitting_values'])
+        for fitting, type_ in zip(fittings, arrays['fitting_types'].tolist()):
+            fitting._type = type_
+            fitting._fluid = n._fluid
+        fittings = split_ragged(arrays['fitting_pointers'], zip(arrays['fitting_ids'].tolist(), fittings))
+        balancing_valves = iter(
+            _new_objects(BalancingValve, arrays['balancing_valve_values'], _BALANCING_VALVE_FIELDS, n._fluid)
+        )
+        control_valves = iter(
+            _new_objects(ControlValve, arrays['control_valve_values'], _CONTROL_VALVE_FIELDS, n._fluid)
+        )
+        pumps = iter(_new_objects(Pump, arrays['pump_values'], ('_a0', '_a1', '_a2')))
+        for k, section in enumerate(sections):
+            real, has_fluid, has_schedule, has_balancing_valve, has_control_valve, has_pump = flags[k]
+            section._id = section_ids[k]
+            section._real = real
+            section._start_node = Node()
+            section._start_node._id, section._start_node._height = section_nodes[k][0], node_heights[k][0]
+            section._end_node = Node()
+            section._end_node._id, section._end_node._height = section_nodes[k][1], node_heights[k][1]
+            if has_fluid:
+                section._pipe._fluid = n._fluid
+            if has_schedule:
+                section._pipe._cross_section._pipe_schedule = n._pipe_schedule
+            section._fittings = dict(fittings[k])
+            if has_balancing_valve:
+                section._balancing_valve = next(balancing_valves)
+            if has_control_valve:
+                section._control_valve = next(control_valves)
+            if has_pump:
+                section._pump = next(pumps)
+            n._sections[section.id] = section
+            section.add_observer(n._section_changed)
+            sn = n._nodes.setdefault(section.start_node.id, section.start_node)
+            sn.connect(section, 'out')
+            en = n._nodes.setdefault(section.end_node.id, section.end_node)
+            en.connect(section, 'in')
+        if 'path_leaves' in arrays:
+            n._path_trie = PathTrie.from_arrays(arrays['path_parent'], arrays['path_item'], arrays['path_leaves'])
+            n._paths = [FlowPath(sections[i] for i in path) for path in n._path_trie]
+            n._index_paths()
+        return n
+
     @property
     def sections(self) -> Dict[str, Section]:
         """Get a dictionary with the sections in the network. Keys: section ids, values: *Section* objects."""
@@ -538,40 +909,79 @@ class Network:
 
     def _find_flow_paths(self):
         """Find all the possible flow paths between the start node and end node of the network."""
-        path = FlowPath()
-        self._paths.append(path)
-        try:
-            node = self._nodes[self._start_node_id]  # get start node of network
-            self._search(node, path)                 # begin searching at start node of network
-        except IndexError:
-            self._paths = []
-
-    def _search(self, node: Node, path: FlowPath):
-        # search until the end node of the network has been reached
-        # if the current node has more than 1 outgoing connection, then
-        # for each outgoing connection except the first one...
-        #   create a new empty path
-        #   add the current path to the new path
-        #   add the connection to the new path
-        #   add the new path to the list of paths in the network
-        #   create a thread that begins searching from the end node of the connection
-        # add the first outgoing connection of the current node to the current path
-        # and then set current node to the end node of the first outgoing connection
-        while node.id != self._end_node_id:
-            if len(node.outgoing) > 1:
-                for section in node.outgoing[1:]:
-                    new_path = FlowPath()
-                    new_path.extend(path)
-                    new_path.append(section)
-                    self._paths.append(new_path)
-                    thread = threading.Thread(
-                        target=self._search,
-                        args=(self._nodes[section.end_node.id], new_path)
-                    )
-                    thread.start()
-                    thread.join()
-            path.append(node.outgoing[0])
-            node = self._nodes[path[-1].end_node.id]
+        section_index = {section_id: i for i, section_id in enumerate(self._sections.keys())}
+        self._path_trie = PathTrie()
+        self._paths = []
+        for path in self.iter_paths():
+            self._path_trie.insert([section_index[section.id] for section in path])
+            self._paths.append(path)
+        self._index_paths()
+
+    def _index_paths(self):
+        # build the reverse index from the sections to the flow paths through them; the heads of the paths are
+        # calculated again when they are needed
+        self._path_index = {}
+        for k, path in enumerate(self._paths):
+            for section in path:
+                self._path_index.setdefault(section.id, []).append(k)
+        self._path_heads = None
+        self._dirty_paths = set()
+        self._path_evaluator = None
+        self._stale_sections = {}
+
+    def _section_changed(self, section: Section):
+        # observer of the sections: only the flow paths through the changed section need their heads calculated again
+        if self._path_heads is not None:
+            self._dirty_paths.update(self._path_index.get(section.id, ()))
+            self._stale_sections[section.id] = section
+        if self._static_heads is not None:
+            self._changed_sections.add(section.id)
+
+    def path_heads(self, max_workers: Optional[int] = None) -> np.ndarray:
+        """
+        Get the heads of the flow paths in the network (see property `paths`) as a NumPy array with a row for each
+        flow path and three columns: the velocity head, the elevation head and the dynamic head of the flow path,
+        expressed in Pa. The sum of the three columns is the static head required for each flow path.
+
+        The heads of all flow paths are evaluated at once by a *pypeflow.design.path_evaluator.PathEvaluator* and are
+        kept between calls. When a section is changed, only the heads of the flow paths through this section are
+        evaluated again, from the cached pressure drops of the sections in these paths.
+
+        **Parameters:**
+
+        - `max_workers`: (*int*) = if set, the flow paths are evaluated in parallel by this number of worker processes
+        (see *PathEvaluator.heads*). Default is *None*.
+
+        """
+        paths = self.paths
+        if self._path_heads is None:
+            self._path_evaluator = PathEvaluator(paths)
+            self._path_heads = self._path_evaluator.heads(max_workers=max_workers)
+        elif self._dirty_paths:
+            self._path_evaluator.update(list(self._stale_sections.values()))
+            rows = sorted(self._dirty_paths)
+            self._path_heads[rows] = self._path_evaluator.heads(rows, max_workers=max_workers)
+        self._dirty_paths = set()
+        self._stale_sections = {}
+        return self._path_heads.copy()
+
+    def iter_paths(self) -> Iterator[FlowPath]:
+        """
+        Generate the flow paths (*FlowPath*) between the start node and end node of the network one at a time,
+        without keeping them in memory. Use this instead of property `paths` for networks with a very large number of
+        flow paths.
+        """
+        for sections in iter_flow_paths(self._nodes, self._start_node_id, self._end_node_id):
+            yield FlowPath(sections)
+
+    @property
+    def path_trie(self) -> PathTrie:
+        """
+        Get the flow paths of the network as a *pypeflow.core.graph.PathTrie*. The sections in the trie are identified
+        by their position in the sections dictionary of the network.
+        """
+        if not self._paths: self._find_flow_paths()
+        return self._path_trie
 
     @property
     def paths(self) -> List[FlowPath]:
@@ -581,16 +991,120 @@ class Network:
 
     @property
     def critical_path(self) -> FlowPath:
-        """Get the critical path (object *FlowPath*) in the network."""
-        static_head_max = 0.0
-        idx = 0
-        for i in range(len(self.paths)):
-            static_head = (self._paths[i].velocity_head() + self._paths[i].elevation_head()
-                           + self._paths[i].dynamic_head())
-            if static_head > static_head_max:
-                static_head_max = static_head
-                idx = i
-        return self._paths[idx]
+        """
+        Get the critical path (object *FlowPath*) in the network, i.e. the flow path with the largest static head
+        required.
+
+        The critical path is found with a dynamic program over the nodes of the network, which must be a directed
+        acyclic graph, instead of enumerating the flow paths. The result is kept until a section changes.
+        """
+        return self._get_static_heads().critical_path()
+
+    def critical_path_through(self, section_id: str) -> Optional[FlowPath]:
+        """
+        Get the flow path (*FlowPath*) with the largest static head required among the flow paths through the real
+        section with id `section_id` (*str*), or *None* if no flow path runs through the section. The flow paths are
+        not enumerated (see `critical_path`).
+
+        After a section has been changed, the dynamic program is only run again if the changed section and this
+        section lie on a common flow path, i.e. if one of them is downstream of the other (see
+        `DOWNSTREAM_MASKS_MAX`).
+        """
+        if self._static_heads is None or self._changed_sections and self._affects(section_id):
+            self._get_static_heads(force=True)
+        if section_id not in self._static_heads.through:
+            return None
+        return self._static_heads.critical_path_through(self._sections[section_id])
+
+    def _get_static_heads(self, force: bool = False) -> _StaticHeads:
+        if force or self._static_heads is None or self._changed_sections:
+            if self._topological is None:
+                self._topological = self._topological_order()
+            self._static_heads = _StaticHeads(
+                self._nodes, self._topological, self._start_node_id, self._end_node_id,
+                self._static_heads, self._changed_sections
+            )
+            self._changed_sections = set()
+        return self._static_heads
+
+    def _topological_order(self) -> List[str]:
+        # ids of the nodes that can be reached from the start node, in topological order (depth-first search); paths
+        # end at the end node of the network
+        order: List[str] = []
+        state: Dict[str, bool] = {self._start_node_id: False}  # False while the node is on the stack
+        stack = [(self._start_node_id, iter(self._nodes[self._start_node_id].outgoing))]
+        while stack:
+            node_id, outgoing = stack[-1]
+            for section in outgoing:
+                v = section.end_node.id
+                if v not in state:
+                    state[v] = False
+                    stack.append((v, iter(self._nodes[v].outgoing if v != self._end_node_id else ())))
+                    break
+                if not state[v]:
+                    raise ValueError(f'the network has a cycle through node {v}')
+            else:
+                stack.pop()
+                state[node_id] = True
+                order.append(node_id)
+        order.reverse()
+        return order
+
+    def _affects(self, section_id: str) -> bool:
+        # check if a section changed since the static heads were calculated lies on a common flow path with the
+        # given section, using bit masks of the sections downstream of each node; in large networks (see
+        # DOWNSTREAM_MASKS_MAX) the network is searched downstream of the sections instead
+        if len(self._sections) > self.DOWNSTREAM_MASKS_MAX:
+            if self._node_rank is None:
+                if self._topological is None:
+                    self._topological = self._topological_order()
+                self._node_rank = {node_id: k for k, node_id in enumerate(self._topological)}
+            end_node_id = self._sections[section_id].end_node.id
+            return any(
+                id_ == section_id
+                or self._reaches(self._sections[id_].end_node.id, section_id)
+                or self._reaches(end_node_id, id_)
+                for id_ in self._changed_sections
+            )
+        if self._downstream is None:
+            self._section_bits = {id_: 1 << k for k, id_ in enumerate(self._sections)}
+            self._downstream = {}
+            if self._topological is None:
+                self._topological = self._topological_order()
+            for node_id in reversed(self._topological):
+                mask = 0
+                if node_id != self._end_node_id:
+                    for section in self._nodes[node_id].outgoing:
+                        mask |= self._section_bits[section.id] | self._downstream[section.end_node.id]
+                self._downstream[node_id] = mask
+        bit = self._section_bits[section_id]
+        downstream = self._downstream.get(self._sections[section_id].end_node.id, 0)
+        return any(
+            id_ == section_id  # the section itself has changed
+            or bit & self._downstream.get(self._sections[id_].end_node.id, 0)  # the section is downstream
+            or self._section_bits[id_] & downstream  # the section is upstream
+            for id_ in self._changed_sections
+        )
+
+    def _reaches(self, node_id: str, section_id: str) -> bool:
+        # check if the section lies downstream of the node (depth-first search); nodes that come after the start node
+        # of the section in topological order cannot lead to the section
+        rank = self._node_rank
+        target = rank.get(self._sections[section_id].start_node.id, -1)
+        visited = {node_id}
+        stack = [node_id]
+        while stack:
+            v = stack.pop()
+            if v == self._end_node_id or rank.get(v, len(rank)) > target:
+                continue
+            for section in self._nodes[v].outgoing:
+                if section.id == section_id:
+                    return True
+                w = section.end_node.id
+                if w not in visited:
+                    visited.add(w)
+                    stack.append(w)
+        return False
 
     def get_balancing_valves(self) -> Dict[str, Tuple[BalancingValve, FlowPath]]:
         """
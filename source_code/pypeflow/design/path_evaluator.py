@@ -0,0 +1,119 @@
+"""
+## Evaluating the heads of all flow paths of a design network at once
+"""
+from typing import Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import quantities as qty
+
+if TYPE_CHECKING:
+    from pypeflow.design.network import Section, FlowPath
+
+
+def _evaluate_heads(indptr: np.ndarray, indices: np.ndarray, dp: np.ndarray, vp: np.ndarray, z_start: np.ndarray,
+                    z_end: np.ndarray) -> np.ndarray:
+    # Calculate the velocity, elevation and dynamic head of the flow paths (rows) of an incidence matrix in CSR form.
+    # The dynamic heads are the product of the incidence matrix with the vector of section pressure drops. The
+    # product is taken position by position along the paths, so that the pressure drops of each path are added in
+    # the order of the path, as FlowPath.dynamic_head does.
+    starts, lengths = indptr[:-1], np.diff(indptr)
+    first = indices[starts]
+    last = indices[starts + lengths - 1]
+    heads = np.empty((len(lengths), 3))
+    heads[:, 0] = vp[last] - vp[first]
+    heads[:, 1] = qty.Pressure.convert(z_end[last] - z_start[first], 'm', 'Pa')
+    dynamic = np.zeros(len(lengths))
+    for j in range(int(lengths.max()) if len(lengths) else 0):
+        rows = np.flatnonzero(lengths > j)
+        dynamic[rows] += dp[indices[starts[rows] + j]]
+    heads[:, 2] = dynamic
+    return heads
+
+
+class PathEvaluator:
+    """
+    Class that evaluates the heads of all flow paths of a design network at once, instead of flow path by flow path.
+
+    The flow paths are held in a path-section incidence matrix in compressed sparse row (CSR) form: the row of a flow
+    path lists the positions of its real sections in the order of the path. The pressure drop, the velocity pressure
+    and the heights of the start and end node of the real sections are held in vectors. The dynamic heads of the flow
+    paths are the product of the incidence matrix with the pressure drop vector; the velocity and elevation heads are
+    taken from the first and last real section of each row. Pseudo sections are left out, as they are by *FlowPath*.
+    """
+
+    def __init__(self, paths: Sequence['FlowPath']):
+        """
+        Create *PathEvaluator* object for the flow paths `paths` (*Sequence[pypeflow.design.network.FlowPath]*). Each
+        flow path must contain at least one real section.
+        """
+        self._sections: List['Section'] = []
+        self._position: Dict[str, int] = {}
+        indices: List[int] = []
+        indptr = [0]
+        for path in paths:
+            for section in path:
+                if section.real:
+                    k = self._position.get(section.id)
+                    if k is None:
+                        k = self._position[section.id] = len(self._sections)
+                        self._sections.append(section)
+                    indices.append(k)
+            if len(indices) == indptr[-1]:
+                raise ValueError(f'flow path {path!r} has no real section')
+            indptr.append(len(indices))
+        self.indptr: np.ndarray = np.array(indptr, dtype=np.int64)
+        """Start of the row of each flow path in `indices`, and the number of entries as last element"""
+        self.indices: np.ndarray = np.array(indices, dtype=np.int64)
+        """Positions of the real sections in the rows of the incidence matrix"""
+        n = len(self._sections)
+        self._dp, self._vp = np.empty(n), np.empty(n)
+        self._z_start, self._z_end = np.empty(n), np.empty(n)
+        self.update(self._sections)
+
+    def update(self, sections: Sequence['Section']):
+        """
+        Read the pressure drop, velocity pressure and node heights of the given sections (*Sequence[Section]*) again
+        after they have changed. Sections that are not on any of the flow paths are ignored.
+        """
+        for section in sections:
+            k = self._position.get(section.id)
+            if k is None:
+                continue
+            self._dp[k] = section.pressure_drop()
+            self._vp[k] = section.pipe.velocity_pressure()
+            self._z_start[k] = section.start_node.height()
+            self._z_end[k] = section.end_node.height()
+
+    def _rows(self, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # the incidence matrix restricted to the given rows
+        lengths = np.diff(self.indptr)[rows]
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum(lengths)
+        entries = np.repeat(self.indptr[rows] - indptr[:-1], lengths) + np.arange(indptr[-1])
+        return indptr, self.indices[entries]
+
+    def heads(self, rows: Optional[Sequence[int]] = None, max_workers: Optional[int] = None) -> np.ndarray:
+        """
+        Get the heads of the flow paths.
+
+        **Parameters:**
+
+        - `rows`: (*Sequence[int]*) = the indices of the flow paths to evaluate (default *None*: all flow paths)
+        - `max_workers`: (*int*) = if set, the flow paths are divided in consecutive chunks that are evaluated in
+        parallel by this number of worker processes (*concurrent.futures.ProcessPoolExecutor*). Default is *None*: all
+        flow paths are evaluated in the current process.
+
+        **Returns:** (*np.ndarray*)<br>
+        A row for each flow path and three columns: the velocity head, the elevation head and the dynamic head of the
+        flow path, expressed in Pa.
+
+        """
+        rows = np.arange(len(self.indptr) - 1) if rows is None else np.asarray(rows, dtype=np.int64)
+        vectors = (self._dp, self._vp, self._z_start, self._z_end)
+        if max_workers is None or max_workers <= 1 or len(rows) <= 1:
+            return _evaluate_heads(*self._rows(rows), *vectors)
+        chunks = [chunk for chunk in np.array_split(rows, max_workers) if len(chunk)]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_evaluate_heads, *self._rows(chunk), *vectors) for chunk in chunks]
+            results = [future.result() for future in futures]
+        return np.concatenate(results)
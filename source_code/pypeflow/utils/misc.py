@@ -2,7 +2,7 @@
 ## Miscellaneous utility functions.
 """
 import quantities as qty
-from pypeflow.core.fluids import Water
+from pypeflow.core.fluids import create_fluid
 
 
 def calc_specific_friction_loss(**kwargs):
@@ -35,7 +35,7 @@ def calc_specific_friction_loss(**kwargs):
     dp_check_valve = kwargs.get('dp_check_valve', 0.0)
     p_draw_off_req = kwargs.get('p_draw_off_req')
 
-    fluid = Water(10.0)
+    fluid = create_fluid('water', 10.0)
     g = 9.81
     rho = fluid.density('kg/m^3')
     static_head = rho * g * height
@@ -10,7 +10,6 @@ from typing import List, Tuple, Dict, Optional
 import numpy as np
 import quantities as qty
 from nummath.interpolation import PolyFit
-from nummath.graphing2 import LineGraph
 
 
 class PumpCurve:
@@ -158,6 +157,7 @@ class PumpCurve:
         Call show() on the returned *LineGraph* object to show the diagram.
         """
         if self._coefficients is not None:
+            from nummath.graphing2 import LineGraph
             fig_size: Tuple[int, int] = kwargs.get('fig_size', (6, 4))
             dpi: int = kwargs.get('dpi', 96)
             num: int = kwargs.get('num', 50)
@@ -2,10 +2,12 @@
 ## Calculate and draw the system curve of a flow path in a piping network
 
 """
-from typing import Dict, Tuple
+from typing import Dict, Tuple, TYPE_CHECKING
 import numpy as np
 import quantities as qty
-from nummath.graphing2 import LineGraph
+
+if TYPE_CHECKING:
+    from nummath.graphing2 import LineGraph
 
 
 class SystemCurve:
@@ -57,13 +59,11 @@ class SystemCurve:
         V_f = V_final(self._V_unit)
         V_arr = np.linspace(V_i, V_f, num, endpoint=True)
         p_arr = self._R_hyd * V_arr ** 2 + self._dp_stat + self._dp_elev
-        V_qty = [qty.VolumeFlowRate(V, self._V_unit) for V in V_arr]
-        p_qty = [qty.Pressure(p, self._p_unit) for p in p_arr]
-        V_sys = [V(self._dest_units['flow_rate']) for V in V_qty]
-        p_sys = [p(self._dest_units['pressure']) for p in p_qty]
+        V_sys = qty.VolumeFlowRate(V_arr, self._V_unit)(self._dest_units['flow_rate'])
+        p_sys = qty.Pressure(p_arr, self._p_unit)(self._dest_units['pressure'])
         return V_sys, p_sys
 
-    def draw_system_curve(self, V_initial: qty.VolumeFlowRate, V_final: qty.VolumeFlowRate, **kwargs) -> LineGraph:
+    def draw_system_curve(self, V_initial: qty.VolumeFlowRate, V_final: qty.VolumeFlowRate, **kwargs) -> 'LineGraph':
         """
         Draw the calculated system curve.
 
@@ -83,6 +83,7 @@ class SystemCurve:
         **Returns:** (*nummath.graphing2.LineGraph*)<br>
         Call show() on the returned *LineGraph* object to show the diagram.
         """
+        from nummath.graphing2 import LineGraph
         fig_size: Tuple[int, int] = kwargs.get('fig_size', (6, 4))
         dpi: int = kwargs.get('dpi', 96)
         num: int = kwargs.get('num', 50)
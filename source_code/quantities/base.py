@@ -1,16 +1,75 @@
 from typing import Dict, Optional, Union
+from functools import lru_cache
+
+
+class Converter:
+    """Callable that converts a quantity value from a source unit to a destination unit.
+
+    The conversion between two units is resolved once into a factor and an offset, so that a conversion boils down
+    to des_value = src_value * factor + offset. The value to convert may be a float or a NumPy array of floats.
+    """
+    __slots__ = ('factor', 'offset')
+
+    def __init__(self, factor: float, offset: float = 0.0):
+        self.factor: float = factor
+        self.offset: float = offset
+
+    def __call__(self, src_value):
+        return src_value * self.factor + self.offset
+
+    def __repr__(self) -> str:
+        return f"Converter(factor={self.factor}, offset={self.offset})"
 
 
 class Quantity:
+    """Base class of physical quantities.
+
+    A quantity object holds either a single value or a NumPy array of values (an array quantity). An array quantity
+    is created in the same way as a single-valued quantity, passing a NumPy array as value, and converts all its
+    values to the unit asked in one operation.
+    """
+    # Quantity objects are created by the thousands in the calculation routines: slots keep them small and avoid an
+    # attribute dictionary per object. Derived classes should declare empty slots as well.
+    __slots__ = ('base_unit_value', 'default_unit')
     base_unit: str = ""
     units: Dict[str, float] = {}
 
+    @classmethod
+    def conversion_factor(cls, unit: str) -> float:
+        """Get the conversion factor to go from the base unit to the given unit.
+
+        unit : str
+            the unit of the quantity
+        """
+        try:
+            return cls.units[unit]
+        except KeyError:
+            raise KeyError(f'Unit {unit} unknown.')
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def converter(cls, src_unit: str, des_unit: str) -> Converter:
+        """Get a precompiled converter from one unit to another unit.
+
+        src_unit : str
+            the unit in which the values to convert are expressed
+        des_unit : str
+            the unit in which the converted values are to be expressed
+
+        return value : Converter
+            callable that takes a value (float or NumPy array) expressed in the source unit and returns it expressed
+            in the destination unit
+        """
+        if src_unit == des_unit:
+            return Converter(1.0)
+        return Converter(cls.conversion_factor(des_unit) / cls.conversion_factor(src_unit))
+
     @classmethod
     def convert(cls, src_value: float, src_unit: str, des_unit: str) -> float:
         """Convert a quantity value from one unit to another unit.
 
         src_value : float
-            the value to convert
+            the value to convert (or a NumPy array of values)
         src_unit : str
             the current unit in which the quantity value is expressed
         des_unit : str
@@ -19,11 +78,9 @@ class Quantity:
         return value : float
             the value of the quantity expressed in the new unit
         """
-        src_cf = cls.units.get(src_unit)  # get conversion factor to go from source unit to base unit
-        base_value = src_value / src_cf   # convert source value to value expressed in base unit
-        des_cf = cls.units.get(des_unit)  # get conversion factor to go from base unit to destination unit
-        des_value = base_value * des_cf   # convert value in base unit to value in destination unit
-        return des_value
+        if src_unit == des_unit:
+            return src_value
+        return cls.converter(src_unit, des_unit)(src_value)
 
     def __init__(self, value: float = None, unit: str = None):
         """Create Quantity object.
@@ -37,7 +94,7 @@ class Quantity:
         # internally the quantity value is stored being expressed in the base unit of the quantity
         self.base_unit_value: Union[float, None] = None
         if value is not None:
-            self.base_unit_value = self.convert(value, src_unit=unit, des_unit=self.base_unit)
+            self.base_unit_value = self.converter(unit, self.base_unit)(value)
         # favourite or default unit to be used for the quantity
         self.default_unit: str = self.base_unit
 
@@ -47,15 +104,18 @@ class Quantity:
         expressed in its base unit. If unit is set to 'default', the value returned will be expressed in the default
         unit.
         """
-        if unit is None: unit = self.base_unit
+        if self.base_unit_value is None:
+            return None
         if unit == 'default': unit = self.default_unit
-        if self.base_unit_value is not None:
-            raw_value = self.convert(self.base_unit_value, src_unit=self.base_unit, des_unit=unit)
-            if decimal_places is not None:
-                return float(f"{raw_value:.{decimal_places}f}")
-            else:
-                return raw_value
-        return None
+        if unit is None or unit == self.base_unit:
+            raw_value = self.base_unit_value
+        else:
+            raw_value = self.converter(self.base_unit, unit)(self.base_unit_value)
+        if decimal_places is not None:
+            # NumPy arrays are rounded element-wise by their own round method
+            round_ = getattr(raw_value, 'round', None)
+            return round_(decimal_places) if round_ is not None else round(raw_value, decimal_places)
+        return raw_value
 
     def __repr__(self) -> str:
         """Return string representation of Quantity object expressed in its favourite or default unit."""
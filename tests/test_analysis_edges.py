@@ -0,0 +1,91 @@
+"""
+Tests of analysis networks that are configured from an edge list, with loops generated automatically.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'source_code'))
+
+from pypeflow.analysis import AnalyzerSession  # noqa: E402
+
+EDGES = """section id,start node id,end node id,diameter,length,zeta,a0,a1,a2,dp fixed,flow rate
+p0,n0,n1,40,10,0,5.85E+005,-5.87E+007,-4.60E+010,,1.0
+a,n1,n2,40,20,1,,,,,0.5
+b,n1,n3,40,25,1,,,,,0.5
+c,n2,n4,40,20,1,,,,,0.5
+d,n3,n4,40,30,1,,,,,0.5
+e,n4,n5,40,5,1,,,,,1.0
+ret,n5,n0,,,,,,,0,
+"""
+
+# the same network with hand-assigned loops; the start and end node of each section are given in the positive sense
+# of the loop the section is listed in first
+LOOPS = """loop id,section id,start node id,end node id,diameter,length,zeta,a0,a1,a2,dp fixed,flow rate
+La,p0,n0,n1,40,10,0,5.85E+005,-5.87E+007,-4.60E+010,,1.0
+La,a,n1,n2,40,20,1,,,,,0.5
+La,c,n2,n4,40,20,1,,,,,0.5
+La,e,n4,n5,40,5,1,,,,,1.0
+La,ret,n5,n0,,,,,,,0,
+Lb,b,n1,n3,40,25,1,,,,,0.5
+Lb,d,n3,n4,40,30,1,,,,,0.5
+Lb,c,n2,n4,40,20,1,,,,,-0.5
+Lb,a,n1,n2,40,20,1,,,,,-0.5
+"""
+
+
+def _session(tmp_path, name: str, text: str, from_edges: bool) -> AnalyzerSession:
+    file_path = tmp_path / name
+    file_path.write_text(text)
+    session = AnalyzerSession()
+    session.create_network(
+        start_node_id='n0', end_node_id='n5', fluid='water', fluid_temperature=10.0,
+        pipe_schedule='pipe_schedule_40'
+    )
+    if from_edges:
+        session.configure_network_from_edges(str(file_path))
+    else:
+        session.configure_network(str(file_path))
+    session.solve(error=1.0e-6, i_max=100, method='newton')
+    return session
+
+
+def _path_heads(session: AnalyzerSession):
+    return {
+        repr(path): (path.velocity_head(), path.elevation_head(), path.dynamic_head())
+        for path in session.network.paths
+    }
+
+
+def test_path_heads_match_loop_configuration(tmp_path):
+    edges = _path_heads(_session(tmp_path, 'edges.csv', EDGES, True))
+    loops = _path_heads(_session(tmp_path, 'loops.csv', LOOPS, False))
+    assert edges.keys() == loops.keys()
+    for path, heads in edges.items():
+        assert heads == pytest.approx(loops[path], abs=1.0e-2)
+        # every flow path closes over the pseudo section with zero pressure difference
+        assert heads[2] == pytest.approx(0.0, abs=1.0e-2)
+
+
+def test_zero_flow_dead_end(tmp_path):
+    session = _session(tmp_path, 'edges.csv', EDGES + 'x,n4,n6,40,5,1,,,,,0.0\n', True)
+    dead_end = [section for section in session.network.unlooped_sections if section.id == 'x']
+    assert len(dead_end) == 1
+    assert dead_end[0].dp == 0.0
+    df = session.get_network()
+    row = df[df['section_id'] == 'x']
+    assert list(row['loop_id']) == ['']
+    assert row.iloc[0, 7] == 0.0
+
+
+@pytest.mark.parametrize('from_edges', [True, False])
+def test_unknown_start_node(tmp_path, from_edges):
+    file_path = tmp_path / 'network.csv'
+    file_path.write_text(EDGES if from_edges else LOOPS)
+    session = AnalyzerSession()
+    session.create_network(start_node_id='nX', end_node_id='n5', pipe_schedule='pipe_schedule_40')
+    configure = session.configure_network_from_edges if from_edges else session.configure_network
+    with pytest.raises(ValueError, match='start node nX'):
+        configure(str(file_path))
+    assert not session.network.sections
@@ -0,0 +1,49 @@
+"""
+Tests of the solvers of analysis networks.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'source_code'))
+
+from pypeflow.analysis import AnalyzerSession  # noqa: E402
+
+CONFIG4 = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'examples', 'projects', 'config4_hardy.csv')
+
+
+def _solve(method: str):
+    session = AnalyzerSession()
+    session.create_network(
+        start_node_id='n1', end_node_id='n0', fluid='water', fluid_temperature=10.0,
+        pipe_schedule='pipe_schedule_40'
+    )
+    session.configure_network(CONFIG4)
+    session.solve(error=1.0e-6, i_max=5000, method=method)
+    return session.snapshot()
+
+
+@pytest.mark.parametrize('method', ['newton', 'node'])
+def test_methods_agree_with_hardy_cross(method):
+    reference = _solve('hardy_cross')
+    state = _solve(method)
+    assert state.section_ids == reference.section_ids
+    assert state.flow_rates == pytest.approx(reference.flow_rates, rel=1.0e-4, abs=1.0e-9)
+
+
+def test_node_solver_rejects_inconsistent_pseudo_sections(tmp_path):
+    # the pseudo sections `ret` and `ret2` close a chain between n5 and n0 whose fixed pressure differences do not cancel
+    file_path = tmp_path / 'edges.csv'
+    file_path.write_text(
+        "section id,start node id,end node id,diameter,length,zeta,a0,a1,a2,dp fixed,flow rate\n"
+        "p0,n0,n1,40,10,0,5.85E+005,-5.87E+007,-4.60E+010,,1.0\n"
+        "a,n1,n5,40,20,1,,,,,1.0\n"
+        "ret,n5,n0,,,,,,,0,\n"
+        "ret2,n5,n0,,,,,,,0.1,\n"
+    )
+    session = AnalyzerSession()
+    session.create_network(start_node_id='n0', end_node_id='n5', pipe_schedule='pipe_schedule_40')
+    session.configure_network_from_edges(str(file_path))
+    with pytest.raises(ValueError, match='do not add up to zero'):
+        session.solve(method='node')
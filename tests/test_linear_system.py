@@ -0,0 +1,41 @@
+"""
+Tests of the sparse solvers of linear systems in nummath.
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'source_code'))
+
+from nummath.linear_system import CSRMatrix, PCG, SparseLUDecomp, rcm_ordering  # noqa: E402
+
+
+def _banded_spd(n: int = 12):
+    # a pentadiagonal, diagonally dominant and symmetric matrix, with its rows and columns shuffled so that the
+    # ordering has something to do
+    a = 6.0 * np.eye(n) - np.eye(n, k=1) - np.eye(n, k=-1) - 0.5 * np.eye(n, k=2) - 0.5 * np.eye(n, k=-2)
+    p = np.random.default_rng(1).permutation(n)
+    a = a[np.ix_(p, p)]
+    b = np.arange(1.0, n + 1.0)
+    return a, b
+
+
+@pytest.mark.parametrize('method', ['doolittle', 'choleski'])
+def test_sparse_lu_decomp(method):
+    a, b = _banded_spd()
+    x = SparseLUDecomp(CSRMatrix.from_dense(a), b, method=method).solve()
+    assert x == pytest.approx(np.linalg.solve(a, b), rel=1.0e-10)
+
+
+def test_pcg():
+    a, b = _banded_spd()
+    x = PCG(CSRMatrix.from_dense(a), b, tol=1.0e-12).solve()
+    assert x == pytest.approx(np.linalg.solve(a, b), rel=1.0e-8)
+
+
+def test_rcm_ordering_is_permutation():
+    a, _ = _banded_spd()
+    order = rcm_ordering(CSRMatrix.from_dense(a))
+    assert sorted(order) == list(range(len(a)))